@@ -1,116 +1,202 @@
+import os
+import sys
 import dash
 from dash import dcc, html
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import numpy as np
-from wordcloud import WordCloud
-from io import BytesIO
-import base64
-from sklearn.metrics import confusion_matrix, accuracy_score, precision_score, recall_score, f1_score
-
-# Load Sentiment Data
-df = pd.read_csv("../src/data/raw/sample.csv")
-
-# Generate Word Cloud
-def generate_wordcloud(text):
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(' '.join(text))
-    img = BytesIO()
-    wordcloud.to_image().save(img, format='PNG')
-    return 'data:image/png;base64,{}'.format(base64.b64encode(img.getvalue()).decode())
-
-# Generate Confusion Matrix Figure
-def generate_confusion_matrix(y_true, y_pred):
-    cm = confusion_matrix(y_true, y_pred)
-    fig = px.imshow(cm, text_auto=True, labels=dict(x="Predicted", y="Actual", color="Count"))
-    return fig
 
-# Generate Sentiment Distribution Chart
-def generate_sentiment_distribution(df):
-    fig = px.histogram(df, x='predicted_sentiment', title="Sentiment Distribution", color='predicted_sentiment')
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.analytics_store import get_store
+from src.models.drift_monitor import PSI_LEVELS, summarize
+from src.utils.figure_cache import DASHBOARD_AGGREGATES_FILE, figure_cache, load_aggregates
+
+SENTIMENTS = ['positive', 'neutral', 'negative']
+
+# Word clouds, evaluation results, distribution and trend are precomputed by
+# scripts/build_dashboard_assets.py; everything below is memoized until that file changes
+@figure_cache.memoize(DASHBOARD_AGGREGATES_FILE, persist=False)
+def get_aggregates():
+    return load_aggregates() or {}
+
+def empty_figure(title):
+    fig = go.Figure()
+    fig.update_layout(title=title)
     return fig
 
-# Generate Time-based Sentiment Trend
-def generate_sentiment_trend(df):
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    sentiment_trend = df.groupby(pd.Grouper(key='timestamp', freq='D')).mean().reset_index()
-    fig = px.line(sentiment_trend, x='timestamp', y='predicted_sentiment', title="Sentiment Trend Over Time")
+# Confusion Matrix Figure
+@figure_cache.memoize(DASHBOARD_AGGREGATES_FILE)
+def confusion_matrix_figure():
+    evaluation = get_aggregates().get('evaluation')
+    if not evaluation:
+        return empty_figure("No evaluation results: run scripts/build_dashboard_assets.py")
+    fig = px.imshow(evaluation['confusion_matrix'], text_auto=True,
+                    labels=dict(x="Predicted", y="Actual", color="Count"),
+                    x=evaluation['labels'], y=evaluation['labels'])
+    fig.update_layout(title=f"{evaluation['model']} on {evaluation['rows']} held-out reviews")
     return fig
 
-# Model Performance Metrics
-def calculate_metrics(df):
-    accuracy = accuracy_score(df['actual_sentiment'], df['predicted_sentiment'])
-    precision = precision_score(df['actual_sentiment'], df['predicted_sentiment'], average='weighted')
-    recall = recall_score(df['actual_sentiment'], df['predicted_sentiment'], average='weighted')
-    f1 = f1_score(df['actual_sentiment'], df['predicted_sentiment'], average='weighted')
-    return accuracy, precision, recall, f1
+# Sentiment Distribution Chart
+@figure_cache.memoize(DASHBOARD_AGGREGATES_FILE)
+def sentiment_distribution_figure():
+    distribution = get_aggregates().get('sentiment_distribution') or {}
+    df = pd.DataFrame({'sentiment': list(distribution), 'count': list(distribution.values())})
+    return px.bar(df, x='sentiment', y='count', color='sentiment', title="Sentiment Distribution")
 
-accuracy, precision, recall, f1 = calculate_metrics(df)
+# Time-based Sentiment Trend
+@figure_cache.memoize(DASHBOARD_AGGREGATES_FILE)
+def sentiment_trend_figure():
+    trend = pd.DataFrame(get_aggregates().get('sentiment_trend') or [], columns=['date'] + SENTIMENTS)
+    return px.line(trend, x='date', y=SENTIMENTS, title="Predicted Sentiment per Day",
+                   labels={'value': 'Predictions', 'variable': 'Sentiment'})
 
-# Initialize Dash App
-app = dash.Dash(__name__)
+@figure_cache.memoize(DASHBOARD_AGGREGATES_FILE)
+def filtered_sentiment_figure(selected_sentiment):
+    trend = pd.DataFrame(get_aggregates().get('sentiment_trend') or [], columns=['date'] + SENTIMENTS)
+    return px.bar(trend, x='date', y=selected_sentiment, title=f"Daily {selected_sentiment} Predictions",
+                  labels={selected_sentiment: 'Predictions'})
+
+# Live monitoring: built from the prediction log's window rollups on each page load, never precomputed
+MONITOR_HOURS = 24
+MONITOR_WINDOW_SECONDS = 300
+
+def monitoring_figures(monitoring):
+    models = monitoring['models']
+    windows = pd.DataFrame(
+        [dict(window, model=name) for name, entry in models.items() for window in entry['windows']],
+        columns=['start', 'model', 'rows', 'rows_per_sec', 'class_mix', 'psi']
+    )
+    throughput = px.bar(windows, x='start', y='rows_per_sec', color='model',
+                        title=f"Predictions per Second ({monitoring['window_seconds'] // 60}-minute windows)",
+                        labels={'start': 'Window', 'rows_per_sec': 'Predictions/s'})
+
+    mix = pd.DataFrame([{'start': w['start'], 'model': w['model'], 'sentiment': sentiment, 'share': share}
+                        for w in windows.to_dict('records') for sentiment, share in w['class_mix'].items()],
+                       columns=['start', 'model', 'sentiment', 'share'])
+    class_mix = px.line(mix, x='start', y='share', color='sentiment', line_dash='model',
+                        title="Predicted Class Mix per Window", labels={'start': 'Window', 'share': 'Share'})
+
+    drift = pd.DataFrame([{'start': w['start'], 'model': w['model'], 'measure': measure, 'psi': value}
+                          for w in windows.to_dict('records') if isinstance(w['psi'], dict)
+                          for measure, value in w['psi'].items() if value is not None],
+                         columns=['start', 'model', 'measure', 'psi'])
+    psi = px.line(drift, x='start', y='psi', color='model', line_dash='measure',
+                  title="Drift against the Training Distribution (PSI)", labels={'start': 'Window', 'psi': 'PSI'})
+    for limit, level in PSI_LEVELS[:-1]:
+        psi.add_hline(y=limit, line_dash='dot', annotation_text=f'{level} below {limit}')
+
+    # Live confidence histogram of the busiest model next to its held-out reference
+    confidence = empty_figure("No confidence data yet")
+    if models:
+        name, entry = max(models.items(), key=lambda item: item[1]['rows'])
+        bins = monitoring['confidence_bins']
+        scored = sum(entry['confidence_histogram'])
+        rows = [{'bucket': f'{i / bins:.2f}', 'source': 'live', 'share': n / scored if scored else 0.0}
+                for i, n in enumerate(entry['confidence_histogram'])]
+        reference = (entry['reference'] or {}).get('confidence_histogram') or []
+        rows += [{'bucket': f'{i / bins:.2f}', 'source': 'held-out', 'share': share} for i, share in enumerate(reference)]
+        confidence = px.bar(pd.DataFrame(rows), x='bucket', y='share', color='source', barmode='group',
+                            title=f"{name} Confidence Histogram", labels={'bucket': 'Top-class probability'})
+    return throughput, class_mix, psi, confidence
+
+def drift_lines(monitoring):
+    lines = []
+    for name, entry in monitoring['models'].items():
+        if entry['reference'] is None:
+            status = 'no baseline (run scripts/build_drift_baseline.py)'
+        else:
+            status = f"{entry['drift'] or 'n/a'} (PSI class mix {entry['psi']['class_mix']}, " \
+                     f"confidence {entry['psi']['confidence']})" + (' - stale baseline' if entry['baseline_stale'] else '')
+        lines.append(html.P(f"{name}: {entry['rows']} predictions, {status}"))
+    return lines or [html.P("No predictions logged yet")]
 
-app.layout = html.Div([
-    html.H1("Sentiment Analysis Dashboard", style={'textAlign': 'center'}),
-    
-    # Word Cloud
-    html.Div([
-        html.H3("Word Cloud"),
-        html.Img(src=generate_wordcloud(df['text']), style={'width': '100%'})
-    ]),
-    
-    # Confusion Matrix
-    html.Div([
-        html.H3("Confusion Matrix"),
-        dcc.Graph(figure=generate_confusion_matrix(df['actual_sentiment'], df['predicted_sentiment']))
-    ]),
-    
-    # Sentiment Distribution
-    html.Div([
-        html.H3("Sentiment Distribution"),
-        dcc.Graph(figure=generate_sentiment_distribution(df))
-    ]),
-    
-    # Sentiment Trend Over Time
-    html.Div([
-        html.H3("Sentiment Trend Over Time"),
-        dcc.Graph(figure=generate_sentiment_trend(df))
-    ]),
-    
-    # Model Performance Metrics
-    html.Div([
-        html.H3("Model Performance Metrics"),
-        html.P(f"Accuracy: {accuracy:.2f}"),
-        html.P(f"Precision: {precision:.2f}"),
-        html.P(f"Recall: {recall:.2f}"),
-        html.P(f"F1 Score: {f1:.2f}"),
-    ]),
-    
-    # Interactive Sentiment Filtering
-    html.Div([
-        html.H3("Filter by Sentiment"),
-        dcc.Dropdown(
-            id='sentiment-filter',
-            options=[
-                {'label': 'Positive', 'value': 'positive'},
-                {'label': 'Neutral', 'value': 'neutral'},
-                {'label': 'Negative', 'value': 'negative'}
-            ],
-            value='positive',
-            clearable=False
-        ),
-        dcc.Graph(id='filtered-sentiment-chart')
+def serve_layout():
+    # Evaluated per page load, so a rebuilt aggregates file shows up without a restart
+    aggregates = get_aggregates()
+    metrics = (aggregates.get('evaluation') or {}).get('metrics') or {}
+    wordcloud = (aggregates.get('wordclouds') or {}).get('all')
+    monitoring = summarize(get_store(), MONITOR_HOURS, MONITOR_WINDOW_SECONDS)
+    throughput, class_mix, psi, confidence = monitoring_figures(monitoring)
+
+    return html.Div([
+        html.H1("Sentiment Analysis Dashboard", style={'textAlign': 'center'}),
+
+        # Word Cloud
+        html.Div([
+            html.H3("Word Cloud"),
+            html.Img(src=wordcloud, style={'width': '100%'}) if wordcloud else html.P("No term index data yet")
+        ]),
+
+        # Confusion Matrix
+        html.Div([
+            html.H3("Confusion Matrix"),
+            dcc.Graph(figure=confusion_matrix_figure())
+        ]),
+
+        # Sentiment Distribution
+        html.Div([
+            html.H3("Sentiment Distribution"),
+            dcc.Graph(figure=sentiment_distribution_figure())
+        ]),
+
+        # Sentiment Trend Over Time
+        html.Div([
+            html.H3("Sentiment Trend Over Time"),
+            dcc.Graph(figure=sentiment_trend_figure())
+        ]),
+
+        # Live Predictions (prediction log rollups)
+        html.Div([
+            html.H3(f"Live Predictions (last {MONITOR_HOURS} hours)"),
+            *drift_lines(monitoring),
+            dcc.Graph(figure=throughput),
+            dcc.Graph(figure=class_mix),
+            dcc.Graph(figure=psi),
+            dcc.Graph(figure=confidence)
+        ]),
+
+        # Model Performance Metrics
+        html.Div([
+            html.H3("Model Performance Metrics"),
+            *[html.P(f"{name}: {value:.2f}") for name, value in metrics.items() if value is not None]
+        ]),
+
+        # Interactive Sentiment Filtering
+        html.Div([
+            html.H3("Filter by Sentiment"),
+            dcc.Dropdown(
+                id='sentiment-filter',
+                options=[{'label': sentiment.capitalize(), 'value': sentiment} for sentiment in SENTIMENTS],
+                value='positive',
+                clearable=False
+            ),
+            dcc.Graph(id='filtered-sentiment-chart')
+        ])
     ])
-])
+
+# Builder -> argument tuples precomputed by scripts/build_dashboard_assets.py
+PRECOMPUTE = {
+    confusion_matrix_figure: [()],
+    sentiment_distribution_figure: [()],
+    sentiment_trend_figure: [()],
+    filtered_sentiment_figure: [(sentiment,) for sentiment in SENTIMENTS]
+}
+
+figure_cache.load()
+
+# Initialize Dash App
+app = dash.Dash(__name__)
+app.layout = serve_layout
 
 @app.callback(
     dash.dependencies.Output('filtered-sentiment-chart', 'figure'),
     [dash.dependencies.Input('sentiment-filter', 'value')]
 )
 def update_filtered_chart(selected_sentiment):
-    filtered_df = df[df['predicted_sentiment'] == selected_sentiment]
-    return px.histogram(filtered_df, x='predicted_sentiment', title=f"Distribution of {selected_sentiment} Sentiment")
+    return filtered_sentiment_figure(selected_sentiment)
 
 if __name__ == '__main__':
     app.run_server(debug=True)
@@ -1,11 +1,20 @@
+import os
+import sys
 from dash import Dash, dcc, html
 from dash.dependencies import Input, Output
 import pandas as pd
 import plotly.express as px
 import requests
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.metrics_calculator import metrics_table, METRICS_FILE
+from src.utils.figure_cache import figure_cache
+
 # Data preparation
-data = {
+DEFAULT_METRICS = {
     "Metric": ["Accuracy", "Precision", "Recall", "F1 Score", "AUC Score"],
     "LR Train": [0.91, 0.91, 1.00, 0.95, 0.62],
     "LR Test": [0.90, 0.90, 1.00, 0.95, 0.57],
@@ -16,7 +25,23 @@ data = {
     "RF Train": [1.00, 1.00, 1.00, 1.00, 1.00],
     "RF Test": [0.90, 0.93, 0.96, 0.95, 0.69]
 }
-metrics_df = pd.DataFrame(data)
+
+# Memoized until metrics.json changes; scripts/build_dashboard_assets.py precomputes the figures
+@figure_cache.memoize(METRICS_FILE)
+def load_metrics_df():
+    # Prefer the latest results written by scripts/train_models.py
+    data = dict(DEFAULT_METRICS)
+    data.update(metrics_table() or {})
+    return pd.DataFrame(data)
+
+figure_cache.load()
+
+MODEL_OPTIONS = [
+    {"label": "Logistic Regression (LR)", "value": "LR"},
+    {"label": "Multinomial Naive Bayes (MNB)", "value": "MNB"},
+    {"label": "XGBoost (XGB)", "value": "XGB"},
+    {"label": "Random Forest (RF)", "value": "RF"},
+]
 
 # Initialize Dash app
 app = Dash(__name__)
@@ -28,12 +53,7 @@ app.layout = html.Div([
     html.Label("Select Model:"),
     dcc.Dropdown(
         id="model-dropdown",
-        options=[
-            {"label": "Logistic Regression (LR)", "value": "LR"},
-            {"label": "Multinomial Naive Bayes (MNB)", "value": "MNB"},
-            {"label": "XGBoost (XGB)", "value": "XGB"},
-            {"label": "Random Forest (RF)", "value": "RF"},
-        ],
+        options=MODEL_OPTIONS,
         value="LR",
         clearable=False,
     ),
@@ -51,12 +71,10 @@ app.layout = html.Div([
     html.Div(id="sentiment-output", style={'marginTop': '20px', 'fontSize': '16px'}),
 ])
 
-# Callback for 2D Bar Chart
-@app.callback(
-    Output("bar-chart", "figure"),
-    Input("model-dropdown", "value")
-)
-def update_bar_chart(selected_model):
+# 2D Bar Chart
+@figure_cache.memoize(METRICS_FILE)
+def bar_chart_figure(selected_model):
+    metrics_df = load_metrics_df()
     train_column = f"{selected_model} Train"
     test_column = f"{selected_model} Test"
     
@@ -66,21 +84,39 @@ def update_bar_chart(selected_model):
                  title=f"{selected_model} Model Performance")
     return fig
 
-# Callback for Heatmap
-@app.callback(
-    Output("heatmap", "figure"),
-    Input("model-dropdown", "value")
-)
-def update_heatmap(selected_model):
+# Heatmap
+@figure_cache.memoize(METRICS_FILE)
+def heatmap_figure(selected_model):
+    metrics_df = load_metrics_df()
     train_column = f"{selected_model} Train"
     test_column = f"{selected_model} Test"
     
     df_heatmap = metrics_df[["Metric", train_column, test_column]].set_index("Metric")
-    fig = px.imshow(df_heatmap.values, labels=dict(x=["Train", "Test"], y=df_heatmap.index, color="Score"),
+    fig = px.imshow(df_heatmap.values, labels=dict(x="Data Type", y="Metric", color="Score"),
                     x=["Train", "Test"], y=df_heatmap.index, color_continuous_scale="Viridis")
     fig.update_layout(title=f"Heatmap of {selected_model} Performance")
     return fig
 
+# Builder -> argument tuples precomputed by scripts/build_dashboard_assets.py
+PRECOMPUTE = {
+    bar_chart_figure: [(option["value"],) for option in MODEL_OPTIONS],
+    heatmap_figure: [(option["value"],) for option in MODEL_OPTIONS]
+}
+
+@app.callback(
+    Output("bar-chart", "figure"),
+    Input("model-dropdown", "value")
+)
+def update_bar_chart(selected_model):
+    return bar_chart_figure(selected_model)
+
+@app.callback(
+    Output("heatmap", "figure"),
+    Input("model-dropdown", "value")
+)
+def update_heatmap(selected_model):
+    return heatmap_figure(selected_model)
+
 # Callback for Sentiment Analysis
 @app.callback(
     Output("sentiment-output", "children"),
@@ -1,11 +1,21 @@
+import os
+import sys
 from dash import Dash, dcc, html
 from dash.dependencies import Input, Output
 import pandas as pd 
 import plotly.express as px
 import plotly.graph_objects as go
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.metrics_calculator import metrics_table, DASHBOARD_LABELS, METRICS_FILE
+from src.utils.benchmark import benchmark_rows, BENCHMARK_FILE
+from src.utils.figure_cache import figure_cache
+
 # Data preparation
-data = {
+DEFAULT_METRICS = {
     "Metric": ["Accuracy", "Precision", "Recall", "F1 Score", "AUC Score"],
     "LR Train": [0.91, 0.91, 1.00, 0.95, 0.62],
     "LR Test": [0.90, 0.90, 1.00, 0.95, 0.57],
@@ -18,8 +28,39 @@ data = {
     "RF Train": [1.00, 1.00, 1.00, 1.00, 1.00],
     "RF Test": [0.90, 0.93, 0.96, 0.95, 0.69],
 }
-metrics_df = pd.DataFrame(data)
-metrics_df_long = metrics_df.melt(id_vars=["Metric"], var_name="Model", value_name="Score")
+
+# Loaders and figure builders are memoized until the files they read change;
+# scripts/build_dashboard_assets.py precomputes the figures for every dropdown value
+@figure_cache.memoize(METRICS_FILE)
+def load_metrics_df():
+    # Prefer the latest results written by scripts/train_models.py
+    data = dict(DEFAULT_METRICS)
+    data.update(metrics_table() or {})
+    return pd.DataFrame(data)
+
+# Latency/throughput results written by scripts/benchmark_models.py, joined with test accuracy
+@figure_cache.memoize(METRICS_FILE, BENCHMARK_FILE)
+def load_benchmark_df():
+    benchmark_df = pd.DataFrame(benchmark_rows())
+    if not benchmark_df.empty:
+        accuracy = load_metrics_df().set_index("Metric").loc["Accuracy"]
+        benchmark_df["label"] = benchmark_df["model"].map(lambda key: DASHBOARD_LABELS.get(key, key))
+        benchmark_df["test_accuracy"] = benchmark_df["label"].map(lambda label: accuracy.get(f"{label} Test"))
+    return benchmark_df
+
+figure_cache.load()
+metrics_df = load_metrics_df()
+
+COLOR_SCALES = ["Viridis", "Plasma", "Cividis", "Inferno", "Magma"]
+
+COST_AXES = {
+    "single_p95_ms": "Single-review p95 latency (ms)",
+    "single_p99_ms": "Single-review p99 latency (ms)",
+    "concurrent_p95_ms": "Concurrent p95 latency (ms)",
+    "batched_rows_per_sec": "Batched throughput (rows/sec)",
+    "peak_rss_mb": "Peak RSS (MB)",
+    "model_size_mb": "Model file size (MB)"
+}
 
 # Initialize Dash app
 app = Dash(__name__)
@@ -40,13 +81,7 @@ app.layout = html.Div([
         html.Label("Select Heatmap Color Scale:"),
         dcc.Dropdown(
             id="color-scale-dropdown",
-            options=[
-                {"label": "Viridis", "value": "Viridis"},
-                {"label": "Plasma", "value": "Plasma"},
-                {"label": "Cividis", "value": "Cividis"},
-                {"label": "Inferno", "value": "Inferno"},
-                {"label": "Magma", "value": "Magma"}
-            ],
+            options=[{"label": scale, "value": scale} for scale in COLOR_SCALES],
             value="Viridis",
             clearable=False,
             style={"width": "50%"}
@@ -55,15 +90,25 @@ app.layout = html.Div([
     
     dcc.Graph(id="bar-chart", style={"height": "600px", "width": "400px", "margin": "auto"}),
     dcc.Graph(id="line-chart", style={"height": "500px", "width": "800px", "margin": "auto"}),
-    dcc.Graph(id="heatmap")
+    dcc.Graph(id="heatmap"),
+
+    html.Div([
+        html.Label("Cost Axis:"),
+        dcc.Dropdown(
+            id="cost-axis-dropdown",
+            options=[{"label": label, "value": column} for column, label in COST_AXES.items()],
+            value="single_p95_ms",
+            clearable=False,
+            style={"width": "50%"}
+        )
+    ], style={"textAlign": "center", "marginTop": "20px"}),
+    dcc.Graph(id="cost-quality-chart", style={"height": "500px", "width": "800px", "margin": "auto"})
 ])
 
-# Callback for 2D Bar Chart
-@app.callback(
-    Output("bar-chart", "figure"),
-    Input("model-dropdown", "value")
-)
-def update_bar_chart(selected_model):
+# 2D Bar Chart
+@figure_cache.memoize(METRICS_FILE)
+def bar_chart_figure(selected_model):
+    metrics_df = load_metrics_df()
     filtered_df = metrics_df[["Metric", selected_model]]
     fig = px.bar(
         filtered_df, x="Metric", y=selected_model, 
@@ -74,14 +119,11 @@ def update_bar_chart(selected_model):
     fig.update_layout(yaxis=dict(range=[0, 1]), height=600, width=400)
     return fig
 
-# Callback for Line Chart
-@app.callback(
-    Output("line-chart", "figure"),
-    Input("model-dropdown", "value")
-)
-def update_line_chart(selected_model):
+# Line Chart
+@figure_cache.memoize(METRICS_FILE)
+def line_chart_figure(selected_model):
     fig = px.line(
-        metrics_df, x="Metric", y=selected_model, 
+        load_metrics_df(), x="Metric", y=selected_model, 
         title=f"Line Chart for {selected_model}",
         labels={selected_model: "Score"},
         markers=True
@@ -89,12 +131,10 @@ def update_line_chart(selected_model):
     fig.update_layout(yaxis=dict(range=[0, 1]), height=500, width=800)
     return fig
 
-# Callback for Heatmap
-@app.callback(
-    Output("heatmap", "figure"),
-    [Input("model-dropdown", "value"), Input("color-scale-dropdown", "value")]
-)
-def update_heatmap(_, color_scale):
+# Heatmap
+@figure_cache.memoize(METRICS_FILE)
+def heatmap_figure(color_scale):
+    metrics_df = load_metrics_df()
     fig = px.imshow(
         metrics_df.iloc[:, 1:].T.values, 
         labels=dict(x="Metric", y="Model", color="Score"),
@@ -113,5 +153,60 @@ def update_heatmap(_, color_scale):
     )
     return fig
 
+# Cost/quality tradeoff chart
+@figure_cache.memoize(METRICS_FILE, BENCHMARK_FILE)
+def cost_quality_figure(cost_axis):
+    benchmark_df = load_benchmark_df()
+    if benchmark_df.empty:
+        fig = go.Figure()
+        fig.update_layout(title="No benchmark results: run scripts/benchmark_models.py", height=500, width=800)
+        return fig
+    fig = px.scatter(
+        benchmark_df, x=cost_axis, y="test_accuracy", text="label",
+        size="model_size_mb", size_max=40,
+        hover_data=["single_p50_ms", "single_p95_ms", "single_p99_ms", "batched_rows_per_sec", "peak_rss_mb"],
+        title="Cost vs Quality",
+        labels={cost_axis: COST_AXES[cost_axis], "test_accuracy": "Test Accuracy"}
+    )
+    fig.update_traces(textposition="top center")
+    fig.update_layout(height=500, width=800)
+    return fig
+
+# Builder -> argument tuples precomputed by scripts/build_dashboard_assets.py
+PRECOMPUTE = {
+    bar_chart_figure: [(model,) for model in metrics_df.columns[1:]],
+    line_chart_figure: [(model,) for model in metrics_df.columns[1:]],
+    heatmap_figure: [(scale,) for scale in COLOR_SCALES],
+    cost_quality_figure: [(axis,) for axis in COST_AXES]
+}
+
+@app.callback(
+    Output("bar-chart", "figure"),
+    Input("model-dropdown", "value")
+)
+def update_bar_chart(selected_model):
+    return bar_chart_figure(selected_model)
+
+@app.callback(
+    Output("line-chart", "figure"),
+    Input("model-dropdown", "value")
+)
+def update_line_chart(selected_model):
+    return line_chart_figure(selected_model)
+
+@app.callback(
+    Output("heatmap", "figure"),
+    [Input("model-dropdown", "value"), Input("color-scale-dropdown", "value")]
+)
+def update_heatmap(_, color_scale):
+    return heatmap_figure(color_scale)
+
+@app.callback(
+    Output("cost-quality-chart", "figure"),
+    Input("cost-axis-dropdown", "value")
+)
+def update_cost_quality_chart(cost_axis):
+    return cost_quality_figure(cost_axis)
+
 if __name__ == "__main__":
     app.run_server(debug=True)
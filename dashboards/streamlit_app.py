@@ -1,22 +1,25 @@
+import os
+import sys
 import streamlit as st
-import joblib
 import numpy as np
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from xgboost import XGBClassifier
-from sklearn.naive_bayes import MultinomialNB
 
-# Load Vectorizer
-vectorizer = joblib.load("../src/models/trained_models/vectorizer.pkl")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.registry import get_registry
+
+# Shared registry: models load once per process, not on every click
+registry = get_registry()
 
 # Available Models
 model_options = {
-    "Logistic Regression": "../src/models/trained_models/sentiment_LogisticRegression.pkl",
-    "Random Forest": "../src/models/trained_models/sentiment_RandomForest.pkl",
-    "XGBoost": "../src/models/trained_models/sentiment_XGBoost.pkl",
-    "Naive Bayes": "../src/models/trained_models/sentiment_NaiveBayes.pkl",
-    "Logistic Regression (SMOTE)": "../src/models/trained_models/sentiment_lr_smote.pkl",
-    "XGBoost (Tuned)": "../src/models/trained_models/xgboost_tuned.pkl",
+    "Logistic Regression": "logistic_regression",
+    "Random Forest": "random_forest",
+    "XGBoost": "xgboost",
+    "Naive Bayes": "naive_bayes",
+    "Logistic Regression (SMOTE)": "logistic_regression_smote",
+    "XGBoost (Tuned)": "xgboost_tuned",
 }
 
 # App Config
@@ -48,11 +51,10 @@ if st.button("🚀 Analyze"):
         st.warning("⚠️ Please enter a review first!")
     else:
         # Load Model
-        model_path = model_options[selected_model]
-        model = joblib.load(model_path)
+        model = registry[model_options[selected_model]]
 
         # Vectorize & Predict
-        X_input = vectorizer.transform([review_text])
+        X_input = registry.vectorizer.transform([review_text])
         prediction = model.predict(X_input)[0]
 
         sentiment_map = {0: "Negative 😠", 1: "Neutral 😐", 2: "Positive 😊"}
@@ -1,43 +1,60 @@
-from flask import Flask, render_template, request, jsonify
+import time
+STARTUP_STARTED = time.perf_counter()
+
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, g
 from flask_cors import CORS
-import joblib
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
+import io
 import json
 import os
-from textblob import TextBlob
-import re
-import random
-from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-from wordcloud import WordCloud
+import sys
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import base64
 from io import BytesIO
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.utils import PlotlyJSONEncoder
+
+# Visualization and analytics dependencies (wordcloud, pandas, TextBlob) are
+# imported inside the routes that use them, keeping worker boot fast.
 
 app = Flask(__name__)
 CORS(app)
 
-# Load models and vectorizer
-try:
-    vectorizer = joblib.load('../../src/models/trained_models/vectorizer.pkl')
-    models = {
-        'logistic_regression': joblib.load('../../src/models/trained_models/sentiment_LogisticRegression.pkl'),
-        'random_forest': joblib.load('../../src/models/trained_models/sentiment_RandomForest.pkl'),
-        'xgboost': joblib.load('../../src/models/trained_models/sentiment_XGBoost.pkl'),
-        'naive_bayes': joblib.load('../../src/models/trained_models/sentiment_NaiveBayes.pkl'),
-        'logistic_regression_smote': joblib.load('../../src/models/trained_models/sentiment_lr_smote.pkl'),
-        'xgboost_tuned': joblib.load('../../src/models/trained_models/xgboost_tuned.pkl')
-    }
-    print("Models loaded successfully!")
-except Exception as e:
-    print(f"Error loading models: {e}")
-    models = {}
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.registry import MODEL_VARIANTS, get_registry
+from src.models.prediction_cache import PredictionCache, normalize_text, cache_key
+from src.models.batching import MicroBatcher, MICROBATCH_ENABLED
+from src.models.jobs import JobQueue
+from src.models.cascade import CASCADE_KEY, tier_counts
+from src.models.drift_monitor import summarize as drift_summary
+from src.models.incremental import INCREMENTAL_XGB_ROUNDS, update_kind, update_served_model
+from src.data.stream_reader import iter_records, iter_batches
+from src.data.analytics_store import get_store
+from src.data.prediction_log import get_prediction_log
+from src.data.term_index import get_term_index
+from src.data.near_duplicates import NearDuplicateIndex, NEAR_DUP_ENABLED
+from src.data.review_dataset import REVIEW_COLUMNS, SENTIMENT_RATINGS, group_reviews, query_reviews
+from src.utils.text_analysis import analyze_text, analyze_texts
+from src.utils.instrumentation import MetricsRegistry
+from src.utils.metrics_calculator import load_metrics
+
+# Models and vectorizer are loaded lazily on first use and shared via mmap
+models = get_registry()
+print(f"Model registry ready: {len(models)} models available")
+
+# Warm start: load every model at import time. Under gunicorn with
+# preload_app (see gunicorn.conf.py) this happens once in the master and the
+# mmap-backed arrays are shared copy-on-write by the forked workers.
+PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', '0') == '1'
+preload_timings = {}
+if PRELOAD_MODELS:
+    preload_timings = models.preload()
+    print(f"Preloaded {len(preload_timings)} models in {sum(preload_timings.values()):.2f}s")
 
 # Model metadata
 model_info = {
@@ -88,20 +105,392 @@ model_info = {
         'precision': 0.95,
         'recall': 0.92,
         'f1_score': 0.93
+    },
+    'sgd_logistic': {
+        'name': 'Logistic Regression (SGD)',
+        'description': 'Logistic loss fit by stochastic gradient descent; updated incrementally with new reviews'
+    },
+    'logistic_regression_linear': {
+        'name': 'Logistic Regression (Linear Scorer)',
+        'description': 'Logistic regression compiled to token weight arrays, no sparse matrix'
+    },
+    'logistic_regression_smote_linear': {
+        'name': 'Logistic Regression SMOTE (Linear Scorer)',
+        'description': 'SMOTE logistic regression compiled to token weight arrays'
+    },
+    'naive_bayes_linear': {
+        'name': 'Naive Bayes (Linear Scorer)',
+        'description': 'Naive Bayes compiled to token weight arrays'
+    },
+    'cascade': {
+        'name': 'Cascade (Naive Bayes -> XGBoost)',
+        'description': 'Naive Bayes first; only low-confidence reviews are rescored by tuned XGBoost'
     }
 }
 
+# Reduced-precision and pruned variants are named after their source model; their
+# metrics are measured by scripts/export_quantized_models.py (see model_metrics)
+VARIANT_LABELS = {'float32': 'float32', 'int8': 'int8 quantized', 'pruned': 'pruned'}
+QUANTIZATION_REPORT_FILE = 'quantization_report.json'
+for variant_key, (source_key, kind) in MODEL_VARIANTS.items():
+    model_info[variant_key] = {
+        'name': f"{model_info[source_key]['name']} ({VARIANT_LABELS[kind]})",
+        'description': f"{VARIANT_LABELS[kind].capitalize()} variant of {model_info[source_key]['name']}"
+    }
+
+METRIC_FIELDS = ('accuracy', 'precision', 'recall', 'f1_score')
+# Names used by compute_metrics (metrics.json and the build reports)
+REPORTED_METRICS = {'accuracy': 'Accuracy', 'precision': 'Precision', 'recall': 'Recall', 'f1_score': 'F1 Score'}
+
+def reported_metrics(result):
+    return {field: result.get(name) for field, name in REPORTED_METRICS.items()}
+
+def model_metrics(key):
+    """Accuracy/precision/recall/F1 of a model, None for any that was never measured"""
+    if key.endswith('_linear') and key[:-len('_linear')] in model_info:
+        # export_linear_scorer.py only exports scorers that reproduce their source's probabilities
+        return model_metrics(key[:-len('_linear')])
+    if key == CASCADE_KEY:
+        # Held-out evaluation saved with the cascade by scripts/build_cascade.py
+        report = (getattr(models[key], 'report', None) if key in models else None) or {}
+        if 'metrics' in report:
+            return reported_metrics(report['metrics'])
+        return dict(dict.fromkeys(METRIC_FIELDS), accuracy=report.get('accuracy', {}).get('cascade'))
+    if key in MODEL_VARIANTS:
+        try:
+            with open(os.path.join(models.model_dir, QUANTIZATION_REPORT_FILE)) as f:
+                entry = json.load(f).get('variants', {}).get(key, {})
+        except (OSError, ValueError):
+            entry = {}
+        if 'metrics' in entry:
+            return reported_metrics(entry['metrics'])
+        return dict(dict.fromkeys(METRIC_FIELDS), accuracy=entry.get('accuracy'))
+    # Test-split metrics written by scripts/train_models.py replace the defaults above
+    trained = (load_metrics(os.path.join(models.model_dir, 'metrics.json')) or {}).get('models', {})
+    if 'test' in trained.get(key, {}):
+        return reported_metrics(trained[key]['test'])
+    info = model_info.get(key, {})
+    return {field: info.get(field) for field in METRIC_FIELDS}
+
+def served_model_info():
+    """model_info and metrics of the models whose pickle exists"""
+    return {key: dict(info, **model_metrics(key)) for key, info in model_info.items() if key in models}
+
 # Sentiment mapping
 sentiment_labels = {0: 'Negative', 1: 'Neutral', 2: 'Positive'}
 sentiment_emojis = {0: '😠', 1: '😐', 2: '😊'}
 
-# Load sample data for analytics
-try:
-    sample_data = pd.read_csv('../../src/data/raw/sample.csv')
-    print("Sample data loaded successfully!")
-except Exception as e:
-    print(f"Error loading sample data: {e}")
-    sample_data = pd.DataFrame()
+# Batch inference settings (rows vectorized and scored per chunk)
+BATCH_CHUNK_SIZE = int(os.environ.get('BATCH_CHUNK_SIZE', 1000))
+
+# Prometheus-style metrics served at /metrics (METRICS_ENABLED=0 disables the hooks)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+metrics = MetricsRegistry('sentiment')
+request_count = metrics.counter(
+    'http_requests_total', 'HTTP requests by route, method and status', ['route', 'method', 'status']
+)
+request_latency = metrics.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ['route'], LATENCY_BUCKETS
+)
+model_request_count = metrics.counter('model_requests_total', 'Scoring requests by model and route', ['model', 'route'])
+model_request_latency = metrics.histogram(
+    'model_request_duration_seconds', 'Scoring request latency by model and route', ['model', 'route'], LATENCY_BUCKETS
+)
+stage_latency = metrics.histogram(
+    'stage_duration_seconds', 'Time spent per pipeline stage and model', ['stage', 'model'], LATENCY_BUCKETS
+)
+prediction_count = metrics.counter('predictions_total', 'Predictions served by model and sentiment', ['model', 'sentiment'])
+near_duplicate_count = metrics.counter(
+    'near_duplicate_rows_total', 'Rows answered from a near-duplicate scored in the same batch or stream', ['model']
+)
+
+def observe_stage(stage, model_name, seconds):
+    if METRICS_ENABLED:
+        stage_latency.labels(stage, model_name).observe(seconds)
+
+def requested_fields(data):
+    """Optional response sections asked for via "expand" (or "fields"), as a set"""
+    fields = data.get('expand', data.get('fields', []))
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    return {field.strip() for field in fields if field and field.strip()}
+
+def probabilities_to_dict(probabilities):
+    """Map a predict_proba row onto negative/neutral/positive"""
+    return {
+        'negative': float(probabilities[0]),
+        'neutral': float(probabilities[1]) if len(probabilities) > 2 else 0,
+        'positive': float(probabilities[1 if len(probabilities) == 2 else 2])
+    }
+
+# Prediction cache in front of vectorize + predict (PREDICTION_CACHE_DB adds a SQLite tier)
+PREDICTION_CACHE_ENABLED = os.environ.get('PREDICTION_CACHE_ENABLED', '1') != '0'
+# 'text' keys on case/whitespace-normalized text; 'tokens' keys on the vectorizer's
+# token bag, which catches more near-duplicates but tokenizes every text twice
+PREDICTION_CACHE_KEY = os.environ.get('PREDICTION_CACHE_KEY', 'text')
+prediction_cache = PredictionCache()
+
+def prediction_version(model_name, model):
+    """Version of every pickle a model's predictions depend on: the model, a cascade's
+    tiers and the vectorizer"""
+    keys = [model_name] + list(getattr(model, 'tiers', ())) + ['vectorizer']
+    return '/'.join(models.version(key) for key in keys)
+
+def score_batch(texts, model_name, chunk_size=BATCH_CHUNK_SIZE, use_cache=PREDICTION_CACHE_ENABLED,
+                dedupe=NEAR_DUP_ENABLED, dedup_index=None):
+    """Vectorize and score texts chunk by chunk, one predict_proba call per chunk.
+
+    Cached predictions are served without touching the vectorizer or model.
+    With dedupe, cache misses are grouped by near-duplicate tokens and only
+    each group's first text is scored; pass a NearDuplicateIndex to share
+    groups (and their results) across calls, e.g. the batches of one stream.
+    Only texts that were actually scored are written to the cache.
+    Returns the predicted labels and probability rows in input order (rows are
+    None for models without predict_proba) plus the time spent in each stage.
+    """
+    model = models[model_name]
+    predictions = [None] * len(texts)
+    probabilities = [None] * len(texts)
+    keys = None
+    misses = list(range(len(texts)))
+    cache_time = 0.0
+    vectorize_time = 0.0
+    predict_time = 0.0
+
+    if use_cache:
+        started = time.perf_counter()
+        version = prediction_version(model_name, model)
+        prediction_cache.check_version(model_name, version)
+        analyzer = models.vectorizer.build_analyzer() if PREDICTION_CACHE_KEY == 'tokens' else None
+        keys = [cache_key(normalize_text(text, analyzer), model_name, version) for text in texts]
+        misses = []
+        for i, key in enumerate(keys):
+            cached = prediction_cache.get(key)
+            if cached is None:
+                misses.append(i)
+            else:
+                predictions[i], probabilities[i] = cached
+        cache_time += time.perf_counter() - started
+        observe_stage('cache_lookup', model_name, time.perf_counter() - started)
+
+    to_score = misses
+    groups = None  # text index -> near-duplicate group id, when deduplicating
+    dedup_time = 0.0
+    if (dedupe or dedup_index is not None) and misses:
+        started = time.perf_counter()
+        if dedup_index is None:
+            dedup_index = NearDuplicateIndex(analyzer=models.vectorizer.build_analyzer())
+        group_ids, _ = dedup_index.add([texts[i] for i in misses])
+        groups = dict(zip(misses, group_ids.tolist()))
+        # Score the first text of each group that has no result yet (from this or an earlier call)
+        to_score = []
+        pending = set()
+        for i in misses:
+            if groups[i] not in dedup_index.results and groups[i] not in pending:
+                pending.add(groups[i])
+                to_score.append(i)
+        dedup_time = time.perf_counter() - started
+        observe_stage('dedup', model_name, dedup_time)
+
+    for start in range(0, len(to_score), chunk_size):
+        chunk_indices = to_score[start:start + chunk_size]
+        chunk = [texts[i] for i in chunk_indices]
+
+        started = time.perf_counter()
+        # Compiled scorers tokenize raw text themselves
+        X_chunk = chunk if getattr(model, 'accepts_text', False) else models.vectorizer.transform(chunk)
+        vectorized = time.perf_counter()
+
+        try:
+            chunk_proba = model.predict_proba(X_chunk)
+            classes = np.asarray(getattr(model, 'classes_', np.arange(chunk_proba.shape[1])))
+            chunk_labels = classes[chunk_proba.argmax(axis=1)]
+            chunk_proba = chunk_proba.tolist()
+            stage = 'predict_proba'
+        except Exception:
+            chunk_proba = [None] * len(chunk)
+            chunk_labels = model.predict(X_chunk)
+            stage = 'predict'
+        predicted = time.perf_counter()
+
+        predict_time += predicted - vectorized
+        vectorize_time += vectorized - started
+        observe_stage('vectorize', model_name, vectorized - started)
+        observe_stage(stage, model_name, predicted - vectorized)
+
+        for i, label, proba in zip(chunk_indices, chunk_labels, chunk_proba):
+            predictions[i] = int(label)
+            probabilities[i] = proba
+            if groups is not None:
+                dedup_index.results[groups[i]] = (predictions[i], probabilities[i])
+
+    if groups is not None:
+        # Fan each group's result back out to its other members
+        for i in misses:
+            if predictions[i] is None:
+                predictions[i], probabilities[i] = dedup_index.results[groups[i]]
+        if METRICS_ENABLED:
+            near_duplicate_count.inc(model_name, amount=len(misses) - len(to_score))
+
+    if keys is not None and to_score:
+        # Only rows scored here: a near-duplicate's copied result is not this text's exact prediction
+        started = time.perf_counter()
+        prediction_cache.put_many([(keys[i], (predictions[i], probabilities[i])) for i in to_score], model_name, version)
+        cache_time += time.perf_counter() - started
+
+    if METRICS_ENABLED:
+        for label, n in Counter(predictions).items():
+            prediction_count.inc(model_name, sentiment_labels.get(label, str(label)), amount=n)
+
+    timing = {
+        'cache_ms': round(cache_time * 1000, 3),
+        'cache_hits': len(texts) - len(misses),
+        'vectorize_ms': round(vectorize_time * 1000, 3),
+        'predict_ms': round(predict_time * 1000, 3)
+    }
+    if groups is not None:
+        timing['dedup_ms'] = round(dedup_time * 1000, 3)
+        timing['near_duplicates'] = len(misses) - len(to_score)
+        timing['dedup_ratio'] = round(timing['near_duplicates'] / len(misses), 4)
+    return predictions, probabilities, timing
+
+# Multi-model scoring: one shared vectorize pass, models run concurrently (the
+# sklearn/XGBoost native code releases the GIL) and are combined by voting
+ENSEMBLE_WORKERS = int(os.environ.get('ENSEMBLE_WORKERS', 6))
+ensemble_pool = ThreadPoolExecutor(max_workers=ENSEMBLE_WORKERS, thread_name_prefix='ensemble')
+
+def default_ensemble_models():
+    """Every available model, leaving out *_linear exports and other variants (same weights
+    as their source model) and the cascade (made of other models)"""
+    return [key for key in models
+            if not key.endswith('_linear') and key not in MODEL_VARIANTS and key != CASCADE_KEY]
+
+def class_probabilities(model, X):
+    """Scores as (rows, 3) over sentiment codes; a one-hot vote for models without predict_proba"""
+    n_rows = len(X) if isinstance(X, list) else X.shape[0]
+    full = np.zeros((n_rows, len(sentiment_labels)))
+    if hasattr(model, 'predict_proba'):
+        proba = np.asarray(model.predict_proba(X))
+        classes = np.asarray(getattr(model, 'classes_', np.arange(proba.shape[1]))).astype(int)
+        full[:, classes] = proba
+    else:
+        full[np.arange(n_rows), np.asarray(model.predict(X)).astype(int)] = 1.0
+    return full
+
+def score_ensemble(texts, model_names, weights=None, voting='soft'):
+    """Vectorize once, score every model on the thread pool and combine them.
+
+    Soft voting averages the (weighted) probabilities; hard voting counts each
+    model's (weighted) argmax. Returns (ensemble probabilities, per-model
+    probabilities, per-model seconds, errors, timing).
+    """
+    loaded, errors = {}, {}
+    for name in model_names:
+        try:
+            loaded[name] = models[name]
+        except Exception as e:
+            errors[name] = f'{type(e).__name__}: {e}'
+
+    started = time.perf_counter()
+    needs_matrix = any(not getattr(model, 'accepts_text', False) for model in loaded.values())
+    X = models.vectorizer.transform(texts) if needs_matrix else None
+    vectorized = time.perf_counter()
+
+    def run(model):
+        model_started = time.perf_counter()
+        proba = class_probabilities(model, texts if getattr(model, 'accepts_text', False) else X)
+        return proba, time.perf_counter() - model_started
+
+    futures = {name: ensemble_pool.submit(run, model) for name, model in loaded.items()}
+    per_model, model_seconds = {}, {}
+    for name, future in futures.items():
+        try:
+            per_model[name], model_seconds[name] = future.result()
+            observe_stage('predict_proba', name, model_seconds[name])
+        except Exception as e:
+            errors[name] = f'{type(e).__name__}: {e}'
+    finished = time.perf_counter()
+    observe_stage('vectorize', 'ensemble', vectorized - started)
+
+    combined = np.zeros((len(texts), len(sentiment_labels)))
+    total_weight = 0.0
+    for name, proba in per_model.items():
+        weight = float((weights or {}).get(name, 1.0))
+        if voting == 'hard':
+            proba = np.eye(len(sentiment_labels))[proba.argmax(axis=1)]
+        combined += weight * proba
+        total_weight += weight
+    if total_weight:
+        combined /= total_weight
+
+    timing = {
+        'vectorize_ms': round((vectorized - started) * 1000, 3),
+        'models_wall_ms': round((finished - vectorized) * 1000, 3),
+        'models_sum_ms': round(sum(model_seconds.values()) * 1000, 3),
+        'slowest_model_ms': round(max(model_seconds.values(), default=0) * 1000, 3)
+    }
+    return combined, per_model, model_seconds, errors, timing
+
+# Optional dynamic batching of concurrent /api/predict calls (MICROBATCH_ENABLED=1)
+micro_batcher = MicroBatcher(lambda model_name, texts: score_batch(texts, model_name, len(texts)))
+
+# Incrementally maintained aggregates behind /api/analytics/overview
+analytics_store = get_store()
+
+# Append-only prediction log and its window rollups behind /api/analytics/monitoring;
+# written by a background thread, so recording costs a queue put
+prediction_log = get_prediction_log()
+
+def record_predictions(route, model_name, predictions, probabilities=None):
+    """Count predictions in the analytics store and queue them for the prediction log"""
+    analytics_store.record_predictions(model_name, predictions)
+    prediction_log.record(route, model_name, predictions, probabilities)
+
+# Term-frequency index behind /api/analytics/wordcloud and its rendered PNGs
+term_index = get_term_index()
+wordcloud_cache = {}  # partition -> (index version, data URL)
+
+# Streaming upload settings and per-stream progress counters
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 500))
+STREAM_HISTORY = 20
+stream_progress = OrderedDict()
+stream_lock = threading.Lock()
+
+# Asynchronous jobs for batches too large to score within one request; each
+# process starts its worker pool (and resumes orphaned jobs) on first request
+job_queue = JobQueue()
+
+def _track_stream(stream_id, counters):
+    """Register a stream's counters, keeping only the most recent streams"""
+    with stream_lock:
+        stream_progress[stream_id] = counters
+        while len(stream_progress) > STREAM_HISTORY:
+            oldest = next(iter(stream_progress))
+            if not stream_progress[oldest]['finished']:
+                break
+            stream_progress.pop(oldest)
+
+@app.before_request
+def start_request_timer():
+    if METRICS_ENABLED:
+        g.metrics_started = time.perf_counter()
+    job_queue.start()
+
+@app.after_request
+def record_request_metrics(response):
+    """Per-route and per-model counters and latency (streams are timed to first byte)"""
+    started = g.get('metrics_started')
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        request_count.inc(route, request.method, str(response.status_code))
+        request_latency.labels(route).observe(elapsed)
+        model_name = g.get('metrics_model')
+        if model_name is not None:
+            model_request_count.inc(model_name, route)
+            model_request_latency.labels(model_name, route).observe(elapsed)
+    return response
 
 @app.route('/')
 def home():
@@ -112,14 +501,77 @@ def get_models():
     """Get available models with their metadata"""
     return jsonify({
         'status': 'success',
-        'models': model_info
+        'models': served_model_info()
     })
 
+# Incremental updates from labeled reviews (POST /api/models/<model>/update); off by
+# default, since anyone who can reach the API could then change the served models
+INCREMENTAL_UPDATES_ENABLED = os.environ.get('INCREMENTAL_UPDATES_ENABLED', '0') == '1'
+INCREMENTAL_MAX_ROWS = int(os.environ.get('INCREMENTAL_MAX_ROWS', 10000))
+LABEL_CODES = {'negative': 0, 'neutral': 1, 'positive': 2}
+
+@app.route('/api/models/<model_name>/update', methods=['POST'])
+def update_model(model_name):
+    """Update a model with labeled texts (partial_fit / XGBoost continued training) and hot-swap it"""
+    if not INCREMENTAL_UPDATES_ENABLED:
+        return jsonify({
+            'status': 'error',
+            'message': 'Incremental updates are disabled (set INCREMENTAL_UPDATES_ENABLED=1)'
+        }), 403
+    if model_name not in models:
+        return jsonify({
+            'status': 'error',
+            'message': f'Model {model_name} not found'
+        }), 404
+
+    data = request.get_json(silent=True) or {}
+    texts = data.get('texts') or []
+    # Sentiment codes (0/1/2) or names
+    labels = [LABEL_CODES.get(label.lower(), label) if isinstance(label, str) else label
+              for label in data.get('labels') or []]
+    if not texts or len(texts) != len(labels) or not all(isinstance(text, str) for text in texts):
+        return jsonify({
+            'status': 'error',
+            'message': 'texts and labels must be non-empty lists of the same length'
+        }), 400
+    if not all(label in (0, 1, 2) for label in labels):
+        return jsonify({
+            'status': 'error',
+            'message': 'labels must be negative/neutral/positive or 0/1/2'
+        }), 400
+    if len(texts) > INCREMENTAL_MAX_ROWS:
+        return jsonify({
+            'status': 'error',
+            'message': f'At most {INCREMENTAL_MAX_ROWS} rows per update'
+        }), 400
+
+    try:
+        if update_kind(models[model_name]) is None:
+            return jsonify({
+                'status': 'error',
+                'message': f'Model {model_name} does not support incremental updates'
+            }), 400
+        rounds = int(data.get('xgb_rounds', INCREMENTAL_XGB_ROUNDS))
+        result = update_served_model(models, model_name, texts, [int(label) for label in labels], rounds)
+        return jsonify({
+            'status': 'success',
+            'update': result,
+            'version': models.version(model_name)
+        })
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Update failed: {str(e)}'
+        }), 500
+
 @app.route('/api/predict', methods=['POST'])
 def predict_sentiment():
     """Predict sentiment for single text"""
     try:
+        parse_started = time.perf_counter()
         data = request.get_json()
+        parse_time = time.perf_counter() - parse_started
         text = data.get('text', '')
         model_name = data.get('model', 'logistic_regression')
         
@@ -135,48 +587,55 @@ def predict_sentiment():
                 'message': f'Model {model_name} not found'
             }), 400
             
-        # Vectorize text
-        X_input = vectorizer.transform([text])
-        
-        # Make prediction
-        model = models[model_name]
-        prediction = model.predict(X_input)[0]
+        g.metrics_model = model_name
+        observe_stage('json_parse', model_name, parse_time)
+        expand = requested_fields(data)
+        started = time.perf_counter()
+
+        # Vectorize and predict (served from the prediction cache when possible)
+        if data.get('batching', MICROBATCH_ENABLED):
+            prediction, proba = micro_batcher.submit(model_name, text).result()
+            timing = {}
+        else:
+            predictions, probabilities, timing = score_batch(
+                [text], model_name, 1, data.get('cache', PREDICTION_CACHE_ENABLED)
+            )
+            prediction, proba = predictions[0], probabilities[0]
+        timing['prediction_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        record_predictions('predict', model_name, [prediction], [proba])
         
         # Get prediction probabilities if available
-        try:
-            probabilities = model.predict_proba(X_input)[0]
-            confidence = max(probabilities) * 100
-            prob_dict = {
-                'negative': float(probabilities[0]),
-                'neutral': float(probabilities[1]) if len(probabilities) > 2 else 0,
-                'positive': float(probabilities[1 if len(probabilities) == 2 else 2])
-            }
-        except:
+        if proba is not None:
+            confidence = max(proba) * 100
+            prob_dict = probabilities_to_dict(proba)
+        else:
             confidence = 85.0  # Default confidence
             prob_dict = {'negative': 0.0, 'neutral': 0.0, 'positive': 0.0}
         
-        # Additional text analysis
-        blob = TextBlob(text)
-        word_count = len(text.split())
-        char_count = len(text)
+        result = {
+            'sentiment': sentiment_labels[prediction],
+            'sentiment_code': int(prediction),
+            'emoji': sentiment_emojis[prediction],
+            'confidence': confidence,
+            'probabilities': prob_dict,
+            'model_used': model_info[model_name]['name']
+        }
+
+        # Additional text analysis (opt-in: "expand": ["text_analysis"])
+        if 'text_analysis' in expand:
+            analysis_started = time.perf_counter()
+            result['text_analysis'] = analyze_text(text)
+            observe_stage('text_analysis', model_name, time.perf_counter() - analysis_started)
+            timing['text_analysis_ms'] = round((time.perf_counter() - analysis_started) * 1000, 3)
         
-        return jsonify({
+        serialize_started = time.perf_counter()
+        response = jsonify({
             'status': 'success',
-            'prediction': {
-                'sentiment': sentiment_labels[prediction],
-                'sentiment_code': int(prediction),
-                'emoji': sentiment_emojis[prediction],
-                'confidence': confidence,
-                'probabilities': prob_dict,
-                'model_used': model_info[model_name]['name'],
-                'text_analysis': {
-                    'word_count': word_count,
-                    'character_count': char_count,
-                    'polarity': blob.sentiment.polarity,
-                    'subjectivity': blob.sentiment.subjectivity
-                }
-            }
+            'prediction': result,
+            'timing': timing
         })
+        observe_stage('serialize', model_name, time.perf_counter() - serialize_started)
+        return response
         
     except Exception as e:
         return jsonify({
@@ -188,7 +647,9 @@ def predict_sentiment():
 def batch_predict():
     """Predict sentiment for multiple texts"""
     try:
+        parse_started = time.perf_counter()
         data = request.get_json()
+        parse_time = time.perf_counter() - parse_started
         texts = data.get('texts', [])
         model_name = data.get('model', 'logistic_regression')
         
@@ -204,36 +665,58 @@ def batch_predict():
                 'message': f'Model {model_name} not found'
             }), 400
             
+        try:
+            chunk_size = max(1, int(data.get('chunk_size', BATCH_CHUNK_SIZE)))
+        except (TypeError, ValueError):
+            return jsonify({
+                'status': 'error',
+                'message': 'chunk_size must be a positive integer'
+            }), 400
+
+        g.metrics_model = model_name
+        observe_stage('json_parse', model_name, parse_time)
+        started = time.perf_counter()
+
+        # Skip empty texts but keep their original index
+        indexed_texts = [(i, text) for i, text in enumerate(texts) if text.strip()]
+        predictions, probabilities, timing = score_batch(
+            [text for _, text in indexed_texts], model_name, chunk_size,
+            data.get('cache', PREDICTION_CACHE_ENABLED), data.get('dedupe', NEAR_DUP_ENABLED)
+        )
+
+        record_predictions('batch_predict', model_name, predictions, probabilities)
+        if data.get('ingest'):
+            term_index.add_texts(
+                [text for _, text in indexed_texts], [sentiment_labels[p] for p in predictions]
+            )
+
         results = []
-        model = models[model_name]
-        
-        for i, text in enumerate(texts):
-            if not text.strip():
-                continue
-                
-            # Vectorize and predict
-            X_input = vectorizer.transform([text])
-            prediction = model.predict(X_input)[0]
-            
-            try:
-                probabilities = model.predict_proba(X_input)[0]
-                confidence = max(probabilities) * 100
-            except:
-                confidence = 85.0
-            
+        for (i, text), prediction, proba in zip(indexed_texts, predictions, probabilities):
             results.append({
                 'index': i,
                 'text': text,
                 'sentiment': sentiment_labels[prediction],
-                'sentiment_code': int(prediction),
+                'sentiment_code': prediction,
                 'emoji': sentiment_emojis[prediction],
-                'confidence': confidence
+                'confidence': max(proba) * 100 if proba is not None else 85.0
             })
-        
+
+        if 'text_analysis' in requested_fields(data):
+            analysis_started = time.perf_counter()
+            analyses = analyze_texts([r['text'] for r in results])
+            for r, analysis in zip(results, analyses):
+                r['text_analysis'] = analysis
+            observe_stage('text_analysis', model_name, time.perf_counter() - analysis_started)
+            timing['text_analysis_ms'] = round((time.perf_counter() - analysis_started) * 1000, 3)
+
+        timing['total_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        timing['chunk_size'] = chunk_size
+
         # Generate summary statistics
         sentiment_counts = Counter([r['sentiment'] for r in results])
         
-        return jsonify({
+        serialize_started = time.perf_counter()
+        response = jsonify({
             'status': 'success',
             'results': results,
             'summary': {
@@ -242,8 +725,11 @@ def batch_predict():
                 'negative': sentiment_counts.get('Negative', 0),
                 'neutral': sentiment_counts.get('Neutral', 0),
                 'model_used': model_info[model_name]['name']
-            }
+            },
+            'timing': timing
         })
+        observe_stage('serialize', model_name, time.perf_counter() - serialize_started)
+        return response
         
     except Exception as e:
         return jsonify({
@@ -251,57 +737,432 @@ def batch_predict():
             'message': f'Batch prediction failed: {str(e)}'
         }), 500
 
+@app.route('/api/ensemble_predict', methods=['POST'])
+def ensemble_predict():
+    """Score text(s) with several models in one shared pass and combine them by voting"""
+    try:
+        data = request.get_json() or {}
+        single = 'texts' not in data
+        texts = [data.get('text', '')] if single else data.get('texts', [])
+        if not texts or not all(isinstance(text, str) and text.strip() for text in texts):
+            return jsonify({
+                'status': 'error',
+                'message': 'Text cannot be empty'
+            }), 400
+
+        model_names = data.get('models') or default_ensemble_models()
+        missing = [name for name in model_names if name not in models]
+        if missing:
+            return jsonify({
+                'status': 'error',
+                'message': f"Model {', '.join(missing)} not found"
+            }), 400
+
+        voting = data.get('voting', 'soft')
+        if voting not in ('soft', 'hard'):
+            return jsonify({
+                'status': 'error',
+                'message': 'voting must be soft or hard'
+            }), 400
+        # "weights": {"model": weight, ...} or "accuracy" to weight by measured accuracy
+        weights = data.get('weights')
+        if weights == 'accuracy':
+            weights = {name: model_metrics(name)['accuracy'] or 1.0 for name in model_names}
+        elif weights is not None and not (
+            isinstance(weights, dict)
+            and all(isinstance(w, (int, float)) and w >= 0 for w in weights.values())
+        ):
+            return jsonify({
+                'status': 'error',
+                'message': 'weights must be an object of model weights or "accuracy"'
+            }), 400
+
+        g.metrics_model = 'ensemble'
+        started = time.perf_counter()
+        combined, per_model, model_seconds, errors, timing = score_ensemble(texts, model_names, weights, voting)
+        if not per_model:
+            return jsonify({
+                'status': 'error',
+                'message': f'Every model failed: {errors}'
+            }), 500
+        timing['total_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        def describe(proba):
+            code = int(proba.argmax())
+            return {
+                'sentiment': sentiment_labels[code],
+                'sentiment_code': code,
+                'emoji': sentiment_emojis[code],
+                'confidence': float(proba[code]) * 100,
+                'probabilities': probabilities_to_dict(proba)
+            }
+
+        results = []
+        for i, text in enumerate(texts):
+            results.append({
+                'index': i,
+                'ensemble': describe(combined[i]),
+                'models': {
+                    name: dict(describe(proba[i]), model_used=model_info.get(name, {}).get('name', name))
+                    for name, proba in per_model.items()
+                }
+            })
+        for name in per_model:
+            record_predictions('ensemble_predict', name, per_model[name].argmax(axis=1).tolist(), per_model[name])
+
+        response = {
+            'status': 'success',
+            'voting': voting,
+            'weights': {name: float((weights or {}).get(name, 1.0)) for name in per_model},
+            'model_ms': {name: round(seconds * 1000, 3) for name, seconds in model_seconds.items()},
+            'errors': errors,
+            'timing': timing
+        }
+        if single:
+            response['prediction'] = results[0]
+        else:
+            response['results'] = results
+        return jsonify(response)
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Ensemble prediction failed: {str(e)}'
+        }), 500
+
+@app.route('/api/stream_predict', methods=['POST'])
+def stream_predict():
+    """Score an NDJSON or CSV upload in micro-batches and stream NDJSON results back"""
+    model_name = request.args.get('model', 'logistic_regression')
+    if model_name not in models:
+        return jsonify({
+            'status': 'error',
+            'message': f'Model {model_name} not found'
+        }), 400
+
+    try:
+        batch_size = max(1, int(request.args.get('batch_size', STREAM_BATCH_SIZE)))
+    except ValueError:
+        return jsonify({
+            'status': 'error',
+            'message': 'batch_size must be a positive integer'
+        }), 400
+
+    # Accept either a multipart file field or the raw request body
+    upload = request.files.get('file')
+    source = request.stream
+    filename = ''
+    if upload:
+        # Detach the spooled upload so closing the request does not close it
+        # before the response generator has consumed it
+        source, upload.stream = upload.stream, io.BytesIO()
+        filename = upload.filename or ''
+    fmt = request.args.get('format')
+    if fmt is None:
+        is_csv = 'csv' in (request.content_type or '') or filename.lower().endswith('.csv')
+        fmt = 'csv' if is_csv else 'ndjson'
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({
+            'status': 'error',
+            'message': 'format must be csv or ndjson'
+        }), 400
+
+    # ingest=1 also folds the uploaded reviews into the analytics store and term index
+    ingest = request.args.get('ingest', '0') == '1'
+    # dedupe=1 scores each near-duplicate group once across the whole stream
+    dedupe = request.args.get('dedupe', '1' if NEAR_DUP_ENABLED else '0') == '1'
+    dedup_index = NearDuplicateIndex(analyzer=models.vectorizer.build_analyzer()) if dedupe else None
+    stream_id = uuid.uuid4().hex
+    counters = {
+        'model': model_name,
+        'format': fmt,
+        'rows_read': 0,
+        'rows_scored': 0,
+        'rows_skipped': 0,
+        'near_duplicates': 0 if dedupe else None,
+        'batches': 0,
+        'started_at': datetime.now().isoformat(),
+        'finished': False,
+        'error': None
+    }
+    _track_stream(stream_id, counters)
+    g.metrics_model = model_name
+
+    def generate():
+        sentiment_counts = Counter()
+        text_stream = io.TextIOWrapper(source, encoding='utf-8', errors='replace', newline='')
+        try:
+            for batch in iter_batches(iter_records(text_stream, fmt), batch_size):
+                counters['rows_read'] += len(batch)
+                scored = [record for record in batch if record[3] is None and record[1].strip()]
+
+                for index, _, _, error in batch:
+                    if error is not None:
+                        yield json.dumps({'index': index, 'error': error}) + '\n'
+                counters['rows_skipped'] += len(batch) - len(scored)
+
+                if scored:
+                    predictions, probabilities, timing = score_batch(
+                        [r[1] for r in scored], model_name, len(scored), dedup_index=dedup_index
+                    )
+                    if dedupe:
+                        counters['near_duplicates'] += timing.get('near_duplicates', 0)
+                    record_predictions('stream_predict', model_name, predictions, probabilities)
+                    if ingest:
+                        import pandas as pd
+                        ratings = pd.to_numeric(pd.Series([r[2] for r in scored]), errors='coerce')
+                        analytics_store.add_reviews(pd.DataFrame({'reviews_rating': ratings}))
+                        term_index.add_texts(
+                            [r[1] for r in scored], [sentiment_labels[p] for p in predictions]
+                        )
+                    lines = []
+                    for (index, _, rating, _), prediction, proba in zip(scored, predictions, probabilities):
+                        sentiment_counts[sentiment_labels[prediction]] += 1
+                        lines.append(json.dumps({
+                            'index': index,
+                            'sentiment': sentiment_labels[prediction],
+                            'sentiment_code': prediction,
+                            'confidence': max(proba) * 100 if proba is not None else 85.0,
+                            'rating': rating
+                        }))
+                    counters['rows_scored'] += len(scored)
+                    yield '\n'.join(lines) + '\n'
+
+                counters['batches'] += 1
+
+            yield json.dumps({'summary': {
+                'stream_id': stream_id,
+                'total_processed': counters['rows_scored'],
+                'skipped': counters['rows_skipped'],
+                'near_duplicates': counters['near_duplicates'],
+                'positive': sentiment_counts.get('Positive', 0),
+                'negative': sentiment_counts.get('Negative', 0),
+                'neutral': sentiment_counts.get('Neutral', 0),
+                'model_used': model_info[model_name]['name']
+            }}) + '\n'
+        except Exception as e:
+            counters['error'] = str(e)
+            yield json.dumps({'error': f'Stream prediction failed: {str(e)}'}) + '\n'
+        finally:
+            if upload:
+                source.close()
+            counters['finished'] = True
+            counters['finished_at'] = datetime.now().isoformat()
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['X-Stream-Id'] = stream_id
+    return response
+
+@app.route('/api/stream_predict/progress', methods=['GET'])
+def stream_progress_status():
+    """Progress counters for active and recent streaming uploads"""
+    with stream_lock:
+        streams = {stream_id: dict(counters) for stream_id, counters in stream_progress.items()}
+    stream_id = request.args.get('id')
+    if stream_id:
+        if stream_id not in streams:
+            return jsonify({
+                'status': 'error',
+                'message': f'Stream {stream_id} not found'
+            }), 404
+        streams = {stream_id: streams[stream_id]}
+    return jsonify({
+        'status': 'success',
+        'streams': streams
+    })
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a large batch (JSON texts or an NDJSON/CSV file) for asynchronous scoring"""
+    upload = request.files.get('file')
+    if upload:
+        params = request.form.to_dict()
+        params.update(request.args.to_dict())
+        fmt = params.get('format') or ('csv' if (upload.filename or '').lower().endswith('.csv') else 'ndjson')
+        text_stream = io.TextIOWrapper(upload.stream, encoding='utf-8', errors='replace', newline='')
+        try:
+            # Unreadable records are kept as empty rows so result indices match the file
+            texts = [text if error is None else '' for _, text, _, error in iter_records(text_stream, fmt)]
+        except ValueError as e:
+            return jsonify({
+                'status': 'error',
+                'message': str(e)
+            }), 400
+    else:
+        params = request.get_json(silent=True) or {}
+        texts = params.get('texts', [])
+
+    model_name = params.get('model', 'logistic_regression')
+    if not texts:
+        return jsonify({
+            'status': 'error',
+            'message': 'No texts provided'
+        }), 400
+    if model_name not in models:
+        return jsonify({
+            'status': 'error',
+            'message': f'Model {model_name} not found'
+        }), 400
+    try:
+        shard_size = int(params['shard_size']) if params.get('shard_size') else None
+    except (TypeError, ValueError):
+        return jsonify({
+            'status': 'error',
+            'message': 'shard_size must be a positive integer'
+        }), 400
+
+    # Form fields arrive as strings, JSON bodies as booleans
+    dedupe = str(params.get('dedupe', NEAR_DUP_ENABLED)).lower() in ('1', 'true')
+    job = job_queue.submit([str(text) if text is not None else '' for text in texts], model_name, shard_size, dedupe)
+    response = jsonify({
+        'status': 'success',
+        'job': job
+    })
+    response.status_code = 202
+    response.headers['Location'] = f"/api/jobs/{job['job_id']}"
+    return response
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Status of every job on disk, newest first"""
+    return jsonify({
+        'status': 'success',
+        'jobs': job_queue.jobs()
+    })
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Progress of one job"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'job': job_queue.status(job_id)
+        })
+    except KeyError:
+        return jsonify({
+            'status': 'error',
+            'message': f'Job {job_id} not found'
+        }), 404
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """Download a job's results as npz (default), csv or ndjson; partial=1 allows unfinished jobs"""
+    try:
+        job = job_queue.status(job_id)
+    except KeyError:
+        return jsonify({
+            'status': 'error',
+            'message': f'Job {job_id} not found'
+        }), 404
+    if job['finished_at'] is None and request.args.get('partial', '0') != '1':
+        return jsonify({
+            'status': 'error',
+            'message': f"Job {job_id} is {job['status']} ({job['progress']:.0%} done)"
+        }), 409
+
+    fmt = request.args.get('format', 'npz')
+    if fmt == 'npz':
+        # Compact arrays: row index, int8 sentiment code (-1 = empty/unscored), float32 probabilities
+        shards = list(job_queue.iter_results(job_id))
+        width = max((proba.shape[1] for _, _, proba in shards), default=0)
+        buffer = BytesIO()
+        np.savez_compressed(
+            buffer,
+            index=np.concatenate([np.arange(start, start + len(p)) for start, p, _ in shards] or [np.zeros(0, np.int64)]),
+            predictions=np.concatenate([p for _, p, _ in shards] or [np.zeros(0, np.int8)]),
+            # Shards with no scorable text have no probability columns: pad them with NaN
+            probabilities=np.concatenate([
+                proba if proba.shape[1] == width else np.full((len(p), width), np.nan, np.float32)
+                for _, p, proba in shards
+            ] or [np.zeros((0, width), np.float32)])
+        )
+        return Response(buffer.getvalue(), mimetype='application/octet-stream', headers={
+            'Content-Disposition': f'attachment; filename=job_{job_id}.npz'
+        })
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({
+            'status': 'error',
+            'message': 'format must be npz, csv or ndjson'
+        }), 400
+
+    def generate():
+        if fmt == 'csv':
+            yield 'index,sentiment_code,sentiment,confidence\n'
+        for start, predictions, probabilities in job_queue.iter_results(job_id):
+            lines = []
+            for offset, prediction in enumerate(predictions.tolist()):
+                proba = probabilities[offset] if probabilities.size else None
+                confidence = round(float(proba.max()) * 100, 2) if proba is not None and prediction >= 0 else None
+                sentiment = sentiment_labels.get(prediction, '')
+                if fmt == 'csv':
+                    code = prediction if prediction >= 0 else ''
+                    lines.append(f"{start + offset},{code},{sentiment},{'' if confidence is None else confidence}")
+                else:
+                    lines.append(json.dumps({
+                        'index': start + offset,
+                        'sentiment': sentiment or None,
+                        'sentiment_code': prediction if prediction >= 0 else None,
+                        'confidence': confidence
+                    }))
+            yield '\n'.join(lines) + '\n'
+
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename=job_{job_id}.{fmt}'
+    })
+
+@app.route('/api/jobs/<job_id>/retry', methods=['POST'])
+def retry_job(job_id):
+    """Re-queue the failed shards of a finished job"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'job': job_queue.retry(job_id)
+        })
+    except KeyError:
+        return jsonify({
+            'status': 'error',
+            'message': f'Job {job_id} not found'
+        }), 404
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def delete_job(job_id):
+    """Cancel a job's queued shards and delete its files"""
+    try:
+        job_queue.delete(job_id)
+    except KeyError:
+        return jsonify({
+            'status': 'error',
+            'message': f'Job {job_id} not found'
+        }), 404
+    return jsonify({
+        'status': 'success',
+        'message': f'Job {job_id} deleted'
+    })
+
 @app.route('/api/analytics/overview', methods=['GET'])
 def get_analytics_overview():
     """Get overall analytics dashboard data"""
     try:
-        if sample_data.empty:
+        overview = analytics_store.overview()
+        if overview['total_reviews'] == 0 and overview['total_predictions'] == 0:
             return jsonify({
                 'status': 'error',
-                'message': 'No data available for analytics'
+                'message': 'No data available for analytics (run scripts/rebuild_analytics.py)'
             }), 404
-            
-        # Generate sentiment distribution
-        sentiment_counts = sample_data['reviews_rating'].value_counts()
-        
-        # Map ratings to sentiment (simple mapping)
-        positive_count = sentiment_counts.get(5, 0) + sentiment_counts.get(4, 0)
-        neutral_count = sentiment_counts.get(3, 0)
-        negative_count = sentiment_counts.get(2, 0) + sentiment_counts.get(1, 0)
-        
-        # Brand analysis
-        brand_sentiment = sample_data.groupby('brand')['reviews_rating'].agg(['count', 'mean']).reset_index()
-        brand_sentiment = brand_sentiment.sort_values('count', ascending=False).head(10)
-        
-        # Time series data (mock for demonstration)
-        dates = []
-        sentiment_trend = []
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            dates.append(date.strftime('%Y-%m-%d'))
-            sentiment_trend.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'positive': random.randint(20, 80),
-                'negative': random.randint(10, 40),
-                'neutral': random.randint(15, 35)
-            })
         
         return jsonify({
             'status': 'success',
             'analytics': {
-                'sentiment_distribution': {
-                    'positive': int(positive_count),
-                    'negative': int(negative_count),
-                    'neutral': int(neutral_count)
-                },
-                'total_reviews': len(sample_data),
-                'average_rating': float(sample_data['reviews_rating'].mean()),
-                'top_brands': brand_sentiment.to_dict('records'),
-                'sentiment_trend': sentiment_trend[:7],  # Last 7 days
+                'sentiment_distribution': overview['sentiment_distribution'],
+                'total_reviews': overview['total_reviews'],
+                'average_rating': overview['average_rating'],
+                'top_brands': overview['top_brands'],
+                'sentiment_trend': overview['sentiment_trend'],  # Last 7 days of predictions
                 'model_performance': {
                     'best_model': 'Random Forest',
                     'accuracy': 0.90,
-                    'total_predictions': 1250
+                    'total_predictions': overview['total_predictions']
                 }
             }
         })
@@ -312,35 +1173,76 @@ def get_analytics_overview():
             'message': f'Analytics failed: {str(e)}'
         }), 500
 
+@app.route('/api/analytics/monitoring', methods=['GET'])
+def get_prediction_monitoring():
+    """Live throughput, class mix, confidence histogram and drift (PSI) per model and window"""
+    try:
+        hours = float(request.args.get('hours', 24))
+        window_seconds = int(request.args.get('window', 300))
+        if hours <= 0 or window_seconds <= 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({
+            'status': 'error',
+            'message': 'hours and window must be positive numbers'
+        }), 400
+
+    try:
+        summary = drift_summary(analytics_store, hours, window_seconds, request.args.get('model'), registry=models)
+        return jsonify({
+            'status': 'success',
+            'monitoring': summary,
+            'prediction_log': prediction_log.stats()
+        })
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Monitoring failed: {str(e)}'
+        }), 500
+
 @app.route('/api/analytics/wordcloud', methods=['GET'])
 def generate_wordcloud():
-    """Generate word cloud from review texts"""
+    """Generate word cloud from the term-frequency index (optionally ?sentiment= or ?brand=)"""
     try:
-        if sample_data.empty:
+        partition = 'all'
+        if request.args.get('sentiment'):
+            partition = f"sentiment:{request.args['sentiment'].lower()}"
+        elif request.args.get('brand'):
+            partition = f"brand:{request.args['brand']}"
+
+        # Rendered PNGs are reused until the underlying counts change (here or in another worker)
+        term_index.refresh()
+        version = term_index.version
+        cached = wordcloud_cache.get(partition)
+        if cached is not None and cached[0] == version:
+            return jsonify({
+                'status': 'success',
+                'wordcloud': cached[1]
+            })
+
+        frequencies = term_index.frequencies(partition, max_words=100)
+        if not frequencies:
             return jsonify({
                 'status': 'error',
                 'message': 'No data available'
             }), 404
-            
-        # Combine all review texts
-        all_texts = ' '.join(sample_data['reviews_text'].dropna().astype(str))
-        
-        # Clean text for word cloud
-        cleaned_text = re.sub(r'[^\w\s]', '', all_texts.lower())
         
         # Generate word cloud
+        from wordcloud import WordCloud
         wordcloud = WordCloud(
             width=800,
             height=400,
             background_color='white',
             colormap='viridis',
             max_words=100
-        ).generate(cleaned_text)
+        ).generate_from_frequencies(frequencies)
         
         # Convert to base64 image
         img_buffer = BytesIO()
         wordcloud.to_image().save(img_buffer, format='PNG')
         img_str = base64.b64encode(img_buffer.getvalue()).decode()
+        wordcloud_cache[partition] = (version, f'data:image/png;base64,{img_str}')
         
         return jsonify({
             'status': 'success',
@@ -353,13 +1255,73 @@ def generate_wordcloud():
             'message': f'Word cloud generation failed: {str(e)}'
         }), 500
 
+@app.route('/api/analytics/reviews', methods=['GET'])
+def query_review_dataset():
+    """Query the ingested review dataset (scripts/ingest_reviews.py), reading only the requested columns.
+
+    ?columns=reviews_text,reviews_rating&limit=&offset= returns a page of rows;
+    ?group_by=brand|reviews_rating returns per-group counts and mean rating.
+    Both accept rating=, brand= and sentiment= filters.
+    """
+    try:
+        filters = {
+            'rating': int(request.args['rating']) if request.args.get('rating') else None,
+            'brand': request.args.get('brand') or None,
+            'sentiment': request.args.get('sentiment', '').lower() or None
+        }
+        group_by = request.args.get('group_by')
+        columns = [c for c in request.args.get('columns', 'reviews_text,reviews_rating').split(',') if c]
+        limit = max(min(int(request.args.get('limit', 100)), 1000), 0)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({
+            'status': 'error',
+            'message': 'rating, limit and offset must be integers'
+        }), 400
+    unknown = [c for c in columns + ([group_by] if group_by else []) if c not in REVIEW_COLUMNS]
+    if unknown:
+        return jsonify({
+            'status': 'error',
+            'message': f"Unknown column(s) {', '.join(unknown)}; available: {', '.join(REVIEW_COLUMNS)}"
+        }), 400
+    if filters['sentiment'] is not None and filters['sentiment'] not in SENTIMENT_RATINGS:
+        return jsonify({
+            'status': 'error',
+            'message': f"sentiment must be one of {', '.join(SENTIMENT_RATINGS)}"
+        }), 400
+
+    try:
+        if group_by:
+            return jsonify({
+                'status': 'success',
+                'group_by': group_by,
+                'groups': group_reviews(group_by, **filters)
+            })
+        total, rows = query_reviews(columns, limit, offset, **filters)
+        return jsonify({
+            'status': 'success',
+            'total': total,
+            'offset': offset,
+            'reviews': rows
+        })
+    except FileNotFoundError:
+        return jsonify({
+            'status': 'error',
+            'message': 'No review dataset (run scripts/ingest_reviews.py)'
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Review query failed: {str(e)}'
+        }), 500
+
 @app.route('/api/analytics/model_comparison', methods=['GET'])
 def get_model_comparison():
     """Get model performance comparison data"""
     try:
         comparison_data = []
         
-        for model_key, info in model_info.items():
+        for model_key, info in served_model_info().items():
             comparison_data.append({
                 'model': info['name'],
                 'accuracy': info['accuracy'],
@@ -386,8 +1348,53 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'models_loaded': len(models),
-        'available_models': list(models.keys())
+        'available_models': list(models.keys()),
+        'model_registry': models.stats(),
+        'prediction_cache': prediction_cache.stats(),
+        'micro_batching': dict(micro_batcher.stats(), enabled=MICROBATCH_ENABLED),
+        'term_index': term_index.stats(),
+        'jobs': job_queue.stats(),
+        'prediction_log': prediction_log.stats(),
+        'cascade': models[CASCADE_KEY].stats() if models.is_loaded(CASCADE_KEY) else None,
+        'startup': {
+            'import_seconds': round(STARTUP_SECONDS, 3),
+            'preloaded': PRELOAD_MODELS,
+            'preload_ms': {key: round(seconds * 1000, 1) for key, seconds in preload_timings.items()},
+            'pid': os.getpid()
+        }
     })
 
+# Scrape-time gauges over the cache, micro-batcher, registry and streams
+metrics.gauge('prediction_cache_entries', 'Entries in the in-memory prediction cache',
+              lambda: prediction_cache.stats()['entries'])
+metrics.gauge('prediction_cache_lookups_total', 'Prediction cache lookups by result',
+              lambda: {result: prediction_cache.counters[result] for result in ('hits', 'disk_hits', 'misses')},
+              ['result'], kind='counter')
+metrics.gauge('prediction_cache_hit_ratio', 'Prediction cache hit ratio', lambda: prediction_cache.stats()['hit_rate'])
+metrics.gauge('microbatch_queue_depth', 'Requests waiting per micro-batch queue',
+              lambda: {name: q.qsize() for name, q in micro_batcher._queues.items()}, ['model'])
+metrics.expose_histogram('microbatch_batch_size', 'Requests per dispatched micro-batch', micro_batcher.batch_sizes)
+metrics.expose_histogram('microbatch_queue_time_ms', 'Time requests wait for a micro-batch (ms)', micro_batcher.queue_times)
+metrics.gauge('models_loaded', 'Models currently resident in the registry', lambda: len(models.stats()['loaded_models']))
+metrics.gauge('models_resident_bytes', 'Private memory held by loaded models', lambda: models.resident_bytes())
+metrics.gauge('cascade_tier_rows_total', 'Rows answered by each cascade tier',
+              lambda: {(name, tier): rows for name, counts in list(tier_counts.items())
+                       for tier, rows in zip(counts['tiers'], counts['rows'])},
+              ['model', 'tier'], kind='counter')
+metrics.gauge('prediction_log_rows_total', 'Predictions written to or dropped from the prediction log',
+              lambda: {result: prediction_log.counters[f'rows_{result}'] for result in ('logged', 'dropped')},
+              ['result'], kind='counter')
+metrics.gauge('prediction_log_queue_depth', 'Calls waiting for the prediction log writer',
+              lambda: prediction_log.stats()['queued'])
+metrics.gauge('active_streams', 'Streaming uploads in progress',
+              lambda: sum(1 for counters in list(stream_progress.values()) if not counters['finished']))
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Metrics for this worker process in the Prometheus text format"""
+    return Response(metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
+
+STARTUP_SECONDS = time.perf_counter() - STARTUP_STARTED
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -0,0 +1,259 @@
+"""
+ASGI entry point for the advanced web app
+
+    cd frontend/advanced_web_app && uvicorn asgi:app --workers 4
+
+Serves the Flask app's routes unchanged. Request bodies are read and responses
+written on the event loop, so a slow client costs a coroutine rather than a
+worker thread. Only fully received requests are handed to the Flask app,
+which runs on a bounded thread pool (ASGI_THREADS). Bodies above
+ASGI_SPOOL_BYTES are spooled to a temporary file instead of memory. Streamed
+responses (stream_predict, job results) are produced one chunk per executor
+call and sent between calls, so a slow reader holds no thread either.
+
+Backpressure: a request is admitted once its body has been received, and at
+most ASGI_MAX_PENDING admitted requests may be queued for or running in the
+pool; beyond that API requests get 429 with Retry-After. Requests still
+uploading have their own cap (ASGI_MAX_UPLOADS), so slow uploads cannot
+starve complete requests. /api/health and /metrics are always admitted. On shutdown new requests get 503, in-flight
+ones get ASGI_DRAIN_SECONDS to finish, the job worker pool is stopped
+(unfinished jobs resume on the next start) and the prediction log is flushed.
+
+Use one uvicorn worker process per core for CPU parallelism; within a process
+the pool overlaps the model code that releases the GIL (sparse products,
+XGBoost) with request I/O.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app as flask_app, job_queue, metrics, prediction_log
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', min(8, (os.cpu_count() or 1) * 2)))
+ASGI_MAX_PENDING = int(os.environ.get('ASGI_MAX_PENDING', 64))
+ASGI_MAX_UPLOADS = int(os.environ.get('ASGI_MAX_UPLOADS', 256))
+ASGI_SPOOL_BYTES = int(os.environ.get('ASGI_SPOOL_BYTES', 1024 * 1024))
+ASGI_DRAIN_SECONDS = float(os.environ.get('ASGI_DRAIN_SECONDS', 30))
+ASGI_RETRY_AFTER = int(os.environ.get('ASGI_RETRY_AFTER', 1))
+
+# Always admitted, so health checks and scrapes still answer under load
+UNTHROTTLED_PATHS = ('/api/health', '/metrics')
+
+_SENTINEL = object()
+
+
+def _json_body(message):
+    return json.dumps({'status': 'error', 'message': message}).encode()
+
+
+class WSGIBridge:
+    """ASGI application running a WSGI app on a bounded thread pool with admission control"""
+
+    def __init__(self, wsgi_app, threads=ASGI_THREADS, max_pending=ASGI_MAX_PENDING, max_uploads=ASGI_MAX_UPLOADS,
+                 spool_bytes=ASGI_SPOOL_BYTES, drain_seconds=ASGI_DRAIN_SECONDS):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='asgi')
+        self.threads = threads
+        self.max_pending = max_pending
+        self.max_uploads = max_uploads
+        self.spool_bytes = spool_bytes
+        self.drain_seconds = drain_seconds
+        self.pending = 0  # admitted requests not yet fully answered
+        self.uploading = 0  # requests whose body is still being received
+        self.draining = False
+        self.counters = {'admitted': 0, 'rejected': 0, 'disconnected': 0}
+        self._idle = None  # asyncio.Event set whenever pending drops to zero
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._idle = asyncio.Event()
+                self._idle.set()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.drain()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def drain(self):
+        """Refuse new requests, wait for in-flight ones, then stop the pools"""
+        self.draining = True
+        if self._idle is not None and self.pending:
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.drain_seconds)
+            except asyncio.TimeoutError:
+                print(f'Drain timed out with {self.pending} request(s) in flight', file=sys.stderr)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        job_queue.shutdown()
+        prediction_log.close()
+
+    async def http(self, scope, receive, send):
+        if self.draining:
+            await self._reject(send, 503, 'Server is shutting down', close=True)
+            return
+        throttled = scope['path'] not in UNTHROTTLED_PATHS
+        if throttled and self.uploading >= self.max_uploads:
+            self.counters['rejected'] += 1
+            await self._reject(send, 429, 'Server busy, retry later')
+            return
+
+        body = tempfile.SpooledTemporaryFile(max_size=self.spool_bytes)
+        try:
+            self.uploading += 1
+            try:
+                disconnected = await self._read_body(receive, body)
+            finally:
+                self.uploading -= 1
+            if disconnected:
+                self.counters['disconnected'] += 1
+                return
+            if self.draining:
+                await self._reject(send, 503, 'Server is shutting down', close=True)
+                return
+            if throttled and self.pending >= self.max_pending:
+                self.counters['rejected'] += 1
+                await self._reject(send, 429, 'Server busy, retry later')
+                return
+
+            self.pending += 1
+            self.counters['admitted'] += 1
+            if self._idle is not None:
+                self._idle.clear()
+            try:
+                body.seek(0)
+                await self._respond(self._environ(scope, body), receive, send)
+            finally:
+                self.pending -= 1
+                if not self.pending and self._idle is not None:
+                    self._idle.set()
+        finally:
+            body.close()
+
+    async def _read_body(self, receive, body):
+        """Spool the request body; True if the client went away first"""
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return True
+            body.write(message.get('body', b''))
+            if not message.get('more_body', False):
+                return False
+
+    async def _respond(self, environ, receive, send):
+        loop = asyncio.get_running_loop()
+        # One context per request: Flask's request context is pushed and popped
+        # from whichever pool thread runs each step
+        context = contextvars.copy_context()
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+            return lambda data: None
+
+        def call_app():
+            """Run the view; a response with a Content-Length is already built, so
+            it is collected (and closed) in the same pool call"""
+            iterable = self.wsgi_app(environ, start_response)
+            if not any(name == b'content-length' for name, _ in response['headers']):
+                return iterable, None
+            try:
+                return None, b''.join(iterable)
+            finally:
+                if hasattr(iterable, 'close'):
+                    iterable.close()
+
+        iterable, body = await loop.run_in_executor(self.executor, context.run, call_app)
+        if iterable is None:
+            await send({'type': 'http.response.start', 'status': response['status'], 'headers': response['headers']})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+
+        # Streamed response: one chunk per pool call, sent while no thread is held
+        iterator = iter(iterable)
+        disconnected = asyncio.Event()
+        watcher = asyncio.ensure_future(self._watch_disconnect(receive, disconnected))
+        try:
+            chunk = await loop.run_in_executor(self.executor, context.run, next, iterator, _SENTINEL)
+            await send({'type': 'http.response.start', 'status': response['status'], 'headers': response['headers']})
+            while chunk is not _SENTINEL and not disconnected.is_set():
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunk = await loop.run_in_executor(self.executor, context.run, next, iterator, _SENTINEL)
+            if disconnected.is_set():
+                self.counters['disconnected'] += 1
+            else:
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            watcher.cancel()
+            if hasattr(iterable, 'close'):
+                await loop.run_in_executor(self.executor, context.run, iterable.close)
+
+    async def _watch_disconnect(self, receive, disconnected):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+
+    async def _reject(self, send, status, message, close=False):
+        headers = [(b'content-type', b'application/json'), (b'retry-after', str(ASGI_RETRY_AFTER).encode())]
+        if close:
+            headers.append((b'connection', b'close'))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': _json_body(message)})
+
+    def _environ(self, scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope['query_string'].decode('latin-1'),
+            'SERVER_NAME': str(server[0]),
+            'SERVER_PORT': str(server[1]),
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+        return environ
+
+    def stats(self):
+        return dict(self.counters, pending=self.pending, max_pending=self.max_pending, uploading=self.uploading,
+                    max_uploads=self.max_uploads, threads=self.threads, draining=self.draining)
+
+
+app = WSGIBridge(flask_app)
+
+metrics.gauge('asgi_pending_requests', 'Requests admitted and not yet answered (ASGI mode)',
+              lambda: app.pending)
+metrics.gauge('asgi_uploading_requests', 'Requests whose body is still being received (ASGI mode)',
+              lambda: app.uploading)
+metrics.gauge('asgi_requests_total', 'ASGI admission decisions',
+              lambda: {result: app.counters[result] for result in ('admitted', 'rejected', 'disconnected')},
+              ['result'], kind='counter')
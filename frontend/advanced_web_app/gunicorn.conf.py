@@ -0,0 +1,25 @@
+"""
+Gunicorn settings for the advanced web app
+
+    cd frontend/advanced_web_app && gunicorn app:app
+
+The app is imported once in the master (preload_app) with PRELOAD_MODELS=1,
+so the vectorizer and model pickles are loaded before fork and workers boot
+without re-importing anything. SQLite connections are opened lazily per
+process, so nothing opened in the master is shared with the workers.
+"""
+
+import multiprocessing
+import os
+
+os.environ.setdefault('PRELOAD_MODELS', '1')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', min(4, multiprocessing.cpu_count())))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+
+def post_fork(server, worker):
+    server.log.info('Worker %s forked from a preloaded master', worker.pid)
@@ -452,7 +452,7 @@ async function analyzeSentiment() {
     try {
         const data = await makeAPIRequest('/predict', {
             method: 'POST',
-            body: JSON.stringify({ text, model })
+            body: JSON.stringify({ text, model, expand: ['text_analysis'] })
         });
         
         displayAnalysisResults(data.prediction);
@@ -655,6 +655,11 @@ async function loadModelsData() {
     }
 }
 
+// Metrics are null for models that have not been evaluated
+function formatMetric(value) {
+    return value === null || value === undefined ? 'n/a' : `${(value * 100).toFixed(1)}%`;
+}
+
 function displayModelsGrid(models) {
     const container = document.getElementById('models-grid');
     container.innerHTML = '';
@@ -667,19 +672,19 @@ function displayModelsGrid(models) {
             <p>${model.description}</p>
             <div class="model-metrics">
                 <div class="metric">
-                    <span class="metric-value">${(model.accuracy * 100).toFixed(1)}%</span>
+                    <span class="metric-value">${formatMetric(model.accuracy)}</span>
                     <span class="metric-label">Accuracy</span>
                 </div>
                 <div class="metric">
-                    <span class="metric-value">${(model.precision * 100).toFixed(1)}%</span>
+                    <span class="metric-value">${formatMetric(model.precision)}</span>
                     <span class="metric-label">Precision</span>
                 </div>
                 <div class="metric">
-                    <span class="metric-value">${(model.recall * 100).toFixed(1)}%</span>
+                    <span class="metric-value">${formatMetric(model.recall)}</span>
                     <span class="metric-label">Recall</span>
                 </div>
                 <div class="metric">
-                    <span class="metric-value">${(model.f1_score * 100).toFixed(1)}%</span>
+                    <span class="metric-value">${formatMetric(model.f1_score)}</span>
                     <span class="metric-label">F1 Score</span>
                 </div>
             </div>
@@ -0,0 +1,88 @@
+"""Benchmark latency and throughput of every served model on real review text
+and write the results to benchmarks.json for the performance dashboard.
+
+Each model runs in a fresh process so peak RSS is attributable to it.
+
+Usage: python scripts/benchmark_models.py [--rows 2000] [--models naive_bayes xgboost]
+"""
+import argparse
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.data_processor import RAW_DIR, expand_paths, iter_review_chunks
+from src.utils.benchmark import BENCHMARK_FILE, benchmark_model, save_benchmarks
+
+
+def load_texts(paths, rows, seed=42):
+    """Sample review texts from the raw CSVs"""
+    texts = []
+    for chunk in iter_review_chunks(paths, usecols=['reviews_text']):
+        if 'reviews_text' in chunk.columns:
+            texts.extend(chunk['reviews_text'].dropna().astype(str).tolist())
+    random.Random(seed).shuffle(texts)
+    return texts[:rows]
+
+
+def _benchmark_in_process(key, texts, batch_size, concurrency):
+    from src.models.registry import get_registry
+    return benchmark_model(get_registry(), key, texts, batch_size, concurrency)
+
+
+def main():
+    from src.models.registry import get_registry
+
+    parser = argparse.ArgumentParser(description='Benchmark served models for latency and throughput')
+    parser.add_argument('--data', nargs='+', default=[os.path.join(RAW_DIR, '*.csv')], help='CSV files or glob patterns')
+    parser.add_argument('--models', nargs='+', help='Registry keys (default: every available model)')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--output', default=BENCHMARK_FILE)
+    args = parser.parse_args()
+
+    texts = load_texts(expand_paths(args.data), args.rows)
+    keys = args.models or list(get_registry())
+    print(f"Benchmarking {len(keys)} models on {len(texts)} reviews")
+
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for key in keys:
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                results[key] = pool.submit(
+                    _benchmark_in_process, key, texts, args.batch_size, args.concurrency
+                ).result()
+            except Exception as e:
+                results[key] = {'error': f'{type(e).__name__}: {e}'}
+                print(f"{key}: failed ({results[key]['error']})")
+                continue
+        result = results[key]
+        print(f"{key}: single p50/p95/p99 {result['single']['p50_ms']:.2f}/{result['single']['p95_ms']:.2f}/"
+              f"{result['single']['p99_ms']:.2f} ms, batched {result['batched']['rows_per_sec']:.0f} rows/s, "
+              f"concurrent p95 {result['concurrent']['p95_ms']:.2f} ms, "
+              f"peak RSS {result['peak_rss_bytes'] / 2 ** 20:.0f} MB ({time.perf_counter() - started:.1f}s)")
+
+    save_benchmarks({
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': len(texts),
+        'batch_size': args.batch_size,
+        'concurrency': args.concurrency,
+        'host': {'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count()},
+        'models': results
+    }, args.output)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the notebook's preprocess/lemmatize functions against
+src.utils.text_preprocessor and check that both produce the same output.
+
+Usage: python scripts/benchmark_preprocessing.py [--rows 2000] [--n-jobs 4]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils import text_preprocessor
+
+
+# Reference implementations, as written in notebooks/Sentiment_Analysis.ipynb
+def notebook_preprocess(document):
+    from nltk.corpus import stopwords
+    from nltk.tokenize import word_tokenize
+    document = document.lower()
+    document = re.sub(r"[^\sA-z]", "", document)
+    words = word_tokenize(document)
+    words = [word for word in words if word not in stopwords.words("english")]
+    words = [w for w in words if len(w) > 1]
+    document = " ".join(words)
+    return(document)
+
+
+def notebook_lemmatize_text_blob(text):
+    from textblob import TextBlob
+    return " ".join([word.lemmatize() for word in TextBlob(text).words])
+
+
+def rows_per_second(func, documents):
+    started = time.perf_counter()
+    output = func(documents)
+    elapsed = time.perf_counter() - started
+    return output, len(documents) / elapsed if elapsed else float('inf'), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=os.path.join(PROJECT_ROOT, 'src', 'data', 'raw', 'reviews.csv'))
+    parser.add_argument('--column', default='reviews_text')
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--n-jobs', type=int, default=text_preprocessor.PREPROCESS_N_JOBS)
+    args = parser.parse_args()
+
+    documents = pd.read_csv(args.data, nrows=args.rows)[args.column].fillna('').astype(str).tolist()
+
+    before, before_rate, before_time = rows_per_second(
+        lambda docs: [notebook_lemmatize_text_blob(notebook_preprocess(d)) for d in docs], documents
+    )
+    text_preprocessor.lemmatize_word.cache_clear()
+    after, after_rate, after_time = rows_per_second(
+        lambda docs: text_preprocessor.clean_texts(docs, n_jobs=1), documents
+    )
+    parallel, parallel_rate, parallel_time = rows_per_second(
+        lambda docs: text_preprocessor.clean_texts(docs, n_jobs=args.n_jobs), documents
+    )
+
+    mismatches = sum(1 for a, b in zip(before, after) if a != b)
+    mismatches += sum(1 for a, b in zip(before, parallel) if a != b)
+
+    print(f"Rows: {len(documents)}")
+    print(f"Notebook pipeline:        {before_rate:10.1f} rows/sec ({before_time:.2f}s)")
+    print(f"text_preprocessor:        {after_rate:10.1f} rows/sec ({after_time:.2f}s, "
+          f"{after_rate / before_rate:.1f}x)")
+    print(f"text_preprocessor x{args.n_jobs:<3}:  {parallel_rate:10.1f} rows/sec ({parallel_time:.2f}s, "
+          f"{parallel_rate / before_rate:.1f}x)")
+    print(f"Output mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Build the confidence-gated cascade served under the 'cascade' model key.
+
+Scores the training pipeline's held-out split with a cheap model and an
+expensive one, sweeps the escalation threshold and reports, per threshold, how
+many rows reach the expensive tier, the resulting accuracy and the expected
+CPU time per review. Unless --threshold is given, the threshold kept is the
+one with the fewest escalations whose accuracy is within --max-accuracy-drop
+of the better of the two models (or the most accurate one if none is). The
+chosen cascade is timed end to end and saved with its report; the running app
+picks it up on the next request.
+
+Usage: python scripts/build_cascade.py [--fast naive_bayes] [--slow xgboost_tuned] [--threshold 0.8]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.cascade import CASCADE_KEY, CascadeModel, aligned_proba
+from src.models.model_trainer import DEFAULT_DATA, ModelTrainer
+from src.models.registry import dump_atomic, get_registry
+from src.utils.metrics_calculator import compute_metrics
+
+THRESHOLDS = [round(t, 3) for t in np.arange(0.5, 0.975, 0.025)] + [0.99]
+CLASSES = np.array([0, 1, 2])
+
+
+def time_per_row(score, X, repeats=3):
+    """Best-of-n batch seconds per row"""
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        score(X)
+        best = min(best, time.perf_counter() - started)
+    return best / X.shape[0]
+
+
+def single_row_p50(score, X, rows=200):
+    latencies = []
+    for i in range(min(rows, X.shape[0])):
+        started = time.perf_counter()
+        score(X[i])
+        latencies.append(time.perf_counter() - started)
+    return float(np.percentile(latencies, 50))
+
+
+def sweep(fast_proba, slow_proba, labels, fast_cost, slow_cost):
+    confidence = fast_proba.max(axis=1)
+    fast_labels = CLASSES[fast_proba.argmax(axis=1)]
+    slow_labels = CLASSES[slow_proba.argmax(axis=1)]
+    results = []
+    for threshold in THRESHOLDS:
+        escalated = confidence < threshold
+        labels_out = np.where(escalated, slow_labels, fast_labels)
+        results.append({
+            'threshold': threshold,
+            'escalation_rate': round(float(escalated.mean()), 4),
+            'accuracy': round(float((labels_out == labels).mean()), 4),
+            'expected_us_per_row': round((fast_cost + escalated.mean() * slow_cost) * 1e6, 2)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the confidence-gated cascade model')
+    parser.add_argument('--data', nargs='+', default=DEFAULT_DATA, help='Raw review CSVs (held-out split)')
+    parser.add_argument('--fast', default='naive_bayes', help='Cheap first tier')
+    parser.add_argument('--slow', default='xgboost_tuned', help='Expensive tier for uncertain rows')
+    parser.add_argument('--threshold', type=float, help='Top-class probability below which rows escalate')
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.002,
+                        help='Accuracy the automatically chosen threshold may give up against the best tier')
+    args = parser.parse_args()
+
+    registry = get_registry()
+    for key in (args.fast, args.slow):
+        if key not in registry:
+            parser.error(f'{key}: model pickle not found')
+        if getattr(registry[key], 'accepts_text', False):
+            parser.error(f'{key}: cascade tiers must score the TF-IDF matrix (use the sklearn model, not *_linear)')
+
+    texts, labels = ModelTrainer(data_paths=args.data, verbose=False).held_out_split()
+    X = registry.vectorizer.transform(texts)
+    fast, slow = registry[args.fast], registry[args.slow]
+    fast_proba = aligned_proba(fast, X, CLASSES)
+    slow_proba = aligned_proba(slow, X, CLASSES)
+    fast_cost = time_per_row(fast.predict_proba, X)
+    slow_cost = time_per_row(slow.predict_proba, X)
+    accuracy = {
+        args.fast: round(float((CLASSES[fast_proba.argmax(axis=1)] == labels).mean()), 4),
+        args.slow: round(float((CLASSES[slow_proba.argmax(axis=1)] == labels).mean()), 4)
+    }
+    results = sweep(fast_proba, slow_proba, labels, fast_cost, slow_cost)
+
+    if args.threshold is not None:
+        threshold = args.threshold
+    else:
+        target = max(accuracy.values()) - args.max_accuracy_drop
+        eligible = [result for result in results if result['accuracy'] >= target]
+        if eligible:
+            best = min(eligible, key=lambda result: (result['escalation_rate'], -result['accuracy']))
+        else:
+            best = max(results, key=lambda result: (result['accuracy'], -result['escalation_rate']))
+        threshold = best['threshold']
+
+    cascade = CascadeModel([args.fast, args.slow], threshold)
+    cascade_proba = cascade.predict_proba(X, registry)
+    cascade_cost = time_per_row(lambda batch: cascade.predict_proba(batch, registry), X)
+    cascade.report = {
+        'rows': int(X.shape[0]),
+        'threshold': threshold,
+        'escalation_rate': round(float((fast_proba.max(axis=1) < threshold).mean()), 4),
+        'accuracy': dict(accuracy, cascade=round(float((CLASSES[cascade_proba.argmax(axis=1)] == labels).mean()), 4)),
+        # Held-out metrics of the cascade itself, shown by /api/models
+        'metrics': compute_metrics(labels, CLASSES[cascade_proba.argmax(axis=1)], cascade_proba),
+        'batch_us_per_row': {args.fast: round(fast_cost * 1e6, 2), args.slow: round(slow_cost * 1e6, 2),
+                             'cascade': round(cascade_cost * 1e6, 2)},
+        'single_row_p50_us': {args.fast: round(single_row_p50(fast.predict_proba, X) * 1e6, 1),
+                              args.slow: round(single_row_p50(slow.predict_proba, X) * 1e6, 1),
+                              'cascade': round(single_row_p50(lambda row: cascade.predict_proba(row, registry), X) * 1e6, 1)},
+        'sweep': results
+    }
+
+    print(f"{'threshold':>9} {'escalated':>9} {'accuracy':>8} {'us/row':>8}")
+    for result in results:
+        marker = ' <-' if result['threshold'] == threshold else ''
+        print(f"{result['threshold']:>9.3f} {result['escalation_rate']:>9.2%} {result['accuracy']:>8.4f} "
+              f"{result['expected_us_per_row']:>8.2f}{marker}")
+    report = cascade.report
+    for key in (args.fast, args.slow, 'cascade'):
+        print(f"{key:>28}: accuracy {report['accuracy'][key]:.4f}, batch {report['batch_us_per_row'][key]:8.2f} us/row, "
+              f"single row p50 {report['single_row_p50_us'][key]:8.1f} us")
+
+    output_path = registry.path(CASCADE_KEY)
+    dump_atomic(cascade, output_path)
+    print(f"{CASCADE_KEY} ({args.fast} -> {args.slow} below {threshold}, {report['escalation_rate']:.1%} escalated) "
+          f"-> {output_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
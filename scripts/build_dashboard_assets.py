@@ -0,0 +1,140 @@
+"""Precompute the Dash dashboards' aggregates and static figures.
+
+Writes two files under src/data/processed:
+
+* the analytics aggregates (DASHBOARD_AGGREGATES_FILE): a served model's
+  confusion matrix and metrics on the training pipeline's held-out split, the
+  review sentiment distribution and prediction trend from the analytics store,
+  and word cloud images from the term index
+* the figure cache (FIGURE_CACHE_FILE): every figure the dashboards can show,
+  for each dropdown value, so no dashboard session builds a figure itself
+
+Rerun after retraining or benchmarking; until then the dashboards rebuild
+stale figures on first use.
+
+Usage: python scripts/build_dashboard_assets.py [--model logistic_regression_smote] [--trend-days 30]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'dashboards')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from src.data.analytics_store import SENTIMENT_NAMES, get_store
+from src.data.term_index import get_term_index
+from src.models.model_trainer import DEFAULT_DATA, ModelTrainer
+from src.models.registry import get_registry
+from src.utils.figure_cache import DASHBOARD_AGGREGATES_FILE, FIGURE_CACHE_FILE, figure_cache
+from src.utils.metrics_calculator import compute_metrics
+
+DASHBOARDS = ('performance_dashboard', 'interactive_dashboard', 'analytics_dashboard')
+EVALUATION_MODELS = ('logistic_regression', 'logistic_regression_smote', 'naive_bayes', 'xgboost')
+
+
+def wordcloud_images(max_words=200):
+    """Term-index partition -> PNG data URL"""
+    from wordcloud import WordCloud
+
+    index = get_term_index()
+    images = {}
+    for partition in ['all'] + list(SENTIMENT_NAMES.values()):
+        frequencies = index.frequencies(partition, max_words)
+        if not frequencies:
+            continue
+        image = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(frequencies)
+        buffer = BytesIO()
+        image.to_image().save(buffer, format='PNG')
+        images[partition] = 'data:image/png;base64,{}'.format(base64.b64encode(buffer.getvalue()).decode())
+    return images
+
+
+def evaluate(model_name, data_paths):
+    """Confusion matrix and metrics of a served model on the training pipeline's held-out split"""
+    from sklearn.metrics import confusion_matrix
+
+    registry = get_registry()
+    model = registry[model_name]
+    test_texts, test_labels = ModelTrainer(data_paths=data_paths, verbose=False).held_out_split()
+    X = test_texts if getattr(model, 'accepts_text', False) else registry.vectorizer.transform(test_texts)
+    predictions = model.predict(X)
+    proba = model.predict_proba(X) if hasattr(model, 'predict_proba') else None
+    classes = sorted(SENTIMENT_NAMES)
+    return {
+        'model': model_name,
+        'rows': len(test_labels),
+        'labels': [SENTIMENT_NAMES[c] for c in classes],
+        'confusion_matrix': confusion_matrix(test_labels, predictions, labels=classes).tolist(),
+        'metrics': compute_metrics(np.asarray(test_labels), predictions, proba)
+    }
+
+
+def build_aggregates(model_name, data_paths, trend_days):
+    overview = get_store().overview(trend_days=trend_days)
+    aggregates = {
+        'generated_at': datetime.now().isoformat(),
+        'sentiment_distribution': overview['sentiment_distribution'],
+        'total_reviews': overview['total_reviews'],
+        'average_rating': overview['average_rating'],
+        'sentiment_trend': sorted(overview['sentiment_trend'], key=lambda day: day['date']),
+        'wordclouds': wordcloud_images(),
+        'evaluation': None
+    }
+    candidates = [model_name] if model_name else [key for key in EVALUATION_MODELS if key in get_registry()]
+    for key in candidates:
+        try:
+            aggregates['evaluation'] = evaluate(key, data_paths)
+            break
+        except Exception as e:
+            print(f'{key}: evaluation failed ({type(e).__name__}: {e})')
+    return aggregates
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute dashboard aggregates and figures')
+    parser.add_argument('--data', nargs='+', default=DEFAULT_DATA, help='Raw review CSVs (held-out split)')
+    parser.add_argument('--model', help='Served model for the confusion matrix (default: first that loads)')
+    parser.add_argument('--trend-days', type=int, default=30)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    aggregates = build_aggregates(args.model, args.data, args.trend_days)
+    tmp_path = f'{DASHBOARD_AGGREGATES_FILE}.tmp'
+    os.makedirs(os.path.dirname(DASHBOARD_AGGREGATES_FILE), exist_ok=True)
+    with open(tmp_path, 'w') as f:
+        json.dump(aggregates, f)
+    os.replace(tmp_path, DASHBOARD_AGGREGATES_FILE)
+    evaluated = aggregates['evaluation']['model'] if aggregates['evaluation'] else 'none'
+    print(f"Aggregates: {len(aggregates['wordclouds'])} word clouds, evaluation model {evaluated} "
+          f"({time.perf_counter() - started:.1f}s) -> {DASHBOARD_AGGREGATES_FILE}")
+
+    failed = 0
+    for name in DASHBOARDS:
+        started = time.perf_counter()
+        dashboard = __import__(name)
+        built = 0
+        for builder, arguments in dashboard.PRECOMPUTE.items():
+            for builder_args in arguments:
+                try:
+                    builder(*builder_args)
+                    built += 1
+                except Exception as e:
+                    failed += 1
+                    print(f'{name}.{builder.__name__}{builder_args}: {type(e).__name__}: {e}')
+        print(f'{name}: {built} figures ({time.perf_counter() - started:.1f}s)')
+
+    print(f'Wrote {figure_cache.save()} figures -> {FIGURE_CACHE_FILE}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Build the reference distributions the drift monitor compares live predictions with.
+
+Scores the training pipeline's held-out split with every served model (or
+--models) and writes each model's predicted class mix and confidence
+histogram, plus the held-out label mix, to DRIFT_BASELINE_FILE. Entries carry
+the pickle version they were built from, so the monitor flags baselines of
+retrained models as stale; rerun after retraining.
+
+Usage: python scripts/build_drift_baseline.py [--models naive_bayes xgboost_tuned]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.analytics_store import SENTIMENT_NAMES
+from src.models.drift_monitor import DRIFT_BASELINE_FILE, reference_distribution
+from src.models.model_trainer import DEFAULT_DATA, ModelTrainer
+from src.models.registry import get_registry
+
+
+def main():
+    registry = get_registry()
+    parser = argparse.ArgumentParser(description='Build the drift monitor baseline from the held-out split')
+    parser.add_argument('--data', nargs='+', default=DEFAULT_DATA, help='Raw review CSVs (held-out split)')
+    parser.add_argument('--models', nargs='+', default=list(registry), help='Served model keys')
+    parser.add_argument('--output', default=DRIFT_BASELINE_FILE)
+    args = parser.parse_args()
+
+    texts, labels = ModelTrainer(data_paths=args.data, verbose=False).held_out_split()
+    X = registry.vectorizer.transform(texts)
+    baseline = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': len(labels),
+        'labels': {SENTIMENT_NAMES[code]: round(float((labels == code).mean()), 6) for code in sorted(SENTIMENT_NAMES)},
+        'models': {}
+    }
+    for key in args.models:
+        started = time.perf_counter()
+        try:
+            model = registry[key]
+            inputs = texts if getattr(model, 'accepts_text', False) else X
+            if hasattr(model, 'predict_proba'):
+                proba = np.asarray(model.predict_proba(inputs))
+                classes = np.asarray(getattr(model, 'classes_', np.arange(proba.shape[1])))
+                predictions, confidence = classes[proba.argmax(axis=1)], proba.max(axis=1)
+            else:
+                predictions, confidence = np.asarray(model.predict(inputs)), None
+        except Exception as e:
+            print(f'{key}: skipped ({type(e).__name__}: {e})')
+            continue
+        entry = reference_distribution(predictions, confidence)
+        entry['version'] = registry.version(key)
+        baseline['models'][key] = entry
+        mix = ', '.join(f'{sentiment} {share:.1%}' for sentiment, share in entry['class_mix'].items())
+        print(f'{key} ({time.perf_counter() - started:.1f}s): {mix}')
+
+    tmp_path = f'{args.output}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+    os.replace(tmp_path, args.output)
+    print(f"Wrote {len(baseline['models'])} model baselines -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
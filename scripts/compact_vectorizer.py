@@ -0,0 +1,151 @@
+"""Write a pruned, array-backed copy of the served vectorizer and verify it.
+
+Columns that no served model reads are dropped (see
+compact_vectorizer.used_features) and the vocabulary is stored as arrays.
+Every served model is re-scored on the training pipeline's held-out split with
+both vectorizers, and pickle size, load time, memory and transform speed are
+reported. Serve the result with VECTORIZER_FILE=vectorizer_compact.pkl;
+train_models.py deletes it when it replaces the vectorizer, so rerun this
+script after retraining.
+
+With --hashing N the models are also retrained on a hashing-trick vectorizer
+(into --hashing-dir, served by pointing MODEL_DIR there) and compared the same way.
+
+Usage: python scripts/compact_vectorizer.py [--keep-all] [--hashing 262144 --hashing-models naive_bayes ...]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.cascade import CASCADE_KEY
+from src.models.compact_vectorizer import CompactVectorizer, used_features
+from src.models.model_trainer import DEFAULT_DATA, ModelTrainer
+from src.models.registry import (
+    COMPACT_VECTORIZER_FILE, MODEL_DIR, MODEL_FILES, MODEL_VARIANTS, VECTORIZER_FILE, ModelRegistry, dump_atomic,
+    get_registry
+)
+
+
+def measure_load(path):
+    """(object, seconds to load and run a first transform, bytes retained afterwards)"""
+    import sklearn.feature_extraction.text  # noqa: F401  (keep import cost out of the load time)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    obj = joblib.load(path)
+    obj.transform(['builds any lazily created lookup structures'])
+    seconds = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, seconds, retained
+
+
+def transform_speed(vectorizer, texts, single_rows=1000):
+    """(batch rows/sec, single-row p50 microseconds)"""
+    started = time.perf_counter()
+    vectorizer.transform(texts)
+    rate = len(texts) / (time.perf_counter() - started)
+    latencies = []
+    for text in texts[:single_rows]:
+        started = time.perf_counter()
+        vectorizer.transform([text])
+        latencies.append(time.perf_counter() - started)
+    return rate, np.percentile(latencies, 50) * 1e6
+
+
+def print_vectorizer(label, path, load_seconds, retained, rate, p50):
+    print(f"{label:<10} {os.path.getsize(path) / 1024:9.0f} KB pickle  {load_seconds * 1000:7.1f} ms load  "
+          f"{retained / 2 ** 20:6.1f} MB in memory  {rate:8.0f} rows/s  {p50:7.1f} us/row")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prune and compact the served TF-IDF vectorizer')
+    parser.add_argument('--data', nargs='+', default=DEFAULT_DATA, help='Raw review CSVs (held-out split)')
+    parser.add_argument('--output', default=os.path.join(MODEL_DIR, COMPACT_VECTORIZER_FILE))
+    parser.add_argument('--keep-all', action='store_true', help='Only compact the storage, prune nothing')
+    parser.add_argument('--float32', action='store_true', help='Store idf weights and emit matrices as float32')
+    parser.add_argument('--min-agreement', type=float, default=0.995,
+                        help='Fail if any model agrees with itself on fewer held-out rows than this')
+    parser.add_argument('--hashing', type=int, metavar='N_FEATURES', help='Also retrain on a hashing vectorizer')
+    parser.add_argument('--hashing-models', nargs='+', default=['logistic_regression_smote', 'naive_bayes'])
+    parser.add_argument('--hashing-dir', default=os.path.join(MODEL_DIR, 'hashed'))
+    args = parser.parse_args()
+
+    source_path = os.path.join(MODEL_DIR, VECTORIZER_FILE)
+    vectorizer, load_seconds, retained = measure_load(source_path)
+    registry = get_registry()
+    served = {}
+    for key in registry:
+        # The cascade and the variants only re-package other served models (whose
+        # columns are kept), and the text scorers do not read the vectorizer
+        if key.endswith('_linear') or key == CASCADE_KEY or key in MODEL_VARIANTS:
+            continue
+        try:
+            model = registry[key]
+        except Exception as e:
+            print(f'{key}: could not be loaded ({type(e).__name__}: {e}), skipped')
+            continue
+        if not getattr(model, 'accepts_text', False):
+            served[key] = model
+
+    n_features = len(vectorizer.vocabulary_)
+    keep = None if args.keep_all else used_features(served.values(), n_features)
+    compact = CompactVectorizer.from_vectorizer(vectorizer, keep, np.float32 if args.float32 else None)
+    dump_atomic(compact, args.output)
+    print(f"Kept {len(compact)} of {n_features} terms "
+          f"(dropped {n_features - len(compact)} unused, {len(getattr(vectorizer, 'stop_words_', None) or ())} stop words)")
+
+    texts, labels = ModelTrainer(data_paths=args.data, verbose=False).held_out_split()
+    print(f"\nHeld-out rows: {len(texts)}")
+    _, compact_seconds, compact_retained = measure_load(args.output)
+    print_vectorizer('original', source_path, load_seconds, retained, *transform_speed(vectorizer, texts))
+    print_vectorizer('compact', args.output, compact_seconds, compact_retained, *transform_speed(compact, texts))
+
+    X_original = vectorizer.transform(texts)
+    X_compact = compact.transform(texts)
+    failed = False
+    print(f"\n{'model':<28} {'agreement':>9} {'accuracy':>9} {'compact':>9} {'max |dp|':>9}")
+    for key, model in served.items():
+        original = model.predict(X_original)
+        pruned = model.predict(X_compact)
+        drift = 0.0
+        if hasattr(model, 'predict_proba'):
+            drift = float(np.abs(model.predict_proba(X_original) - model.predict_proba(X_compact)).max())
+        agreement = float((original == pruned).mean())
+        failed |= agreement < args.min_agreement
+        print(f"{key:<28} {agreement:9.4f} {(original == labels).mean():9.4f} {(pruned == labels).mean():9.4f} "
+              f"{drift:9.2e}")
+
+    if args.hashing:
+        print(f"\nRetraining {', '.join(args.hashing_models)} on {args.hashing} hashed features")
+        ModelTrainer(
+            data_paths=args.data, output_dir=args.hashing_dir, vectorizer_params={'hashing': args.hashing}
+        ).train(args.hashing_models)
+        hashed_registry = ModelRegistry(model_dir=args.hashing_dir)
+        hashed_path = os.path.join(args.hashing_dir, VECTORIZER_FILE)
+        hashed, hashed_seconds, hashed_retained = measure_load(hashed_path)
+        print_vectorizer('hashed', hashed_path, hashed_seconds, hashed_retained, *transform_speed(hashed, texts))
+        X_hashed = hashed.transform(texts)
+        print(f"\n{'model':<28} {'accuracy':>9} {'hashed':>9} {'size KB':>9} {'hashed KB':>9}")
+        for key in args.hashing_models:
+            hashed_model = hashed_registry[key]
+            original_accuracy = (served[key].predict(X_original) == labels).mean() if key in served else float('nan')
+            original_size = os.path.getsize(os.path.join(MODEL_DIR, MODEL_FILES[key])) / 1024
+            print(f"{key:<28} {original_accuracy:9.4f} {(hashed_model.predict(X_hashed) == labels).mean():9.4f} "
+                  f"{original_size:9.0f} {os.path.getsize(hashed_registry.path(key)) / 1024:9.0f}")
+
+    print(f"\nWrote {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Export the linear models as array-backed LinearScorer artifacts.
+
+For every source model the scorer is checked against sklearn's
+vectorizer.transform + predict_proba on the first --rows of the training
+pipeline's held-out split, then saved next to the other pickles under its
+``*_linear`` registry key. A latency benchmark (single-row p50/p95 and batch
+rows/sec) is printed for both paths.
+
+Usage: python scripts/export_linear_scorer.py [--models KEY ...] [--rows 2000] [--atol 1e-6]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.linear_scorer import LinearScorer
+from src.models.model_trainer import DEFAULT_DATA, ModelTrainer
+from src.models.registry import get_registry, dump_atomic
+
+LINEAR_MODELS = ['logistic_regression', 'logistic_regression_smote', 'naive_bayes']
+
+
+def single_row_latency(score, texts):
+    latencies = []
+    for text in texts:
+        started = time.perf_counter()
+        score([text])
+        latencies.append(time.perf_counter() - started)
+    return np.percentile(latencies, 50) * 1e6, np.percentile(latencies, 95) * 1e6
+
+
+def batch_rate(score, texts):
+    started = time.perf_counter()
+    score(texts)
+    return len(texts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export linear models as compiled scorers')
+    parser.add_argument('--models', nargs='+', default=LINEAR_MODELS, choices=LINEAR_MODELS)
+    parser.add_argument('--data', nargs='+', default=DEFAULT_DATA, help='Raw review CSVs (held-out split)')
+    parser.add_argument('--rows', type=int, default=2000, help='Held-out rows used to verify and benchmark')
+    parser.add_argument('--atol', type=float, default=1e-6, help='Max absolute probability difference')
+    args = parser.parse_args()
+
+    registry = get_registry()
+    vectorizer = registry.vectorizer
+    texts, _ = ModelTrainer(data_paths=args.data, verbose=False).held_out_split()
+    texts = texts[:args.rows]
+
+    failed = False
+    for key in args.models:
+        if key not in registry:
+            print(f'{key}: source pickle not found, skipped')
+            continue
+        model = registry[key]
+        scorer = LinearScorer.from_models(vectorizer, model)
+
+        expected = model.predict_proba(vectorizer.transform(texts))
+        actual = scorer.predict_proba(texts)
+        max_diff = float(np.abs(expected - actual).max())
+        agreement = float((expected.argmax(axis=1) == actual.argmax(axis=1)).mean())
+        if max_diff > args.atol:
+            print(f'{key}: max |p - p_sklearn| = {max_diff:.2e} exceeds {args.atol:.0e}, not exported')
+            failed = True
+            continue
+
+        linear_key = f'{key}_linear'
+        output_path = registry.path(linear_key)
+        dump_atomic(scorer, output_path)
+
+        sklearn_score = lambda batch: model.predict_proba(vectorizer.transform(batch))
+        sk_p50, sk_p95 = single_row_latency(sklearn_score, texts)
+        lin_p50, lin_p95 = single_row_latency(scorer.predict_proba, texts)
+        print(f'{linear_key} -> {os.path.basename(output_path)} ({os.path.getsize(output_path) / 1024:.0f} KB)')
+        print(f'  max |p - p_sklearn| = {max_diff:.2e}, label agreement {agreement:.4f}')
+        print(f'  single row  sklearn p50 {sk_p50:8.1f}us p95 {sk_p95:8.1f}us | '
+              f'linear p50 {lin_p50:8.1f}us p95 {lin_p95:8.1f}us ({sk_p50 / lin_p50:.1f}x)')
+        print(f'  batch       sklearn {batch_rate(sklearn_score, texts):10.0f} rows/sec | '
+              f'linear {batch_rate(scorer.predict_proba, texts):10.0f} rows/sec')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Export reduced-precision and pruned variants of the served models.
+
+* linear and naive Bayes models -> float32 and int8 LinearScorer artifacts
+  (*_f32, *_int8): token weight rows in single precision, or int8 with one
+  scale per class
+* XGBoost models -> *_pruned: the first k boosting rounds, with k the
+  smallest multiple of --xgb-step whose held-out accuracy is within
+  --max-accuracy-drop of the full model (or --xgb-rounds)
+
+Every variant is compared with its source model on the training pipeline's
+held-out split (accuracy, label agreement, max probability difference) and
+both are benchmarked in fresh processes (artifact size, RSS increase,
+single-row and batch latency). The report is printed and merged into
+quantization_report.json next to the pickles, which /api/models reads the
+variants' held-out metrics from; variants are served under the keys in
+registry.MODEL_VARIANTS.
+
+Usage: python scripts/export_quantized_models.py [--models naive_bayes xgboost_tuned] [--rows 2000]
+"""
+import argparse
+import copy
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.linear_scorer import LinearScorer
+from src.models.model_trainer import DEFAULT_DATA, ModelTrainer
+from src.models.registry import MODEL_DIR, MODEL_VARIANTS, dump_atomic, get_registry
+from src.utils.metrics_calculator import compute_metrics
+
+REPORT_FILE = os.path.join(MODEL_DIR, 'quantization_report.json')
+
+
+def pruned_xgboost(model, rounds):
+    """Copy of a fitted XGBClassifier keeping only its first rounds boosting rounds"""
+    pruned = copy.copy(model)
+    pruned._Booster = model.get_booster()[:rounds]
+    pruned.n_estimators = rounds
+    return pruned
+
+
+def choose_rounds(model, X, labels, step, max_drop):
+    """Smallest multiple of step whose held-out accuracy is within max_drop of the full model"""
+    total = model.get_booster().num_boosted_rounds()
+    classes = np.asarray(model.classes_)
+    full = (classes[model.predict_proba(X).argmax(axis=1)] == labels).mean()
+    for rounds in range(step, total, step):
+        accuracy = (classes[model.predict_proba(X, iteration_range=(0, rounds)).argmax(axis=1)] == labels).mean()
+        if accuracy >= full - max_drop:
+            return rounds
+    return total
+
+
+def build_variant(kind, model, vectorizer, X, labels, args):
+    if kind == 'float32':
+        return LinearScorer.from_models(vectorizer, model, dtype=np.float32)
+    if kind == 'int8':
+        return LinearScorer.from_models(vectorizer, model, dtype=np.float32).quantize()
+    rounds = args.xgb_rounds or choose_rounds(model, X, labels, args.xgb_step, args.max_accuracy_drop)
+    return pruned_xgboost(model, rounds)
+
+
+def _benchmark_in_process(key, texts, batch_size):
+    from src.models.registry import get_registry
+    from src.utils.benchmark import benchmark_model
+
+    return benchmark_model(get_registry(), key, texts, batch_size, concurrency=1)
+
+
+def benchmark(key, texts, batch_size):
+    """Benchmark one registry key in a fresh process, so its RSS increase is its own"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        result = pool.submit(_benchmark_in_process, key, texts, batch_size).result()
+    return {
+        'file_bytes': result['model_file_bytes'],
+        'rss_delta_bytes': result['rss_delta_bytes'],
+        'single_p50_ms': result['single']['p50_ms'],
+        'batch_rows_per_sec': result['batched']['rows_per_sec']
+    }
+
+
+def main():
+    sources = sorted({source for source, _ in MODEL_VARIANTS.values()})
+    parser = argparse.ArgumentParser(description='Export float32/int8/pruned model variants')
+    parser.add_argument('--models', nargs='+', default=sources, choices=sources, help='Source models')
+    parser.add_argument('--data', nargs='+', default=DEFAULT_DATA, help='Raw review CSVs (held-out split)')
+    parser.add_argument('--rows', type=int, default=2000, help='Held-out rows used for latency benchmarks')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--xgb-rounds', type=int, help='Boosting rounds kept by pruned XGBoost variants')
+    parser.add_argument('--xgb-step', type=int, default=10, help='Round granularity of the automatic choice')
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.005,
+                        help='Held-out accuracy a pruned XGBoost may give up')
+    parser.add_argument('--skip-benchmark', action='store_true', help='Only export and compare accuracy')
+    args = parser.parse_args()
+
+    registry = get_registry()
+    vectorizer = registry.vectorizer
+    texts, labels = ModelTrainer(data_paths=args.data, verbose=False).held_out_split()
+    X = vectorizer.transform(texts)
+    bench_texts = texts[:args.rows]
+
+    report = {}
+    for source_key in args.models:
+        if source_key not in registry:
+            print(f'{source_key}: source pickle not found, skipped')
+            continue
+        try:
+            model = registry[source_key]
+        except Exception as e:
+            print(f'{source_key}: failed to load ({type(e).__name__}: {e}), skipped')
+            continue
+        expected = model.predict_proba(X)
+        classes = np.asarray(model.classes_)
+        source_accuracy = float((classes[expected.argmax(axis=1)] == labels).mean())
+        source_bench = None if args.skip_benchmark else benchmark(source_key, bench_texts, args.batch_size)
+
+        for key, (source, kind) in MODEL_VARIANTS.items():
+            if source != source_key:
+                continue
+            started = time.perf_counter()
+            variant = build_variant(kind, model, vectorizer, X, labels, args)
+            dump_atomic(variant, registry.path(key))
+            registry.unload(key)
+            actual = variant.predict_proba(texts if getattr(variant, 'accepts_text', False) else X)
+            entry = {
+                'source': source_key,
+                'kind': kind,
+                'accuracy': round(float((classes[actual.argmax(axis=1)] == labels).mean()), 4),
+                'source_accuracy': round(source_accuracy, 4),
+                'label_agreement': round(float((actual.argmax(axis=1) == expected.argmax(axis=1)).mean()), 4),
+                'max_proba_diff': float(np.abs(actual - expected).max()),
+                'metrics': compute_metrics(labels, classes[actual.argmax(axis=1)], actual)
+            }
+            entry['accuracy_delta'] = round(entry['accuracy'] - entry['source_accuracy'], 4)
+            if kind == 'pruned':
+                entry['rounds'] = variant.n_estimators
+                entry['source_rounds'] = model.get_booster().num_boosted_rounds()
+            if source_bench is not None:
+                entry['benchmark'] = benchmark(key, bench_texts, args.batch_size)
+                entry['source_benchmark'] = source_bench
+            report[key] = entry
+            print(f'{key} ({time.perf_counter() - started:.1f}s): accuracy {entry["accuracy"]:.4f} '
+                  f'({entry["accuracy_delta"]:+.4f}), agreement {entry["label_agreement"]:.4f}, '
+                  f'max |dp| {entry["max_proba_diff"]:.2e}' +
+                  (f', rounds {entry["rounds"]}/{entry["source_rounds"]}' if kind == 'pruned' else ''))
+            if source_bench is not None:
+                for name, bench in ((source_key, source_bench), (key, entry['benchmark'])):
+                    print(f'  {name:>30}: {bench["file_bytes"] / 1024:8.0f} KB file, '
+                          f'{bench["rss_delta_bytes"] / 2 ** 20:6.1f} MB RSS, '
+                          f'single p50 {bench["single_p50_ms"]:6.3f} ms, {bench["batch_rows_per_sec"]:8.0f} rows/s')
+
+    # Keep the entries of variants not exported in this run
+    try:
+        with open(REPORT_FILE) as f:
+            report = dict(json.load(f).get('variants', {}), **report)
+    except (OSError, ValueError):
+        pass
+    tmp_path = f'{REPORT_FILE}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'rows': len(labels),
+            'benchmark_rows': len(bench_texts),
+            # Source models also need the vectorizer; the LinearScorer variants carry their own vocabulary
+            'vectorizer_bytes': os.path.getsize(registry.path('vectorizer')),
+            'variants': report
+        }, f, indent=2)
+    os.replace(tmp_path, REPORT_FILE)
+    print(f'Wrote {REPORT_FILE}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
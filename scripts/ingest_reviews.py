@@ -0,0 +1,55 @@
+"""Convert the raw review CSVs into one typed, de-duplicated columnar file.
+
+The output format follows the extension: .parquet (compressed, the default) or
+.arrow/.feather (uncompressed Arrow IPC, zero-copy when memory-mapped). The
+result can be passed anywhere a review CSV is accepted (--data of
+train_models.py, rebuild_analytics.py, benchmark_models.py) and backs
+/api/analytics/reviews.
+
+Usage: python scripts/ingest_reviews.py [--data 'src/data/raw/*.csv' ...] [--output src/data/processed/reviews.parquet]
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.data_processor import RAW_DIR, expand_paths
+from src.data.near_duplicates import NEAR_DUP_THRESHOLD
+from src.data.review_dataset import REVIEWS_DATASET, ingest_reviews, open_reviews
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest raw review CSVs into Parquet/Arrow')
+    parser.add_argument('--data', nargs='+', default=[os.path.join(RAW_DIR, '*.csv')],
+                        help='CSV files or glob patterns')
+    parser.add_argument('--output', default=REVIEWS_DATASET, help='.parquet, .arrow or .feather path')
+    parser.add_argument('--chunksize', type=int, default=50000)
+    parser.add_argument('--compression', default='zstd', help='Parquet codec (zstd, snappy, gzip, none)')
+    parser.add_argument('--keep-duplicates', action='store_true', help='Skip cross-file de-duplication')
+    parser.add_argument('--near-duplicates', nargs='?', type=float, const=NEAR_DUP_THRESHOLD, metavar='THRESHOLD',
+                        help='Also drop reviews whose tokens nearly match an earlier review with the same rating '
+                             f'(Jaccard similarity, default {NEAR_DUP_THRESHOLD})')
+    args = parser.parse_args()
+
+    paths = expand_paths(args.data)
+    started = time.perf_counter()
+    stats = ingest_reviews(paths, args.output, args.chunksize, dedupe=not args.keep_duplicates,
+                           compression=None if args.compression == 'none' else args.compression,
+                           near_duplicate_threshold=args.near_duplicates)
+    elapsed = time.perf_counter() - started
+
+    csv_bytes = sum(os.path.getsize(path) for path in paths)
+    table = open_reviews(args.output).to_table()
+    print(f"Read {stats['rows_read']} rows from {stats['files']} file(s) ({csv_bytes / 2 ** 20:.1f} MB), "
+          f"dropped {stats['duplicates']} duplicates and {stats.get('near_duplicates', 0)} near-duplicates, wrote {stats['rows_written']} rows in "
+          f"{stats['row_groups']} chunk(s) and {elapsed:.2f}s")
+    print(f"{args.output}: {stats['bytes'] / 2 ** 20:.1f} MB on disk, {table.nbytes / 2 ** 20:.1f} MB in memory, "
+          f"{stats['brands']} brands")
+
+
+if __name__ == '__main__':
+    main()
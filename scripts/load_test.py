@@ -0,0 +1,155 @@
+"""Load-test a running web app instance.
+
+Closed-loop clients post to /api/predict or /api/batch_predict as fast as
+responses come back (waiting out Retry-After on 429/503), while optional slow clients trickle request bodies (as
+mobile clients or large uploads do) to tie up connections. Prints throughput,
+latency percentiles of the fast clients and the response status counts, so the
+Flask and ASGI servers can be compared under the same load:
+
+    python frontend/advanced_web_app/app.py                              # Flask (dev server)
+    cd frontend/advanced_web_app && gunicorn app:app                     # Flask (gunicorn)
+    cd frontend/advanced_web_app && uvicorn asgi:app --port 5000         # ASGI
+
+Usage: python scripts/load_test.py [--url http://127.0.0.1:5000] [--concurrency 32] [--slow-clients 16]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.data_processor import RAW_DIR, expand_paths, iter_review_chunks
+
+
+def load_texts(paths, rows, seed=42):
+    texts = []
+    for chunk in iter_review_chunks(paths, usecols=['reviews_text']):
+        if 'reviews_text' in chunk.columns:
+            texts.extend(chunk['reviews_text'].dropna().astype(str).tolist())
+    random.Random(seed).shuffle(texts)
+    return texts[:rows]
+
+
+def connect(url, timeout):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    return connection_class(parts.hostname, parts.port, timeout=timeout)
+
+
+def fast_client(url, path, payloads, deadline, results, lock, timeout):
+    connection = connect(url, timeout)
+    i = 0
+    while time.perf_counter() < deadline:
+        body = payloads[i % len(payloads)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            connection.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            retry_after = float(response.getheader('retry-after', 0) or 0)
+            if response.getheader('connection', '').lower() == 'close':
+                connection.close()
+        except (OSError, http.client.HTTPException) as e:
+            status, retry_after = type(e).__name__, 0
+            connection.close()
+            connection = connect(url, timeout)
+        with lock:
+            results.append((status, time.perf_counter() - started))
+        if status in (429, 503):
+            time.sleep(min(retry_after, max(0.0, deadline - time.perf_counter())))
+    connection.close()
+
+
+def slow_client(url, path, body, deadline, slow_seconds, statuses, lock, timeout):
+    """Send the body a few bytes at a time over slow_seconds, repeatedly until deadline"""
+    while time.perf_counter() < deadline:
+        connection = connect(url, timeout)
+        try:
+            connection.putrequest('POST', path)
+            connection.putheader('Content-Type', 'application/json')
+            connection.putheader('Content-Length', str(len(body)))
+            connection.endheaders()
+            pieces = max(1, int(slow_seconds * 10))
+            step = max(1, -(-len(body) // pieces))
+            for start in range(0, len(body), step):
+                connection.send(body[start:start + step])
+                time.sleep(slow_seconds / pieces)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException) as e:
+            status = type(e).__name__
+        finally:
+            connection.close()
+        with lock:
+            statuses[status] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the sentiment API')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--endpoint', choices=['predict', 'batch'], default='predict')
+    parser.add_argument('--model', default='naive_bayes')
+    parser.add_argument('--batch-size', type=int, default=50, help='Texts per /api/batch_predict request')
+    parser.add_argument('--concurrency', type=int, default=32, help='Closed-loop fast clients')
+    parser.add_argument('--slow-clients', type=int, default=0, help='Clients trickling their request bodies')
+    parser.add_argument('--slow-seconds', type=float, default=5.0, help='Time each slow client takes per body')
+    parser.add_argument('--duration', type=float, default=20.0)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the prediction cache')
+    parser.add_argument('--data', nargs='+', default=[os.path.join(RAW_DIR, '*.csv')])
+    args = parser.parse_args()
+
+    texts = load_texts(expand_paths(args.data), 5000)
+    extra = {'model': args.model, 'cache': not args.no_cache}
+    if args.endpoint == 'predict':
+        path = '/api/predict'
+        payloads = [json.dumps(dict(extra, text=text)).encode() for text in texts]
+    else:
+        path = '/api/batch_predict'
+        payloads = [json.dumps(dict(extra, texts=texts[i:i + args.batch_size])).encode()
+                    for i in range(0, len(texts), args.batch_size)]
+
+    results, slow_statuses, lock = [], Counter(), threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=fast_client, args=(args.url, path, payloads[i::args.concurrency] or payloads,
+                                                          deadline, results, lock, args.timeout))
+               for i in range(args.concurrency)]
+    threads += [threading.Thread(target=slow_client, args=(args.url, path, payloads[0], deadline, args.slow_seconds,
+                                                           slow_statuses, lock, args.timeout))
+                for _ in range(args.slow_clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    statuses = Counter(status for status, _ in results)
+    ok = np.array([latency for status, latency in results if status == 200]) * 1000
+    rows = len(ok) * (1 if args.endpoint == 'predict' else args.batch_size)
+    print(f'{args.url}{path} model={args.model} concurrency={args.concurrency} slow_clients={args.slow_clients} '
+          f'({elapsed:.1f}s)')
+    print(f'  {len(ok) / elapsed:8.1f} req/s ok, {rows / elapsed:8.0f} reviews/s')
+    if len(ok):
+        print(f'  latency p50 {np.percentile(ok, 50):7.1f} ms  p95 {np.percentile(ok, 95):7.1f} ms  '
+              f'p99 {np.percentile(ok, 99):7.1f} ms')
+    print(f'  status {dict(statuses)}' + (f', slow clients {dict(slow_statuses)}' if args.slow_clients else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
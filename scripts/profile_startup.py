@@ -0,0 +1,98 @@
+"""Profile web app startup: per-import times (python -X importtime) and
+per-model load times from a registry warm start.
+
+Usage: python scripts/profile_startup.py [--top 25] [--output startup_profile.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+APP_DIR = os.path.join(PROJECT_ROOT, 'frontend', 'advanced_web_app')
+
+
+def profile_imports(preload=False):
+    """Import the app in a fresh interpreter and parse its -X importtime report"""
+    env = dict(os.environ, PRELOAD_MODELS='1' if preload else '0')
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports[name.strip()] = {
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'top_level': depth <= 1
+        }
+    return wall, imports
+
+
+def profile_models():
+    """Warm-start the registry in this process and report per-model load times"""
+    from src.models.registry import get_registry
+
+    registry = get_registry()
+    timings = registry.preload()
+    stats = registry.stats()['models']
+    report = {}
+    for key in list(timings) + [key for key in stats if key not in timings]:
+        entry = stats.get(key, {})
+        report[key] = {
+            'load_ms': round(timings[key] * 1000, 1) if key in timings else None,
+            'resident_bytes': entry.get('resident_bytes'),
+            'mmap_bytes': entry.get('mmap_bytes'),
+            'error': entry.get('error')
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile web app import and model warm-start times')
+    parser.add_argument('--top', type=int, default=25, help='Slowest imports to list')
+    parser.add_argument('--output', help='Write the full report as JSON')
+    args = parser.parse_args()
+
+    wall, imports = profile_imports()
+    top_level = sorted(
+        ((name, info) for name, info in imports.items() if info['top_level']),
+        key=lambda item: item[1]['cumulative_ms'], reverse=True
+    )
+    print(f"App import: {wall:.2f}s wall, {len(imports)} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, info in top_level[:args.top]:
+        print(f"{info['cumulative_ms']:14.1f} {info['self_ms']:9.1f}  {name}")
+
+    models = profile_models()
+    print(f"\n{'load ms':>9} {'private MB':>11} {'mmap MB':>9}  model")
+    for key, info in models.items():
+        if info['error']:
+            print(f"{'-':>9} {'-':>11} {'-':>9}  {key} (failed: {info['error']})")
+            continue
+        print(f"{info['load_ms']:9.1f} {(info['resident_bytes'] or 0) / 2**20:11.1f} "
+              f"{(info['mmap_bytes'] or 0) / 2**20:9.1f}  {key}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'import_seconds': wall, 'imports': imports, 'models': models}, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
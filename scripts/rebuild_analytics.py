@@ -0,0 +1,63 @@
+"""Rebuild the analytics store rollups and the word-cloud term index from the
+raw review CSVs, and optionally the prediction window rollups from the
+prediction log (history older than the log's retention is lost).
+
+Usage: python scripts/rebuild_analytics.py [--data 'src/data/raw/*.csv' ...] [--db PATH] [--prediction-windows]
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.analytics_store import AnalyticsStore, ANALYTICS_DB, rating_to_sentiment
+from src.data.data_processor import DEFAULT_REVIEWS, expand_paths, iter_review_chunks
+from src.data.prediction_log import PREDICTION_LOG_DIR, rebuild_windows
+from src.data.term_index import TermIndex, TERM_INDEX_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild analytics aggregates from raw CSVs')
+    parser.add_argument('--data', nargs='+', default=[DEFAULT_REVIEWS], help='CSV files or glob patterns')
+    parser.add_argument('--db', default=ANALYTICS_DB)
+    parser.add_argument('--term-index', default=TERM_INDEX_PATH)
+    parser.add_argument('--chunksize', type=int, default=50000)
+    parser.add_argument('--prediction-windows', action='store_true',
+                        help='Also recompute the monitoring window rollups from the prediction log')
+    parser.add_argument('--prediction-log', default=PREDICTION_LOG_DIR)
+    args = parser.parse_args()
+
+    paths = expand_paths(args.data)
+    started = time.perf_counter()
+    store = AnalyticsStore(args.db)
+    rows = store.rebuild(paths, args.chunksize)
+    print(f'Aggregated {rows} reviews from {len(paths)} file(s) into {args.db} '
+          f'in {time.perf_counter() - started:.2f}s')
+
+    started = time.perf_counter()
+    index = TermIndex(args.term_index)
+    index.clear()
+    columns = ['reviews_text', 'reviews_rating', 'brand']
+    for chunk in iter_review_chunks(paths, args.chunksize, usecols=columns):
+        ratings = chunk['reviews_rating'] if 'reviews_rating' in chunk.columns else None
+        index.add_texts(
+            chunk['reviews_text'].fillna('').astype(str).tolist(),
+            [rating_to_sentiment(r) if r == r else None for r in ratings] if ratings is not None else None,
+            chunk['brand'].astype(object).where(chunk['brand'].notna(), None).tolist() if 'brand' in chunk.columns else None
+        )
+    index.save()
+    print(f'Indexed {len(index.frequencies())} terms into {args.term_index} '
+          f'in {time.perf_counter() - started:.2f}s')
+
+    if args.prediction_windows:
+        started = time.perf_counter()
+        rows = rebuild_windows(args.prediction_log, store)
+        print(f'Rolled up {rows} logged predictions from {args.prediction_log} '
+              f'in {time.perf_counter() - started:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
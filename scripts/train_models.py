@@ -0,0 +1,63 @@
+"""Train the served model zoo and write the pickles and metrics.json.
+
+Usage: python scripts/train_models.py [--data CSV ...] [--models KEY ...] [--n-jobs N] [--force]
+
+Stages whose inputs have not changed are reused from the cache directory. If
+the data or vectorizer settings changed, --models also retrains every other
+model that has a pickle in --output-dir, since the served vectorizer is shared.
+Without any vectorizer option the new vectorizer copies the settings of the one
+in --output-dir, so a plain retrain keeps the served feature space.
+"""
+import argparse
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.models.model_trainer import ModelTrainer, MODEL_SPECS, DEFAULT_DATA, CACHE_DIR
+from src.models.registry import MODEL_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the sentiment model zoo')
+    parser.add_argument('--data', nargs='+', default=DEFAULT_DATA, help='Raw review CSVs')
+    parser.add_argument('--models', nargs='+', choices=sorted(MODEL_SPECS), help='Subset of models to train')
+    parser.add_argument('--output-dir', default=MODEL_DIR)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--n-jobs', type=int, default=None, help='Training processes (default: all cores)')
+    parser.add_argument('--ngram-max', type=int, help='Upper n-gram size for TF-IDF')
+    parser.add_argument('--min-df', type=float)
+    parser.add_argument('--max-df', type=float)
+    parser.add_argument('--nltk-tokenizer', action='store_true', help='Tokenize with nltk.word_tokenize')
+    parser.add_argument('--hashing', type=int, metavar='N_FEATURES',
+                        help='Use a hashing-trick TF-IDF vectorizer with this many features')
+    parser.add_argument('--force', action='store_true', help='Ignore cached stages')
+    args = parser.parse_args()
+
+    vectorizer_params = {}
+    if args.ngram_max is not None and args.ngram_max > 1:
+        vectorizer_params['ngram_range'] = (1, args.ngram_max)
+    if args.min_df is not None and args.min_df != 1:
+        vectorizer_params['min_df'] = int(args.min_df) if args.min_df >= 1 else args.min_df
+    if args.max_df is not None and args.max_df != 1.0:
+        vectorizer_params['max_df'] = args.max_df
+    if args.nltk_tokenizer:
+        vectorizer_params['tokenizer'] = 'nltk'
+    if args.hashing:
+        vectorizer_params['hashing'] = args.hashing
+    vectorizer_options = (args.ngram_max, args.min_df, args.max_df, args.hashing)
+    if not args.nltk_tokenizer and all(option is None for option in vectorizer_options):
+        vectorizer_params = None  # reuse the served vectorizer's settings
+
+    trainer = ModelTrainer(
+        data_paths=args.data, output_dir=args.output_dir, cache_dir=args.cache_dir,
+        n_jobs=args.n_jobs, vectorizer_params=vectorizer_params, force=args.force
+    )
+    metrics = trainer.train(args.models)
+    print(f"Done in {metrics['timings']['total']}s")
+
+
+if __name__ == '__main__':
+    main()
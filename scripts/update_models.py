@@ -0,0 +1,207 @@
+"""Update served models with new labeled reviews without retraining, or benchmark doing so.
+
+By default the new reviews (--data: CSVs or ingested Parquet/Arrow files,
+labelled from reviews_rating as in training) are read in --chunksize chunks,
+and every --models key is updated with each chunk (src/models/incremental.py).
+The updated pickles are swapped in atomically, and a running app picks them
+up on its next version check without a restart. The served vectorizer is kept, so
+derived artifacts (*_linear, *_f32/_int8/_pruned, drift baseline) should be
+re-exported afterwards. --evaluate reports held-out accuracy before and after.
+
+--benchmark leaves the served models alone. It fits a vectorizer and fresh
+models on the first 1 - --new-fraction of the training pipeline's training
+split and feeds the rest in chunks as new reviews. On the held-out split it
+then compares the base model, the incrementally updated one and a full
+retrain on all training rows (vectorizer refit plus model fit, as
+train_models.py does), with the seconds each update and the full retrain
+take. The vectorizer is a TF-IDF one with the served vectorizer's settings
+(fixed vocabulary) or, with --hashing N, a hashing one. The report is
+printed and written to incremental_report.json next to the pickles.
+
+Usage: python scripts/update_models.py --data new_reviews.csv [--models naive_bayes sgd_logistic xgboost]
+       python scripts/update_models.py --benchmark [--new-fraction 0.3] [--chunksize 500] [--hashing 262144]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.data_processor import expand_paths, iter_review_chunks
+from src.models.incremental import INCREMENTAL_XGB_ROUNDS, update_kind, update_served_model, updated_model
+from src.models.model_trainer import DEFAULT_DATA, MODEL_SPECS, ModelTrainer, build_estimator, map_sentiment
+from src.models.registry import MODEL_DIR, get_registry
+
+REPORT_FILE = os.path.join(MODEL_DIR, 'incremental_report.json')
+# Models the benchmark can fit from scratch and update
+BENCHMARK_MODELS = ('naive_bayes', 'sgd_logistic', 'xgboost')
+
+
+def accuracy(model, X, labels):
+    return round(float((np.asarray(model.predict(X)) == labels).mean()), 4)
+
+
+def iter_labeled_chunks(paths, chunksize):
+    for chunk in iter_review_chunks(paths, chunksize, usecols=['reviews_text', 'reviews_rating']):
+        chunk = chunk.dropna(subset=['reviews_rating'])
+        if len(chunk):
+            yield (chunk['reviews_text'].fillna('').astype(str).tolist(),
+                   chunk['reviews_rating'].astype(float).map(map_sentiment).to_numpy(dtype=np.int64))
+
+
+def update(args):
+    registry = get_registry()
+    keys = args.models or [key for key in registry if _updatable(registry, key)]
+    for key in keys:
+        if key not in registry or not _updatable(registry, key):
+            print(f'{key}: not found or does not support incremental updates')
+            return 1
+
+    held_out = None
+    if args.evaluate:
+        test_texts, test_labels = ModelTrainer(data_paths=args.train_data, verbose=False).held_out_split()
+        held_out = (registry.vectorizer.transform(test_texts), test_labels)
+        before = {key: accuracy(registry[key], *held_out) for key in keys}
+
+    seconds = {key: [] for key in keys}
+    rows = 0
+    for chunk, (texts, labels) in enumerate(iter_labeled_chunks(expand_paths(args.data), args.chunksize)):
+        rows += len(texts)
+        for key in keys:
+            result = update_served_model(registry, key, texts, labels, args.xgb_rounds)
+            total = result['vectorize_seconds'] + result['update_seconds'] + result['swap_seconds']
+            seconds[key].append(total)
+            print(f"chunk {chunk} ({len(texts)} rows) {key}: update {result['update_seconds'] * 1000:.1f} ms, "
+                  f"swap {result['swap_seconds'] * 1000:.1f} ms")
+
+    print(f'Applied {rows} new reviews')
+    for key in keys:
+        line = f'{key:>28}: {len(seconds[key])} updates, {np.mean(seconds[key] or [0]) * 1000:8.1f} ms per update'
+        if held_out is not None:
+            line += f', held-out accuracy {before[key]:.4f} -> {accuracy(registry[key], *held_out):.4f}'
+        print(line)
+    return 0
+
+
+def _updatable(registry, key):
+    try:
+        return update_kind(registry[key]) is not None
+    except Exception:
+        return False
+
+
+def benchmark(args):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    from src.models.compact_vectorizer import HashingTfidfVectorizer
+
+    train_texts, train_labels, test_texts, test_labels = ModelTrainer(data_paths=args.train_data,
+                                                                      verbose=False).split()
+    n_base = int(len(train_texts) * (1 - args.new_fraction))
+    base_texts, base_labels = train_texts[:n_base], train_labels[:n_base]
+    new_texts, new_labels = train_texts[n_base:], train_labels[n_base:]
+
+    def new_vectorizer():
+        if args.hashing:
+            return HashingTfidfVectorizer(n_features=args.hashing)
+        return TfidfVectorizer(**{name: value for name, value in vars(get_registry().vectorizer).items()
+                                  if name in TfidfVectorizer().get_params()})
+
+    # The vocabulary (or IDF) is fixed when the base models are trained
+    vectorizer = new_vectorizer().fit(base_texts)
+    X_base = vectorizer.transform(base_texts)
+    X_test = vectorizer.transform(test_texts)
+
+    # Full retrain: what train_models.py does with the extra rows (vectorizer refit, then fit)
+    started = time.perf_counter()
+    full_vectorizer = new_vectorizer()
+    X_full = full_vectorizer.fit_transform(train_texts)
+    full_vectorize_seconds = time.perf_counter() - started
+    X_full_test = full_vectorizer.transform(test_texts)
+
+    report = {}
+    for key in args.models or BENCHMARK_MODELS:
+        spec = MODEL_SPECS[key][0]
+        model = build_estimator(spec).fit(X_base, base_labels)
+        base_accuracy = accuracy(model, X_test, test_labels)
+
+        update_seconds = []
+        for start in range(0, len(new_texts), args.chunksize):
+            started = time.perf_counter()
+            X_chunk = vectorizer.transform(new_texts[start:start + args.chunksize])
+            model = updated_model(model, X_chunk, new_labels[start:start + args.chunksize], args.xgb_rounds)
+            update_seconds.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        full = build_estimator(spec).fit(X_full, train_labels)
+        full_fit_seconds = time.perf_counter() - started
+
+        report[key] = {
+            'kind': update_kind(model),
+            'updates': len(update_seconds),
+            'accuracy': {'base': base_accuracy, 'incremental': accuracy(model, X_test, test_labels),
+                         'full_retrain': accuracy(full, X_full_test, test_labels)},
+            'update_ms': round(float(np.mean(update_seconds)) * 1000, 2),
+            'incremental_total_ms': round(sum(update_seconds) * 1000, 2),
+            'full_retrain_ms': round((full_vectorize_seconds + full_fit_seconds) * 1000, 2),
+            'full_fit_ms': round(full_fit_seconds * 1000, 2)
+        }
+        entry = report[key]
+        print(f"{key:>14}: accuracy base {entry['accuracy']['base']:.4f}, incremental "
+              f"{entry['accuracy']['incremental']:.4f}, full retrain {entry['accuracy']['full_retrain']:.4f} | "
+              f"{entry['update_ms']:8.1f} ms per update ({entry['updates']} x {args.chunksize} rows) vs "
+              f"{entry['full_retrain_ms']:8.1f} ms full retrain ({entry['full_retrain_ms'] / entry['update_ms']:.0f}x)")
+
+    tmp_path = f'{args.report}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'vectorizer': f'hashing ({args.hashing} features)' if args.hashing else 'TF-IDF (fixed vocabulary)',
+            'base_rows': n_base,
+            'new_rows': len(new_texts),
+            'test_rows': len(test_labels),
+            'chunksize': args.chunksize,
+            'xgb_rounds': args.xgb_rounds,
+            'models': report
+        }, f, indent=2)
+    os.replace(tmp_path, args.report)
+    print(f'Wrote {args.report}')
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally update served models with new labeled reviews')
+    parser.add_argument('--data', nargs='+', help='New labeled reviews (CSV, Parquet or Arrow files)')
+    parser.add_argument('--models', nargs='+', help='Model keys (default: every served model that supports updates)')
+    parser.add_argument('--chunksize', type=int, default=5000, help='Rows per update')
+    parser.add_argument('--xgb-rounds', type=int, default=INCREMENTAL_XGB_ROUNDS,
+                        help='Boosting rounds appended to XGBoost models per update')
+    parser.add_argument('--evaluate', action='store_true', help='Report held-out accuracy before and after')
+    parser.add_argument('--train-data', nargs='+', default=DEFAULT_DATA,
+                        help='Training CSVs whose held-out split is used for evaluation and benchmarks')
+    parser.add_argument('--benchmark', action='store_true', help='Compare incremental updates with full retraining')
+    parser.add_argument('--new-fraction', type=float, default=0.3,
+                        help='Share of the training split fed as new reviews in the benchmark')
+    parser.add_argument('--hashing', type=int, metavar='N_FEATURES', help='Benchmark with a hashing vectorizer')
+    parser.add_argument('--report', default=REPORT_FILE)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        unknown = [key for key in args.models or [] if key not in BENCHMARK_MODELS]
+        if unknown:
+            parser.error(f"--benchmark supports {', '.join(BENCHMARK_MODELS)}")
+        return benchmark(args)
+    if not args.data:
+        parser.error('--data is required unless --benchmark is given')
+    return update(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""Incrementally maintained analytics aggregates backed by SQLite.
+
+Instead of scanning every review on each request, the store keeps rollups that
+are updated as reviews and predictions arrive:
+
+* ``rating_counts``      reviews per star rating
+* ``brand_stats``        review count and rating sum per brand
+* ``daily_predictions``  predictions per day, model and sentiment
+* ``prediction_windows`` predictions per time window, model and sentiment
+* ``confidence_windows`` predictions per time window, model and confidence bucket
+
+so the overview endpoint reads O(groups) rows. The two window tables are
+written by the prediction log's background thread (src/data/prediction_log.py)
+and read by the drift monitor. ``rebuild`` recomputes the
+review rollups from raw CSVs in chunks.
+
+Prediction counts are buffered per process and written once
+PREDICTION_FLUSH_THRESHOLD groups have accumulated, by a background timer
+PREDICTION_FLUSH_SECONDS after the oldest of them arrived, and at process exit.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from src.data.data_processor import PROCESSED_DIR, iter_review_chunks
+
+ANALYTICS_DB = os.environ.get('ANALYTICS_DB', os.path.join(PROCESSED_DIR, 'analytics.db'))
+# Buffered prediction counts are written once this many groups are pending
+PREDICTION_FLUSH_THRESHOLD = int(os.environ.get('ANALYTICS_FLUSH_THRESHOLD', 256))
+# ...or by a daemon timer once the oldest of them is this old
+PREDICTION_FLUSH_SECONDS = float(os.environ.get('ANALYTICS_FLUSH_SECONDS', 10))
+
+SENTIMENT_NAMES = {0: 'negative', 1: 'neutral', 2: 'positive'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rating_counts (
+    rating INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS brand_stats (
+    brand TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    rating_sum REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_predictions (
+    day TEXT NOT NULL,
+    model TEXT NOT NULL,
+    sentiment TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, model, sentiment)
+);
+CREATE TABLE IF NOT EXISTS prediction_windows (
+    window_start INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    sentiment TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (window_start, model, sentiment)
+);
+CREATE TABLE IF NOT EXISTS confidence_windows (
+    window_start INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (window_start, model, bucket)
+);
+"""
+
+
+def rating_to_sentiment(rating):
+    """Same rating mapping as the overview: 4-5 positive, 3 neutral, 1-2 negative"""
+    if rating >= 4:
+        return 'positive'
+    if rating == 3:
+        return 'neutral'
+    return 'negative'
+
+
+# Stores holding unflushed counts, for the exit hook; flushed stores are dropped
+# so the hook keeps nothing alive once its counts are written
+_stores_with_pending = set()
+
+
+@atexit.register
+def _flush_pending_stores():
+    for store in list(_stores_with_pending):
+        store.flush()
+
+
+class AnalyticsStore:
+
+    def __init__(self, path=ANALYTICS_DB):
+        self.path = path
+        self._conn = None
+        self._conn_pid = None
+        self._lock = threading.Lock()
+        self._pending = Counter()  # (day, model, sentiment) -> count
+        self._pending_since = None  # monotonic time of the oldest unflushed count
+        self._flush_timer = None
+
+    @property
+    def _db(self):
+        """Per-process connection, opened lazily so pre-forked workers never share one"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _review_rows(df):
+        """(rows, [(rating, count)], [(brand, count, rating sum)]) of a DataFrame of reviews"""
+        if 'reviews_rating' not in df.columns:
+            return 0, [], []
+        df = df.dropna(subset=['reviews_rating'])
+        ratings = df['reviews_rating'].astype(float).round().astype(int)
+
+        rating_rows = [(int(r), int(n)) for r, n in ratings.value_counts().items()]
+        brand_rows = []
+        if 'brand' in df.columns and df['brand'].notna().any():
+            # object first: ingested datasets hold brands as categoricals
+            grouped = ratings.groupby(df['brand'].astype(object).fillna('Unknown').astype(str)).agg(['count', 'sum'])
+            brand_rows = [(brand, int(row['count']), float(row['sum'])) for brand, row in grouped.iterrows()]
+        return len(df), rating_rows, brand_rows
+
+    def _add_review_rows_locked(self, rating_rows, brand_rows):
+        self._db.executemany(
+            'INSERT INTO rating_counts VALUES (?, ?) '
+            'ON CONFLICT(rating) DO UPDATE SET count = count + excluded.count', rating_rows
+        )
+        self._db.executemany(
+            'INSERT INTO brand_stats VALUES (?, ?, ?) '
+            'ON CONFLICT(brand) DO UPDATE SET count = count + excluded.count, '
+            'rating_sum = rating_sum + excluded.rating_sum', brand_rows
+        )
+
+    def add_reviews(self, df):
+        """Fold a DataFrame of reviews (reviews_rating, optional brand) into the rollups"""
+        rows, rating_rows, brand_rows = self._review_rows(df)
+        with self._lock:
+            self._add_review_rows_locked(rating_rows, brand_rows)
+            self._db.commit()
+        return rows
+
+    def record_predictions(self, model_name, predictions, timestamp=None):
+        """Count predicted sentiment codes; buffered in memory and flushed in batches"""
+        day = (timestamp or datetime.now()).strftime('%Y-%m-%d')
+        counts = Counter(predictions)
+        with self._lock:
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+                _stores_with_pending.add(self)
+                self._start_flush_timer_locked()
+            for code, n in counts.items():
+                self._pending[(day, model_name, SENTIMENT_NAMES.get(code, str(code)))] += n
+            if (len(self._pending) >= PREDICTION_FLUSH_THRESHOLD
+                    or time.monotonic() - self._pending_since >= PREDICTION_FLUSH_SECONDS):
+                self._flush_locked()
+
+    def _start_flush_timer_locked(self):
+        """Flush the counts that just started buffering even if no more predictions arrive"""
+        self._flush_timer = threading.Timer(PREDICTION_FLUSH_SECONDS, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        _stores_with_pending.discard(self)
+        if not self._pending:
+            return
+        self._db.executemany(
+            'INSERT INTO daily_predictions VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(day, model, sentiment) DO UPDATE SET count = count + excluded.count',
+            [(day, model, sentiment, n) for (day, model, sentiment), n in self._pending.items()]
+        )
+        self._db.commit()
+        self._pending.clear()
+        self._pending_since = None
+
+    def _add_prediction_windows_locked(self, class_rows, confidence_rows):
+        self._db.executemany(
+            'INSERT INTO prediction_windows VALUES (?, ?, ?, ?) ON CONFLICT(window_start, model, sentiment) '
+            'DO UPDATE SET count = count + excluded.count', class_rows
+        )
+        self._db.executemany(
+            'INSERT INTO confidence_windows VALUES (?, ?, ?, ?) ON CONFLICT(window_start, model, bucket) '
+            'DO UPDATE SET count = count + excluded.count', confidence_rows
+        )
+
+    def add_prediction_windows(self, class_rows, confidence_rows):
+        """Add (window_start, model, sentiment, count) and (window_start, model, bucket, count) rows"""
+        with self._lock:
+            self._add_prediction_windows_locked(class_rows, confidence_rows)
+            self._db.commit()
+
+    def replace_prediction_windows(self, row_batches):
+        """Replace the window rollups with (class_rows, confidence_rows) pairs in one transaction,
+        so readers see the old rollups until the new ones are complete"""
+        with self._lock:
+            with self._db:
+                self._db.execute('DELETE FROM prediction_windows')
+                self._db.execute('DELETE FROM confidence_windows')
+                for class_rows, confidence_rows in row_batches:
+                    self._add_prediction_windows_locked(class_rows, confidence_rows)
+
+    def prune_prediction_windows(self, before):
+        """Delete window rows that start before a unix time; returns the rows deleted"""
+        with self._lock:
+            with self._db:
+                deleted = self._db.execute('DELETE FROM prediction_windows WHERE window_start < ?',
+                                           (int(before),)).rowcount
+                deleted += self._db.execute('DELETE FROM confidence_windows WHERE window_start < ?',
+                                            (int(before),)).rowcount
+        return deleted
+
+    def prediction_windows(self, since, window_seconds, model=None):
+        """Class and confidence-bucket counts since a unix time, regrouped into window_seconds windows"""
+        where = 'WHERE window_start >= ?' + (' AND model = ?' if model else '')
+        params = (window_seconds, window_seconds, int(since)) + ((model,) if model else ())
+        with self._lock:
+            classes = self._db.execute(
+                f'SELECT window_start / ? * ?, model, sentiment, SUM(count) FROM prediction_windows {where} '
+                'GROUP BY 1, 2, 3 ORDER BY 1', params
+            ).fetchall()
+            buckets = self._db.execute(
+                f'SELECT window_start / ? * ?, model, bucket, SUM(count) FROM confidence_windows {where} '
+                'GROUP BY 1, 2, 3 ORDER BY 1', params
+            ).fetchall()
+        return classes, buckets
+
+    def clear_prediction_windows(self):
+        with self._lock:
+            self._db.execute('DELETE FROM prediction_windows')
+            self._db.execute('DELETE FROM confidence_windows')
+            self._db.commit()
+
+    def overview(self, top_brands=10, trend_days=7):
+        self.flush()
+        with self._lock:
+            ratings = dict(self._db.execute('SELECT rating, count FROM rating_counts').fetchall())
+            brands = self._db.execute(
+                'SELECT brand, count, rating_sum / count FROM brand_stats ORDER BY count DESC LIMIT ?',
+                (top_brands,)
+            ).fetchall()
+            since = (datetime.now() - timedelta(days=trend_days - 1)).strftime('%Y-%m-%d')
+            trend_rows = self._db.execute(
+                'SELECT day, sentiment, SUM(count) FROM daily_predictions WHERE day >= ? '
+                'GROUP BY day, sentiment', (since,)
+            ).fetchall()
+            total_predictions = self._db.execute(
+                'SELECT COALESCE(SUM(count), 0) FROM daily_predictions'
+            ).fetchone()[0]
+
+        distribution = {'positive': 0, 'negative': 0, 'neutral': 0}
+        for rating, n in ratings.items():
+            distribution[rating_to_sentiment(rating)] += n
+        total_reviews = sum(ratings.values())
+
+        trend = {}
+        for i in range(trend_days):
+            day = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
+            trend[day] = {'date': day, 'positive': 0, 'negative': 0, 'neutral': 0}
+        for day, sentiment, n in trend_rows:
+            if day in trend and sentiment in trend[day]:
+                trend[day][sentiment] = n
+
+        return {
+            'sentiment_distribution': distribution,
+            'total_reviews': total_reviews,
+            'average_rating': sum(r * n for r, n in ratings.items()) / total_reviews if total_reviews else 0.0,
+            'top_brands': [{'brand': b, 'count': n, 'mean': mean} for b, n, mean in brands],
+            'sentiment_trend': list(trend.values()),
+            'total_predictions': int(total_predictions)
+        }
+
+    def rebuild(self, paths, chunksize=50000):
+        """Recompute the review rollups from raw CSVs (prediction history is kept).
+
+        The chunks are aggregated in memory and the tables replaced in one
+        transaction, so readers see the old rollups until the new ones are complete.
+        """
+        rows = 0
+        ratings = Counter()
+        brands = {}  # brand -> [count, rating sum]
+        for chunk in iter_review_chunks(paths, chunksize, usecols=['reviews_rating', 'brand']):
+            chunk_rows, rating_rows, brand_rows = self._review_rows(chunk)
+            rows += chunk_rows
+            for rating, n in rating_rows:
+                ratings[rating] += n
+            for brand, n, rating_sum in brand_rows:
+                totals = brands.setdefault(brand, [0, 0.0])
+                totals[0] += n
+                totals[1] += rating_sum
+
+        with self._lock:
+            with self._db:
+                self._db.execute('DELETE FROM rating_counts')
+                self._db.execute('DELETE FROM brand_stats')
+                self._add_review_rows_locked(list(ratings.items()),
+                                             [(brand, n, rating_sum) for brand, (n, rating_sum) in brands.items()])
+        return rows
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AnalyticsStore()
+    return _store
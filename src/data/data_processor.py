@@ -0,0 +1,49 @@
+"""Helpers for reading the raw review CSVs in a consistent layout."""
+import glob
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RAW_DIR = os.path.join(PROJECT_ROOT, 'src', 'data', 'raw')
+PROCESSED_DIR = os.path.join(PROJECT_ROOT, 'src', 'data', 'processed')
+DEFAULT_REVIEWS = os.path.join(RAW_DIR, 'reviews.csv')
+
+# Alternative header names seen in the raw files
+COLUMN_ALIASES = {
+    'review': 'reviews_text',
+    'text': 'reviews_text',
+    'rating': 'reviews_rating'
+}
+
+
+def normalize_columns(df):
+    """Lowercase headers and map aliases (review/rating) onto reviews_text/reviews_rating"""
+    df.columns = [str(column).strip().lower() for column in df.columns]
+    return df.rename(columns={k: v for k, v in COLUMN_ALIASES.items() if v not in df.columns})
+
+
+def expand_paths(patterns):
+    """Expand glob patterns into a sorted, de-duplicated list of files"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or [pattern]
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def iter_review_chunks(paths, chunksize=50000, usecols=None):
+    """Yield normalized DataFrame chunks from one or more CSVs or ingested Parquet/Arrow files"""
+    import pandas as pd
+
+    from src.data.review_dataset import dataset_format, iter_review_batches
+
+    for path in paths:
+        if dataset_format(path):
+            # Already normalized; only the requested columns are read from disk
+            for batch in iter_review_batches(path, usecols, chunksize):
+                yield batch.to_pandas()
+            continue
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            chunk = normalize_columns(chunk)
+            if usecols is not None:
+                chunk = chunk[[column for column in usecols if column in chunk.columns]]
+            yield chunk
@@ -0,0 +1,166 @@
+"""Near-duplicate grouping of review texts with MinHash and LSH banding.
+
+Each text is reduced to the set of tokens the served vectorizer produces, so
+boilerplate that the vectorizer ignores (stop words, punctuation, casing)
+never keeps two reviews apart. Texts whose estimated Jaccard similarity to an
+earlier group's first text reaches the threshold join that group; a
+threshold of 1 only groups texts with identical token counts (and so
+identical TF-IDF rows) and skips MinHash entirely.
+Scoring only needs the first text of each group; its result is reused for the
+rest.
+
+A NearDuplicateIndex keeps its groups across add() calls, so a stream can
+reuse results from earlier batches (up to max_groups, then it starts over).
+Token hashes use Python's per-process string hash, so signatures are only
+comparable within one process; exact repeats are keyed by a digest of the
+sorted tokens (duplicates included) instead, which does not collide in
+practice.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+NEAR_DUP_ENABLED = os.environ.get('NEAR_DUP_ENABLED', '0') == '1'
+NEAR_DUP_THRESHOLD = float(os.environ.get('NEAR_DUP_THRESHOLD', 0.9))
+NEAR_DUP_PERMUTATIONS = int(os.environ.get('NEAR_DUP_PERMUTATIONS', 64))
+NEAR_DUP_MAX_GROUPS = int(os.environ.get('NEAR_DUP_MAX_GROUPS', 100000))
+
+EMPTY_GROUP = -1  # texts with no tokens all vectorize to the same (empty) row
+_SIGNATURE_BLOCK = 1024  # texts hashed per numpy pass, bounds the (tokens x permutations) matrix
+
+
+def lsh_bands(num_perm, threshold):
+    """(bands, rows) with bands * rows == num_perm whose LSH threshold (1/b)^(1/r)
+    is the highest one not above the similarity threshold (favours recall;
+    candidates are verified against their signatures anyway)"""
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    below = [(b, r) for b, r in options if (1 / b) ** (1 / r) <= threshold]
+    return max(below, key=lambda option: (1 / option[0]) ** (1 / option[1])) if below else options[-1]
+
+
+def token_bag_key(tokens):
+    """128-bit digest of a token multiset, the same for any order of its tokens"""
+    return hashlib.blake2b('\0'.join(sorted(tokens)).encode('utf-8'), digest_size=16).digest()
+
+
+def default_analyzer():
+    """The served vectorizer's tokenizer (stop words and n-grams included)"""
+    from src.models.registry import get_registry
+
+    return get_registry().vectorizer.build_analyzer()
+
+
+class NearDuplicateIndex:
+    """Assigns each text a group id; texts within the similarity threshold share one"""
+
+    def __init__(self, threshold=NEAR_DUP_THRESHOLD, num_perm=NEAR_DUP_PERMUTATIONS, analyzer=None,
+                 max_groups=NEAR_DUP_MAX_GROUPS, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+        self.max_groups = max_groups
+        self._analyzer = analyzer
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: ((a * x + b) mod 2^64) >> 32, a odd
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64)
+        self.results = {}  # group id -> caller's result for the group (e.g. its prediction)
+        self.counters = {'texts': 0, 'groups': 0, 'duplicates': 0}
+        self.reset()
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            self._analyzer = default_analyzer()
+        return self._analyzer
+
+    def reset(self):
+        self._signatures = []  # group id -> MinHash signature of its first text
+        self._exact = {}  # token_bag_key -> group id, skips LSH for exact repeats
+        self._buckets = [{} for _ in range(self.bands)]  # band -> band hash -> [group ids]
+        self._empty_seen = False
+        self.results.clear()
+
+    def signatures(self, texts):
+        """(len(texts), num_perm) uint32 MinHash signatures, a mask of texts with no
+        tokens, and the token_bag_key of each text"""
+        analyzer = self.analyzer
+        signatures = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        empty = np.zeros(len(texts), dtype=bool)
+        keys = []
+        for block_start in range(0, len(texts), _SIGNATURE_BLOCK):
+            hashes, lengths = [], []
+            for text in texts[block_start:block_start + _SIGNATURE_BLOCK]:
+                tokens = analyzer(text)
+                keys.append(token_bag_key(tokens))
+                tokens = frozenset(tokens)
+                hashes.extend(map(hash, tokens))  # str hashes are cached on the token objects
+                lengths.append(len(tokens))
+            lengths = np.asarray(lengths)
+            block_empty = lengths == 0
+            empty[block_start:block_start + len(lengths)] = block_empty
+            if not hashes or self.threshold >= 1:
+                continue  # exact mode groups on the token-bag key alone
+            # (permutations, tokens) so each text's tokens are contiguous for reduceat
+            permuted = self._a[:, None] * np.asarray(hashes, dtype=np.int64).view(np.uint64)
+            permuted += self._b[:, None]
+            permuted >>= np.uint64(32)
+            starts = (np.cumsum(lengths) - lengths)[~block_empty]
+            rows = np.flatnonzero(~block_empty) + block_start
+            signatures[rows] = np.minimum.reduceat(permuted, starts, axis=1).T
+        return signatures, empty, keys
+
+    def _band_hashes(self, signatures):
+        """(n, bands) uint64 hash of each band's rows"""
+        banded = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        return (banded * self._band_mix).sum(axis=2)
+
+    def add(self, texts):
+        """Group ids for texts, and a mask of the texts that started a new group"""
+        if len(self._signatures) >= self.max_groups:
+            self.reset()
+        signatures, empty, keys = self.signatures(texts)
+        band_hashes = self._band_hashes(signatures).tolist()
+        group_ids = np.empty(len(texts), dtype=np.int64)
+        is_new = np.zeros(len(texts), dtype=bool)
+        for i, key in enumerate(keys):
+            if empty[i]:
+                group_ids[i] = EMPTY_GROUP
+                is_new[i] = not self._empty_seen
+                self._empty_seen = True
+                continue
+            group = self._exact.get(key)
+            if group is None:
+                group = self._match(signatures[i], band_hashes[i]) if self.threshold < 1 else None
+                if group is None:
+                    group = len(self._signatures)
+                    self._signatures.append(signatures[i])
+                    for bucket, band_hash in zip(self._buckets, band_hashes[i]):
+                        bucket.setdefault(band_hash, []).append(group)
+                    is_new[i] = True
+                self._exact[key] = group
+            group_ids[i] = group
+
+        self.counters['texts'] += len(texts)
+        self.counters['groups'] += int(is_new.sum())
+        self.counters['duplicates'] += int(len(texts) - is_new.sum())
+        return group_ids, is_new
+
+    def _match(self, signature, band_hashes):
+        """First earlier group whose signature agrees on at least threshold of its positions"""
+        seen = set()
+        for bucket, band_hash in zip(self._buckets, band_hashes):
+            for group in bucket.get(band_hash, ()):
+                if group in seen:
+                    continue
+                seen.add(group)
+                if np.count_nonzero(self._signatures[group] == signature) >= self.threshold * self.num_perm:
+                    return group
+        return None
+
+    def stats(self):
+        counters = dict(self.counters)
+        counters['dedup_ratio'] = round(counters['duplicates'] / counters['texts'], 4) if counters['texts'] else 0.0
+        return counters
@@ -0,0 +1,359 @@
+"""Append-only log of served predictions, written off the request path.
+
+``record`` only puts a call's predictions on a bounded queue (they are dropped
+and counted when it is full). A background thread per process drains the
+queue every PREDICTION_LOG_FLUSH_SECONDS or PREDICTION_LOG_BATCH_ROWS rows and
+
+* appends one Arrow record batch (timestamp, route, model, prediction,
+  predicted_sentiment, confidence) to the current segment, an Arrow IPC
+  stream file under PREDICTION_LOG_DIR. Complete batches can be read while
+  the segment is still being written. Segments rotate after
+  PREDICTION_LOG_SEGMENT_BYTES or PREDICTION_LOG_SEGMENT_SECONDS and are
+  deleted after PREDICTION_LOG_RETENTION_DAYS; names carry the start time
+  and pid, so pre-forked workers never share one.
+* adds the batch to the analytics store's window rollups: predictions per
+  MONITOR_WINDOW_SECONDS window, model and sentiment, and per window, model
+  and confidence bucket. Drift monitors and dashboards read those
+  (src/models/drift_monitor.py) instead of scanning the log. Windows older
+  than the retention period are deleted along with the segments.
+"""
+import atexit
+import glob
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from src.data.analytics_store import SENTIMENT_NAMES, get_store
+from src.data.data_processor import PROCESSED_DIR
+
+PREDICTION_LOG_ENABLED = os.environ.get('PREDICTION_LOG_ENABLED', '1') != '0'
+PREDICTION_LOG_DIR = os.environ.get('PREDICTION_LOG_DIR', os.path.join(PROCESSED_DIR, 'prediction_log'))
+PREDICTION_LOG_BATCH_ROWS = int(os.environ.get('PREDICTION_LOG_BATCH_ROWS', 4096))
+PREDICTION_LOG_FLUSH_SECONDS = float(os.environ.get('PREDICTION_LOG_FLUSH_SECONDS', 2))
+# Calls (not rows) that may wait for the writer before new ones are dropped
+PREDICTION_LOG_MAX_PENDING = int(os.environ.get('PREDICTION_LOG_MAX_PENDING', 10000))
+PREDICTION_LOG_SEGMENT_BYTES = int(os.environ.get('PREDICTION_LOG_SEGMENT_BYTES', 64 * 1024 * 1024))
+PREDICTION_LOG_SEGMENT_SECONDS = float(os.environ.get('PREDICTION_LOG_SEGMENT_SECONDS', 3600))
+PREDICTION_LOG_RETENTION_DAYS = float(os.environ.get('PREDICTION_LOG_RETENTION_DAYS', 14))
+MONITOR_WINDOW_SECONDS = int(os.environ.get('MONITOR_WINDOW_SECONDS', 60))
+
+# Confidence (top-class probability) buckets of the window rollups: equal-width over [0, 1]
+CONFIDENCE_BINS = 20
+SEGMENT_SUFFIX = '.arrows'
+
+_STOP = object()
+
+
+def log_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('timestamp', pa.timestamp('ms', 'UTC')),
+        ('route', pa.string()),
+        ('model', pa.string()),
+        ('prediction', pa.int8()),
+        ('predicted_sentiment', pa.string()),
+        ('confidence', pa.float32())  # NaN for models without predict_proba
+    ])
+
+
+def confidence_buckets(confidence):
+    """Bucket index of each confidence value (NaNs must be removed first)"""
+    return np.minimum((np.asarray(confidence) * CONFIDENCE_BINS).astype(np.int64), CONFIDENCE_BINS - 1)
+
+
+def _confidences(probabilities, rows):
+    if probabilities is None:
+        return np.full(rows, np.nan, dtype=np.float32)
+    if isinstance(probabilities, np.ndarray):
+        if probabilities.ndim != 2 or not probabilities.shape[1]:
+            return np.full(rows, np.nan, dtype=np.float32)
+        return probabilities.max(axis=1).astype(np.float32)
+    return np.array([max(p) if p is not None else np.nan for p in probabilities], dtype=np.float32)
+
+
+def _sentiments(predictions):
+    codes, inverse = np.unique(predictions, return_inverse=True)
+    return np.array([SENTIMENT_NAMES.get(int(code), str(code)) for code in codes], dtype=object)[inverse]
+
+
+def window_rows(seconds, models, sentiments, confidence, window_seconds=MONITOR_WINDOW_SECONDS):
+    """Rollup rows (window_start, model, sentiment|bucket, count) for the analytics store"""
+    windows = (np.asarray(seconds, dtype=np.int64) // window_seconds * window_seconds).tolist()
+    class_rows = Counter(zip(windows, models, sentiments))
+    scored = ~np.isnan(confidence)
+    confidence_rows = Counter(zip(
+        np.asarray(windows)[scored].tolist(), np.asarray(models, dtype=object)[scored].tolist(),
+        confidence_buckets(confidence[scored]).tolist()
+    ))
+    return ([(w, m, s, n) for (w, m, s), n in class_rows.items()],
+            [(w, m, b, n) for (w, m, b), n in confidence_rows.items()])
+
+
+class PredictionLog:
+    """Batched, rotated Arrow log of predictions with window rollups, fed through a queue"""
+
+    def __init__(self, log_dir=PREDICTION_LOG_DIR, store=None, enabled=PREDICTION_LOG_ENABLED,
+                 batch_rows=PREDICTION_LOG_BATCH_ROWS, flush_seconds=PREDICTION_LOG_FLUSH_SECONDS,
+                 max_pending=PREDICTION_LOG_MAX_PENDING, segment_bytes=PREDICTION_LOG_SEGMENT_BYTES,
+                 segment_seconds=PREDICTION_LOG_SEGMENT_SECONDS, retention_days=PREDICTION_LOG_RETENTION_DAYS):
+        self.log_dir = log_dir
+        self.store = store
+        self.enabled = enabled
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.retention_days = retention_days
+        self.counters = {'rows_logged': 0, 'rows_dropped': 0, 'batches': 0, 'segments': 0, 'errors': 0}
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._sink = None  # open segment file and its stream writer
+        self._writer = None
+        self._segment_path = None
+        self._segment_started = 0.0
+        self._sequence = 0
+
+    def record(self, route, model_name, predictions, probabilities=None):
+        """Queue one call's predictions (labels, and probability rows or None); never blocks"""
+        if not self.enabled or not len(predictions):
+            return
+        try:
+            self._ensure_started().put_nowait((time.time(), route, model_name, predictions, probabilities))
+        except queue.Full:
+            self.counters['rows_dropped'] += len(predictions)
+
+    def _ensure_started(self):
+        """Per-process queue and writer thread, started on first use so forked workers get their own"""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(self.max_pending)
+                    self._sink = self._writer = self._segment_path = None
+                    self._thread = threading.Thread(target=self._run, name='prediction-log', daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+                    atexit.register(self.close)
+        return self._queue
+
+    def _collect(self):
+        """Calls queued until batch_rows rows or flush_seconds, and the control item that ended
+        the batch early (a flush Event or _STOP), if any"""
+        calls = []
+        rows = 0
+        deadline = None
+        while rows < self.batch_rows:
+            try:
+                item = self._queue.get(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if not isinstance(item, tuple):
+                return calls, item
+            calls.append(item)
+            rows += len(item[3])
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_seconds
+        return calls, None
+
+    def _run(self):
+        while True:
+            calls, control = self._collect()
+            if calls:
+                try:
+                    self._write(calls)
+                except Exception as e:
+                    self.counters['errors'] += 1
+                    self.last_error = f'{type(e).__name__}: {e}'
+                    print(f'Prediction log write failed: {self.last_error}', file=sys.stderr)
+            if control is _STOP:
+                self._close_segment()
+                return
+            if control is not None:
+                control.set()
+
+    def _write(self, calls):
+        import pyarrow as pa
+
+        counts = [len(call[3]) for call in calls]
+        seconds = np.repeat([call[0] for call in calls], counts)
+        routes = np.repeat(np.array([call[1] for call in calls], dtype=object), counts)
+        models = np.repeat(np.array([call[2] for call in calls], dtype=object), counts)
+        predictions = np.concatenate([np.asarray(call[3], dtype=np.int8).ravel() for call in calls])
+        confidence = np.concatenate([_confidences(call[4], n) for call, n in zip(calls, counts)])
+        sentiments = _sentiments(predictions)
+
+        batch = pa.RecordBatch.from_arrays([
+            pa.array((seconds * 1000).astype(np.int64), pa.timestamp('ms', 'UTC')),
+            pa.array(routes, pa.string()),
+            pa.array(models, pa.string()),
+            pa.array(predictions, pa.int8()),
+            pa.array(sentiments, pa.string()),
+            pa.array(confidence, pa.float32(), from_pandas=False)
+        ], schema=log_schema())
+        self._segment(time.time()).write_batch(batch)
+
+        (self.store or get_store()).add_prediction_windows(
+            *window_rows(seconds, models.tolist(), sentiments.tolist(), confidence)
+        )
+        self.counters['rows_logged'] += len(predictions)
+        self.counters['batches'] += 1
+
+    def _segment(self, now):
+        """Stream writer of the current segment, rotating it when full or old"""
+        import pyarrow as pa
+
+        if self._writer is not None and (self._sink.tell() >= self.segment_bytes
+                                         or now - self._segment_started >= self.segment_seconds):
+            self._close_segment()
+        if self._writer is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._sequence += 1
+            self._segment_path = os.path.join(
+                self.log_dir,
+                f'predictions-{datetime.fromtimestamp(now):%Y%m%d-%H%M%S}-{os.getpid()}-{self._sequence:04d}'
+                f'{SEGMENT_SUFFIX}'
+            )
+            self._sink = pa.OSFile(self._segment_path, 'wb')
+            self._writer = pa.ipc.new_stream(self._sink, log_schema(),
+                                             options=pa.ipc.IpcWriteOptions(compression='zstd'))
+            self._segment_started = now
+            self.counters['segments'] += 1
+            self._prune(now)
+        return self._writer
+
+    def _close_segment(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+        self._sink = self._writer = self._segment_path = None
+
+    def _prune(self, now):
+        """Delete segments whose last write, and window rollups, older than the retention period"""
+        cutoff = now - self.retention_days * 86400
+        for path in log_segments(self.log_dir):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+        try:
+            (self.store or get_store()).prune_prediction_windows(cutoff)
+        except Exception as e:
+            print(f'Pruning prediction windows failed: {type(e).__name__}: {e}', file=sys.stderr)
+
+    def flush(self, timeout=10):
+        """Write everything queued so far; True once the writer has caught up"""
+        if self._pid != os.getpid():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=10):
+        """Write what is queued, close the current segment and stop the writer thread"""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._pid = None
+            thread, q = self._thread, self._queue
+        try:
+            q.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def stats(self):
+        running = self._pid == os.getpid()
+        return dict(self.counters, enabled=self.enabled, queued=self._queue.qsize() if running else 0,
+                    segment=os.path.basename(self._segment_path) if running and self._segment_path else None,
+                    last_error=self.last_error)
+
+
+def log_segments(log_dir=PREDICTION_LOG_DIR):
+    """Segment files, oldest first"""
+    return sorted(glob.glob(os.path.join(log_dir, f'predictions-*{SEGMENT_SUFFIX}')))
+
+
+def iter_log_batches(log_dir=PREDICTION_LOG_DIR):
+    """Record batches of every segment; a segment's incomplete last batch is skipped"""
+    import pyarrow as pa
+
+    for path in log_segments(log_dir):
+        try:
+            with pa.ipc.open_stream(pa.memory_map(path)) as reader:
+                for batch in reader:
+                    yield batch
+        except (pa.ArrowInvalid, OSError):
+            # Being written (or rotated away) right now
+            continue
+
+
+def _timestamp(value):
+    """Log timestamp scalar for a datetime (naive ones are local time) or unix seconds"""
+    import pyarrow as pa
+
+    seconds = value.timestamp() if isinstance(value, datetime) else float(value)
+    return pa.scalar(int(seconds * 1000), pa.timestamp('ms', 'UTC'))
+
+
+def read_prediction_log(since=None, until=None, model=None, log_dir=PREDICTION_LOG_DIR):
+    """Logged predictions as a DataFrame (timestamps in UTC), optionally limited to a time
+    range (datetimes or unix seconds) and a model"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    batches = []
+    for batch in iter_log_batches(log_dir):
+        mask = None
+        for condition in (
+            pc.greater_equal(batch['timestamp'], _timestamp(since)) if since is not None else None,
+            pc.less(batch['timestamp'], _timestamp(until)) if until is not None else None,
+            pc.equal(batch['model'], model) if model else None
+        ):
+            if condition is not None:
+                mask = condition if mask is None else pc.and_(mask, condition)
+        batches.append(batch if mask is None else batch.filter(mask))
+    return pa.Table.from_batches(batches, schema=log_schema()).to_pandas()
+
+
+def rebuild_windows(log_dir=PREDICTION_LOG_DIR, store=None, window_seconds=MONITOR_WINDOW_SECONDS):
+    """Recompute the analytics store's window rollups from the log segments; returns rows read"""
+    rows = 0
+
+    def row_batches():
+        nonlocal rows
+        for batch in iter_log_batches(log_dir):
+            seconds = batch['timestamp'].cast('int64').to_numpy() // 1000
+            confidence = batch['confidence'].to_numpy(zero_copy_only=False).astype(np.float32)
+            yield window_rows(seconds, batch['model'].to_pylist(), batch['predicted_sentiment'].to_pylist(),
+                              confidence, window_seconds)
+            rows += batch.num_rows
+
+    (store or get_store()).replace_prediction_windows(row_batches())
+    return rows
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_prediction_log():
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = PredictionLog()
+    return _log
@@ -0,0 +1,210 @@
+"""Columnar copy of the raw review CSVs.
+
+ingest_reviews converts CSVs chunk by chunk into a single Parquet or Arrow IPC
+file (chosen by extension) with compact types: int8 ratings and
+dictionary-encoded brands. Rows already seen in an earlier chunk or file are
+dropped, and optionally near-duplicates of them too
+(src.data.near_duplicates). Readers memory-map the file and load only the
+columns and rows they ask for, so neither the analytics routes nor the scripts
+hold an object-dtype frame of the whole corpus.
+"""
+import os
+
+import numpy as np
+
+from src.data.data_processor import PROCESSED_DIR, iter_review_chunks
+
+REVIEWS_DATASET = os.environ.get('REVIEWS_DATASET', os.path.join(PROCESSED_DIR, 'reviews.parquet'))
+REVIEW_COLUMNS = ('reviews_text', 'reviews_rating', 'brand')
+COLUMNAR_FORMATS = {'.parquet': 'parquet', '.arrow': 'ipc', '.feather': 'ipc'}
+
+# Rating ranges behind each sentiment, as analytics_store.rating_to_sentiment
+SENTIMENT_RATINGS = {'positive': (4, 5), 'neutral': (3, 3), 'negative': (1, 2)}
+
+
+def dataset_format(path):
+    """'parquet' or 'ipc' for a columnar file path, None for anything else"""
+    return COLUMNAR_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def review_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('reviews_text', pa.string()),
+        ('reviews_rating', pa.int8()),
+        ('brand', pa.dictionary(pa.int32(), pa.string()))
+    ])
+
+
+def _row_hashes(chunk):
+    """64-bit key of (stripped text, rating) per row, for exact de-duplication"""
+    import pandas as pd
+
+    key = pd.DataFrame({
+        'text': chunk['reviews_text'].fillna('').astype(str).str.strip(),
+        'rating': chunk['reviews_rating']
+    })
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+def _to_batch(chunk, schema, brand_codes):
+    """Typed record batch; brand codes index a vocabulary that only ever grows,
+    so each batch's dictionary extends the previous one (an IPC delta)"""
+    import pandas as pd
+    import pyarrow as pa
+
+    ratings = pd.to_numeric(chunk['reviews_rating'], errors='coerce').round()
+    ratings = ratings.where(ratings.between(-128, 127))
+    if 'brand' in chunk.columns:
+        labels, uniques = pd.factorize(chunk['brand'].astype('string').str.strip())
+        mapping = np.array([brand_codes.setdefault(brand, len(brand_codes)) for brand in uniques], dtype=np.int32)
+        codes = mapping[labels] if len(mapping) else np.zeros(len(labels), dtype=np.int32)
+        missing = labels < 0
+    else:
+        codes = np.zeros(len(chunk), dtype=np.int32)
+        missing = np.ones(len(chunk), dtype=bool)
+    brands = pa.DictionaryArray.from_arrays(
+        pa.array(codes, type=pa.int32(), mask=missing), pa.array(list(brand_codes), type=pa.string())
+    )
+    return pa.record_batch([
+        pa.array(chunk['reviews_text'].astype(object), type=pa.string(), from_pandas=True),
+        pa.array(ratings, type=pa.int8(), from_pandas=True),
+        brands
+    ], schema=schema)
+
+
+def ingest_reviews(paths, output=REVIEWS_DATASET, chunksize=50000, dedupe=True, compression='zstd',
+                   near_duplicate_threshold=None, analyzer=None):
+    """Convert review CSVs into one columnar file at output; returns counters.
+
+    Parquet output is compressed with one row group per chunk (min/max
+    statistics let filtered reads skip row groups); Arrow output is written
+    uncompressed so memory-mapped reads are zero-copy. With
+    near_duplicate_threshold, rows whose tokens (analyzer, default the served
+    vectorizer's) nearly match an earlier row with the same rating are dropped
+    as well; rows without any tokens are always kept.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fmt = dataset_format(output)
+    if fmt is None:
+        raise ValueError(f'Unsupported output format: {output} (use {", ".join(COLUMNAR_FORMATS)})')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    schema = review_schema()
+    stats = {'files': len(paths), 'rows_read': 0, 'rows_written': 0, 'duplicates': 0, 'row_groups': 0}
+    seen = set()
+    brand_codes = {}
+    near_duplicates = {}  # rating -> NearDuplicateIndex
+    if near_duplicate_threshold is not None:
+        from src.data.near_duplicates import EMPTY_GROUP, NearDuplicateIndex, default_analyzer
+
+        analyzer = analyzer or default_analyzer()
+        stats['near_duplicates'] = 0
+
+    tmp_path = f'{output}.tmp'
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(tmp_path, schema, compression=compression)
+    else:
+        writer = pa.ipc.new_file(tmp_path, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+    try:
+        for chunk in iter_review_chunks(paths, chunksize, usecols=REVIEW_COLUMNS):
+            stats['rows_read'] += len(chunk)
+            for column in ('reviews_text', 'reviews_rating'):
+                if column not in chunk.columns:
+                    chunk[column] = None
+            if dedupe:
+                hashes = _row_hashes(chunk)
+                keep = ~pd.Series(hashes).duplicated().to_numpy()
+                keep &= np.fromiter((h not in seen for h in hashes.tolist()), dtype=bool, count=len(hashes))
+                seen.update(hashes[keep].tolist())
+                stats['duplicates'] += int((~keep).sum())
+                chunk = chunk[keep]
+            if near_duplicate_threshold is not None and not chunk.empty:
+                keep = np.ones(len(chunk), dtype=bool)
+                texts = chunk['reviews_text'].fillna('').astype(str).tolist()
+                ratings = pd.to_numeric(chunk['reviews_rating'], errors='coerce').round().fillna(-1).astype(int)
+                for rating, positions in ratings.groupby(ratings).indices.items():
+                    if rating not in near_duplicates:
+                        near_duplicates[rating] = NearDuplicateIndex(
+                            near_duplicate_threshold, analyzer=analyzer, max_groups=float('inf')
+                        )
+                    group_ids, is_new = near_duplicates[rating].add([texts[i] for i in positions])
+                    keep[positions] = is_new | (group_ids == EMPTY_GROUP)
+                stats['near_duplicates'] += int((~keep).sum())
+                chunk = chunk[keep]
+            if chunk.empty:
+                continue
+            writer.write_batch(_to_batch(chunk, schema, brand_codes))
+            stats['rows_written'] += len(chunk)
+            stats['row_groups'] += 1
+    except BaseException:
+        writer.close()
+        os.remove(tmp_path)
+        raise
+    writer.close()
+    os.replace(tmp_path, output)
+    stats['brands'] = len(brand_codes)
+    stats['bytes'] = os.path.getsize(output)
+    return stats
+
+
+def open_reviews(path=REVIEWS_DATASET):
+    """Memory-mapped pyarrow Dataset over an ingested file (FileNotFoundError until ingested)"""
+    import pyarrow.dataset as ds
+    from pyarrow.fs import LocalFileSystem
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return ds.dataset(path, format=dataset_format(path), filesystem=LocalFileSystem(use_mmap=True))
+
+
+def review_filter(rating=None, brand=None, sentiment=None):
+    """pyarrow filter expression for the given constraints (None when unconstrained)"""
+    import pyarrow.dataset as ds
+
+    conditions = []
+    if rating is not None:
+        conditions.append(ds.field('reviews_rating') == rating)
+    if brand is not None:
+        conditions.append(ds.field('brand') == brand)
+    if sentiment is not None:
+        low, high = SENTIMENT_RATINGS[sentiment]
+        conditions.append((ds.field('reviews_rating') >= low) & (ds.field('reviews_rating') <= high))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def iter_review_batches(path=REVIEWS_DATASET, columns=None, batch_size=50000, filter=None):
+    """Yield record batches holding only the requested columns"""
+    dataset = open_reviews(path)
+    columns = [column for column in columns if column in dataset.schema.names] if columns else None
+    yield from dataset.to_batches(columns=columns, filter=filter, batch_size=batch_size)
+
+
+def query_reviews(columns=('reviews_text', 'reviews_rating'), limit=100, offset=0, path=REVIEWS_DATASET, **filters):
+    """(matching row count, list of row dicts) for one page of filtered reviews"""
+    dataset = open_reviews(path)
+    expression = review_filter(**filters)
+    scanner = dataset.scanner(columns=list(columns), filter=expression)
+    total = dataset.count_rows(filter=expression)
+    rows = scanner.head(offset + limit).slice(offset).to_pylist()
+    return total, rows
+
+
+def group_reviews(by, path=REVIEWS_DATASET, **filters):
+    """Review count and mean rating per value of a column, largest groups first"""
+    table = open_reviews(path).to_table(columns=list(dict.fromkeys([by, 'reviews_rating'])),
+                                        filter=review_filter(**filters))
+    if by == 'brand':
+        table = table.set_column(0, 'brand', table['brand'].cast('string'))
+    grouped = table.group_by(by).aggregate([('reviews_rating', 'count'), ('reviews_rating', 'mean')])
+    groups = [
+        {by: row[by], 'count': row['reviews_rating_count'], 'mean_rating': row['reviews_rating_mean']}
+        for row in grouped.to_pylist()
+    ]
+    return sorted(groups, key=lambda group: group['count'], reverse=True)
@@ -0,0 +1,86 @@
+"""Incremental readers for NDJSON and CSV review streams.
+
+Both readers pull one record at a time from a text stream, so memory use does
+not depend on the size of the input.
+"""
+import csv
+import json
+
+# Accepted names for the review text / rating columns, in priority order
+TEXT_COLUMNS = ('reviews_text', 'review', 'text')
+RATING_COLUMNS = ('reviews_rating', 'rating')
+
+
+def _find_column(header, candidates):
+    normalized = [name.strip().lower() for name in header]
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized.index(candidate)
+    return None
+
+
+def iter_csv_records(text_stream):
+    """Yield (index, text, rating, error) tuples from a CSV with a header row"""
+    reader = csv.reader(text_stream)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    text_idx = _find_column(header, TEXT_COLUMNS)
+    rating_idx = _find_column(header, RATING_COLUMNS)
+    if text_idx is None:
+        raise ValueError(f'CSV header must contain one of {", ".join(TEXT_COLUMNS)}')
+
+    for index, row in enumerate(reader):
+        if len(row) <= text_idx:
+            yield index, '', None, 'missing text column'
+            continue
+        rating = row[rating_idx] if rating_idx is not None and len(row) > rating_idx else None
+        yield index, row[text_idx], rating, None
+
+
+def iter_ndjson_records(text_stream):
+    """Yield (index, text, rating, error) tuples from newline-delimited JSON.
+
+    Each line is either a JSON string or an object with a text field
+    (``text``/``reviews_text``/``review``) and an optional rating.
+    """
+    index = 0
+    for line in text_stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield index, '', None, f'invalid JSON: {e}'
+            index += 1
+            continue
+
+        if isinstance(record, str):
+            yield index, record, None, None
+        elif isinstance(record, dict):
+            text = next((record[c] for c in TEXT_COLUMNS if c in record), '')
+            rating = next((record[c] for c in RATING_COLUMNS if c in record), None)
+            yield index, str(text) if text is not None else '', rating, None
+        else:
+            yield index, '', None, 'record must be a string or an object'
+        index += 1
+
+
+def iter_records(text_stream, fmt):
+    if fmt == 'csv':
+        return iter_csv_records(text_stream)
+    return iter_ndjson_records(text_stream)
+
+
+def iter_batches(records, batch_size):
+    """Group an iterable into lists of at most batch_size items"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,200 @@
+"""Persistent term-frequency index behind the word clouds.
+
+Token counts are kept per partition (``all``, ``sentiment:<name>``,
+``brand:<name>``) and updated incrementally as reviews arrive, so a word cloud
+is rendered from frequencies instead of re-tokenizing the whole corpus. The
+``version`` counter changes whenever counts change and is used to invalidate
+rendered images.
+
+Every process (e.g. gunicorn worker) keeps the counts it added since its last
+save apart, and save() adds them to the file's current counts under an flock
+on a lock file next to it, so workers never overwrite each other's counts.
+Reads pick up counts saved by other processes when the file changes.
+Counts still unsaved when the process exits are saved by an atexit hook.
+"""
+import atexit
+import json
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not merged across processes, run a single web worker
+    fcntl = None
+
+from src.data.data_processor import PROCESSED_DIR
+
+TERM_INDEX_PATH = os.environ.get('TERM_INDEX_PATH', os.path.join(PROCESSED_DIR, 'term_index.json'))
+# Unsaved updates are written once this many texts have been added, and at exit
+TERM_INDEX_SAVE_EVERY = int(os.environ.get('TERM_INDEX_SAVE_EVERY', 1000))
+
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+@lru_cache(maxsize=1)
+def get_stopwords():
+    """WordCloud's stopword list, read from the package without importing it (and matplotlib)"""
+    import importlib.util
+    spec = importlib.util.find_spec('wordcloud')
+    if spec is not None and spec.submodule_search_locations:
+        path = os.path.join(list(spec.submodule_search_locations)[0], 'stopwords')
+        if os.path.exists(path):
+            with open(path) as f:
+                return frozenset(line.strip() for line in f if line.strip())
+    from wordcloud import STOPWORDS
+    return frozenset(STOPWORDS)
+
+
+def tokenize(text):
+    """Lowercase, strip punctuation and drop stopwords and numbers, as the word cloud did"""
+    stopwords = get_stopwords()
+    return [w for w in _PUNCTUATION.sub('', text.lower()).split() if w not in stopwords and not w.isdigit()]
+
+
+# Indexes holding unsaved changes, for the exit hook; saved indexes are dropped
+# so the hook keeps nothing alive once its counts are written
+_indexes_with_unsaved = set()
+
+
+@atexit.register
+def _save_unsaved_indexes():
+    for index in list(_indexes_with_unsaved):
+        index.save()
+
+
+class TermIndex:
+
+    def __init__(self, path=TERM_INDEX_PATH):
+        self.path = path
+        self.partitions = defaultdict(Counter)  # saved counts plus this process's unsaved ones
+        self.version = 0
+        self._unsaved = 0
+        self._pending = defaultdict(Counter)  # counts added since the last save
+        self._replace = False  # after clear(), the next save overwrites the file
+        self._file_version = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self):
+        """(version, partitions) saved in the file, empty if there is none"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0, {}
+        return data.get('version', 0), data.get('partitions', {})
+
+    def load(self):
+        """Re-read the file, keeping the counts this process has not saved yet"""
+        file_version = self._stat()
+        version, saved = self._read()
+        with self._lock:
+            partitions = defaultdict(Counter, {name: Counter(counts) for name, counts in saved.items()})
+            for name, counts in self._pending.items():
+                partitions[name].update(counts)
+            self.partitions = partitions
+            self.version = max(self.version, version) + 1
+            self._file_version = file_version
+
+    def refresh(self):
+        """Reload if another process saved since this one last read the file"""
+        if not self._replace and self._stat() != self._file_version:
+            self.load()
+
+    def save(self):
+        """Merge this process's unsaved counts into the file"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(f'{self.path}.lock', 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            version, saved = self._read()
+            with self._lock:
+                if self._replace:
+                    partitions = self.partitions
+                else:
+                    partitions = defaultdict(Counter, {name: Counter(counts) for name, counts in saved.items()})
+                    for name, counts in self._pending.items():
+                        partitions[name].update(counts)
+                self.version = max(self.version, version) + 1
+                data = {
+                    'version': self.version,
+                    'partitions': {name: dict(counts) for name, counts in partitions.items()}
+                }
+                self.partitions = partitions
+                self._pending = defaultdict(Counter)
+                self._replace = False
+                self._unsaved = 0
+                _indexes_with_unsaved.discard(self)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self._file_version = self._stat()
+
+    def add_texts(self, texts, sentiments=None, brands=None):
+        """Count the tokens of each text into 'all' and its sentiment/brand partitions"""
+        updates = defaultdict(Counter)
+        for i, text in enumerate(texts):
+            counts = Counter(tokenize(str(text)))
+            updates['all'].update(counts)
+            if sentiments is not None and sentiments[i] is not None:
+                updates[f'sentiment:{str(sentiments[i]).lower()}'].update(counts)
+            if brands is not None and brands[i] is not None:
+                updates[f'brand:{brands[i]}'].update(counts)
+
+        with self._lock:
+            for name, counts in updates.items():
+                self.partitions[name].update(counts)
+                self._pending[name].update(counts)
+            self.version += 1
+            self._unsaved += len(texts)
+            _indexes_with_unsaved.add(self)
+            should_save = self._unsaved >= TERM_INDEX_SAVE_EVERY
+        if should_save:
+            self.save()
+
+    def clear(self):
+        """Drop every count; the next save replaces the file instead of merging into it"""
+        with self._lock:
+            self.partitions = defaultdict(Counter)
+            self._pending = defaultdict(Counter)
+            self._replace = True
+            self.version += 1
+            _indexes_with_unsaved.add(self)
+
+    def frequencies(self, partition='all', max_words=None):
+        with self._lock:
+            counts = self.partitions.get(partition)
+            if not counts:
+                return {}
+            return dict(counts.most_common(max_words))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'partitions': {name: len(counts) for name, counts in self.partitions.items()}
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_term_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TermIndex()
+    return _index
@@ -0,0 +1,105 @@
+"""Dynamic micro-batching for single-text prediction requests.
+
+Concurrent requests for the same model are queued; a dispatcher thread per
+model collects them for up to ``max_wait_ms`` or ``max_batch`` items, scores
+the whole batch with one vectorized call and resolves each request's Future.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from src.utils.instrumentation import Histogram
+
+MICROBATCH_ENABLED = os.environ.get('MICROBATCH_ENABLED', '0') == '1'
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get('MICROBATCH_MAX_WAIT_MS', 5))
+MICROBATCH_MAX_BATCH = int(os.environ.get('MICROBATCH_MAX_BATCH', 64))
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+QUEUE_TIME_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 250]
+
+
+class MicroBatcher:
+    """Collects single-text requests per model and scores them in batches.
+
+    ``score_fn(model_name, texts)`` must return (predictions, probabilities, timing)
+    with one entry per text, in order.
+    """
+
+    def __init__(self, score_fn, max_wait_ms=MICROBATCH_MAX_WAIT_MS, max_batch=MICROBATCH_MAX_BATCH):
+        self.score_fn = score_fn
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch = max_batch
+        self._queues = {}
+        self._lock = threading.Lock()
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_times = Histogram(QUEUE_TIME_BUCKETS_MS)
+        self.batches = 0
+        self.errors = 0
+
+    def submit(self, model_name, text):
+        """Queue one text; returns a Future resolving to (prediction, probabilities)"""
+        future = Future()
+        self._queue(model_name).put((text, future, time.perf_counter()))
+        return future
+
+    def _queue(self, model_name):
+        q = self._queues.get(model_name)
+        if q is None:
+            with self._lock:
+                q = self._queues.get(model_name)
+                if q is None:
+                    q = queue.Queue()
+                    thread = threading.Thread(
+                        target=self._dispatch, args=(model_name, q), name=f'microbatch-{model_name}', daemon=True
+                    )
+                    thread.start()
+                    self._queues[model_name] = q
+        return q
+
+    def _collect(self, q):
+        batch = [q.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self, model_name, q):
+        while True:
+            batch = self._collect(q)
+            dispatched = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_times.observe((dispatched - enqueued) * 1000)
+            self.batch_sizes.observe(len(batch))
+            with self._lock:
+                self.batches += 1
+
+            try:
+                predictions, probabilities, _ = self.score_fn(model_name, [text for text, _, _ in batch])
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), prediction, proba in zip(batch, predictions, probabilities):
+                future.set_result((prediction, proba))
+
+    def stats(self):
+        return {
+            'max_wait_ms': self.max_wait * 1000,
+            'max_batch': self.max_batch,
+            'batches': self.batches,
+            'errors': self.errors,
+            'queue_depth': {name: q.qsize() for name, q in self._queues.items()},
+            'batch_size_histogram': self.batch_sizes.snapshot(),
+            'queue_time_ms_histogram': self.queue_times.snapshot()
+        }
@@ -0,0 +1,118 @@
+"""Confidence-gated cascade over served models.
+
+A CascadeModel scores every row with its first (cheap) tier and passes only
+the rows whose top-class probability is below the threshold on to the next
+tier, so the expensive model (e.g. XGBoost) runs on the uncertain minority.
+The artifact holds member registry keys, not the members themselves: members
+are resolved through the registry on every call, so they stay shared with
+direct requests and pick up retrained pickles. Tiers must take the TF-IDF
+matrix (not the *_linear scorers), so the vectorize pass is shared too.
+
+Rows answered per tier are counted per cascade key in tier_counts, which
+outlives reloads of the artifact.
+"""
+import threading
+import time
+
+import numpy as np
+
+CASCADE_KEY = 'cascade'
+
+tier_counts = {}  # cascade key -> {'tiers': [keys], 'rows': [per tier], 'seconds': [per tier], 'escalation_errors': n}
+_counts_lock = threading.Lock()
+
+
+def aligned_proba(model, X, classes):
+    """predict_proba of model with its columns reordered onto classes"""
+    proba = np.asarray(model.predict_proba(X))
+    model_classes = np.asarray(getattr(model, 'classes_', np.arange(proba.shape[1])))
+    if np.array_equal(model_classes, classes):
+        return proba
+    full = np.zeros((proba.shape[0], len(classes)))
+    full[:, np.searchsorted(classes, model_classes)] = proba
+    return full
+
+
+class CascadeModel:
+    """Scores with tiers[0], escalating rows below threshold to the following tiers"""
+
+    def __init__(self, tiers, threshold, classes=(0, 1, 2), name=CASCADE_KEY, report=None):
+        if len(tiers) < 2:
+            raise ValueError('A cascade needs at least two tiers')
+        self.tiers = list(tiers)
+        self.threshold = float(threshold)
+        self.classes_ = np.asarray(classes)
+        self.name = name
+        self.report = report or {}  # held-out evaluation written by scripts/build_cascade.py
+
+    def predict_proba(self, X, registry=None):
+        if registry is None:
+            from src.models.registry import get_registry
+
+            registry = get_registry()
+        n_rows = X.shape[0]
+        rows_per_tier = [0] * len(self.tiers)
+        seconds_per_tier = [0.0] * len(self.tiers)
+        escalation_errors = 0
+
+        started = time.perf_counter()
+        proba = aligned_proba(registry[self.tiers[0]], X, self.classes_)
+        seconds_per_tier[0] = time.perf_counter() - started
+        pending = np.arange(n_rows)
+        for tier in range(1, len(self.tiers)):
+            uncertain = proba[pending].max(axis=1) < self.threshold
+            rows_per_tier[tier - 1] += int((~uncertain).sum())
+            pending = pending[uncertain]
+            if not len(pending):
+                break
+            started = time.perf_counter()
+            try:
+                proba[pending] = aligned_proba(registry[self.tiers[tier]], X[pending], self.classes_)
+            except Exception:
+                # A tier that fails to load or score leaves the previous tier's answer
+                escalation_errors += len(pending)
+                rows_per_tier[tier - 1] += len(pending)
+                pending = pending[:0]
+                break
+            finally:
+                seconds_per_tier[tier] += time.perf_counter() - started
+        rows_per_tier[-1] += len(pending)
+
+        self._count(rows_per_tier, seconds_per_tier, escalation_errors)
+        return proba
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def _count(self, rows, seconds, escalation_errors):
+        with _counts_lock:
+            counts = tier_counts.get(self.name)
+            if counts is None or counts['tiers'] != self.tiers:
+                # First call, or the artifact was rebuilt with other tiers
+                counts = tier_counts[self.name] = {
+                    'tiers': list(self.tiers), 'rows': [0] * len(self.tiers), 'seconds': [0.0] * len(self.tiers),
+                    'escalation_errors': 0
+                }
+            for tier in range(len(self.tiers)):
+                counts['rows'][tier] += rows[tier]
+                counts['seconds'][tier] += seconds[tier]
+            counts['escalation_errors'] += escalation_errors
+
+    def stats(self):
+        """Rows answered and time spent per tier since this process started"""
+        with _counts_lock:
+            counts = tier_counts.get(self.name)
+            if counts is None or counts['tiers'] != self.tiers:
+                counts = {'rows': [0] * len(self.tiers), 'seconds': [0.0] * len(self.tiers), 'escalation_errors': 0}
+            total = sum(counts['rows'])
+            return {
+                'tiers': self.tiers,
+                'threshold': self.threshold,
+                'rows': total,
+                'rows_per_tier': dict(zip(self.tiers, counts['rows'])),
+                'tier_fraction': {key: round(rows / total, 4) if total else 0.0
+                                  for key, rows in zip(self.tiers, counts['rows'])},
+                'seconds_per_tier': {key: round(seconds, 4) for key, seconds in zip(self.tiers, counts['seconds'])},
+                'escalation_errors': counts['escalation_errors'],
+                'held_out': self.report
+            }
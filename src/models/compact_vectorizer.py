@@ -0,0 +1,211 @@
+"""Compact replacements for the served TfidfVectorizer.
+
+CompactVectorizer keeps only the vocabulary terms some served model reads,
+stored as one UTF-8 blob plus offsets (like LinearScorer) instead of a pickled
+dict, and drops ``stop_words_``. It still emits matrices in the original
+column space, so the existing model pickles score its output unchanged; the
+only difference is that pruned terms no longer contribute to a document's norm.
+
+HashingTfidfVectorizer swaps the vocabulary for the hashing trick (no
+vocabulary at all). Its feature space differs from the original one, so the
+models must be retrained on it (``scripts/train_models.py --hashing``).
+"""
+import numpy as np
+import scipy.sparse as sp
+
+# Vectorizer settings re-created to tokenize exactly like the source vectorizer
+ANALYZER_PARAMS = (
+    'input', 'encoding', 'decode_error', 'strip_accents', 'lowercase', 'preprocessor', 'tokenizer',
+    'stop_words', 'token_pattern', 'ngram_range', 'analyzer'
+)
+
+
+def used_features(models, n_features):
+    """Boolean mask of the columns any of the given models can react to.
+
+    Linear models use columns with a non-zero coefficient; naive Bayes uses
+    columns seen during fitting (unseen ones only carry the smoothing prior);
+    tree ensembles use columns they split on. Other model types (e.g. text
+    scorers or cascades) raise TypeError rather than silently keeping every
+    column.
+    """
+    mask = np.zeros(n_features, dtype=bool)
+    for model in models:
+        if hasattr(model, 'feature_count_'):
+            mask |= np.asarray(model.feature_count_).sum(axis=0) > 0
+        elif hasattr(model, 'coef_'):
+            mask |= np.abs(np.asarray(model.coef_)).sum(axis=0) > 0
+        elif hasattr(model, 'get_booster'):
+            for name in model.get_booster().get_score(importance_type='weight'):
+                mask[int(name.lstrip('f'))] = True
+        elif hasattr(model, 'feature_importances_'):
+            mask |= np.asarray(model.feature_importances_) > 0
+        else:
+            raise TypeError(f'Cannot tell which features a {type(model).__name__} uses')
+    return mask
+
+
+def _normalize_rows(matrix, norm):
+    if norm is None:
+        return matrix
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    values = matrix.data ** 2 if norm == 'l2' else np.abs(matrix.data)
+    totals = np.bincount(rows, weights=values, minlength=matrix.shape[0])
+    if norm == 'l2':
+        totals = np.sqrt(totals)
+    totals[totals == 0] = 1.0
+    matrix.data /= totals[rows]
+    return matrix
+
+
+class CompactVectorizer:
+    """Array-backed, pruned TF-IDF vectorizer producing the original column space"""
+
+    def __init__(self, terms, columns, idf, n_features, analyzer_params, sublinear_tf=False, binary=False,
+                 norm='l2', dtype=np.float64):
+        encoded = [term.encode('utf-8') for term in terms]
+        self.term_bytes = np.frombuffer(b''.join(encoded), dtype=np.uint8).copy()
+        self.term_offsets = np.cumsum([0] + [len(term) for term in encoded], dtype=np.int32)
+        self.columns = np.asarray(columns, dtype=np.int32)  # original column of each kept term
+        self.idf = np.asarray(idf, dtype=dtype)
+        self.n_features = int(n_features)
+        self.analyzer_params = analyzer_params
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.norm = norm
+        self.dtype = np.dtype(dtype)
+        self._index = None
+        self._analyzer = None
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer, keep=None, dtype=None):
+        """Compact a fitted TfidfVectorizer, keeping the columns where keep is True (all by default)"""
+        vocabulary = vectorizer.vocabulary_
+        terms = [None] * len(vocabulary)
+        for term, index in vocabulary.items():
+            terms[index] = term
+        keep = np.ones(len(terms), dtype=bool) if keep is None else np.asarray(keep, dtype=bool)
+        columns = np.flatnonzero(keep)  # ascending, so rows come out with sorted indices
+        idf = vectorizer.idf_ if getattr(vectorizer, 'use_idf', True) else np.ones(len(terms))
+
+        params = vectorizer.get_params()
+        params['stop_words'] = None  # tokens are matched against the pruned vocabulary anyway
+        return cls(
+            terms=[terms[i] for i in columns],
+            columns=columns,
+            idf=np.asarray(idf)[columns],
+            n_features=len(terms),
+            analyzer_params={name: params[name] for name in ANALYZER_PARAMS if name in params},
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary,
+            norm=vectorizer.norm,
+            dtype=dtype or vectorizer.dtype
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_index'] = None
+        state['_analyzer'] = None
+        return state
+
+    def __len__(self):
+        return len(self.columns)
+
+    @property
+    def index(self):
+        """term -> position in the kept-terms arrays, rebuilt from the blob on first use"""
+        if self._index is None:
+            blob = self.term_bytes.tobytes()
+            offsets = self.term_offsets.tolist()
+            self._index = {
+                blob[start:end].decode('utf-8'): i for i, (start, end) in enumerate(zip(offsets, offsets[1:]))
+            }
+        return self._index
+
+    def build_analyzer(self):
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            self._analyzer = CountVectorizer(**self.analyzer_params).build_analyzer()
+        return self._analyzer
+
+    def transform(self, texts):
+        """TF-IDF matrix of shape (len(texts), n_features), like TfidfVectorizer.transform"""
+        index = self.index
+        analyzer = self.build_analyzer()
+        positions = []
+        lengths = []
+        for text in texts:
+            found = [position for position in map(index.get, analyzer(text)) if position is not None]
+            positions.extend(found)
+            lengths.append(len(found))
+
+        n_rows = len(lengths)
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), lengths)
+        # One sort groups tokens by (row, term) and counts repeats
+        keys, counts = np.unique(rows * len(self.columns) + np.asarray(positions, dtype=np.int64),
+                                 return_counts=True)
+        key_rows, key_positions = np.divmod(keys, max(len(self.columns), 1))
+
+        if self.binary:
+            tf = np.ones(len(counts), dtype=self.dtype)
+        elif self.sublinear_tf:
+            tf = np.log(counts).astype(self.dtype) + 1
+        else:
+            tf = counts.astype(self.dtype)
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(key_rows, minlength=n_rows), out=indptr[1:])
+        matrix = sp.csr_matrix(
+            (tf * self.idf[key_positions], self.columns[key_positions], indptr),
+            shape=(n_rows, self.n_features)
+        )
+        return _normalize_rows(matrix, self.norm)
+
+
+class HashingTfidfVectorizer:
+    """TF-IDF over hashed token counts: no vocabulary to store, load or look up"""
+
+    def __init__(self, n_features=2 ** 18, sublinear_tf=False, norm='l2', dtype=np.float64, **analyzer_params):
+        self.n_features = int(n_features)
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.dtype = np.dtype(dtype)
+        self.analyzer_params = {name: value for name, value in analyzer_params.items() if name in ANALYZER_PARAMS}
+        self.idf_ = None
+        self._hasher = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_hasher'] = None
+        return state
+
+    @property
+    def hasher(self):
+        if self._hasher is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._hasher = HashingVectorizer(
+                n_features=self.n_features, alternate_sign=False, norm=None, dtype=self.dtype,
+                **self.analyzer_params
+            )
+        return self._hasher
+
+    def build_analyzer(self):
+        return self.hasher.build_analyzer()
+
+    def fit(self, texts, y=None):
+        counts = self.hasher.transform(texts)
+        document_frequency = np.bincount(counts.indices, minlength=self.n_features)
+        # Smoothed idf, as TfidfVectorizer(smooth_idf=True)
+        self.idf_ = (np.log((1 + counts.shape[0]) / (1 + document_frequency)) + 1).astype(self.dtype)
+        return self
+
+    def fit_transform(self, texts, y=None):
+        return self.fit(texts).transform(texts)
+
+    def transform(self, texts):
+        matrix = sp.csr_matrix(self.hasher.transform(texts), dtype=self.dtype)
+        matrix.sort_indices()
+        if self.sublinear_tf:
+            np.log(matrix.data, out=matrix.data)
+            matrix.data += 1
+        matrix.data *= self.idf_[matrix.indices]
+        return _normalize_rows(matrix, self.norm)
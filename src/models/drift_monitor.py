@@ -0,0 +1,165 @@
+"""Throughput and drift summaries over the prediction log's window rollups.
+
+Each model's reference distribution is its predicted class mix and confidence
+histogram on the training pipeline's held-out split, written to
+DRIFT_BASELINE_FILE by scripts/build_drift_baseline.py. Live predictions are
+compared with it by the population stability index
+
+    PSI = sum((live - reference) * ln(live / reference))
+
+over the classes and over the confidence buckets (proportions floored at
+PSI_EPSILON). Below 0.1 reads as stable, 0.1-0.25 as moderate and above 0.25
+as significant drift. Only the analytics store's rollups are read, so a
+summary costs O(windows x buckets) whatever the traffic.
+"""
+import json
+import math
+import os
+import time
+from datetime import datetime
+
+from src.data.analytics_store import SENTIMENT_NAMES
+from src.data.prediction_log import CONFIDENCE_BINS
+from src.models.registry import MODEL_DIR
+
+DRIFT_BASELINE_FILE = os.environ.get('DRIFT_BASELINE_FILE', os.path.join(MODEL_DIR, 'drift_baseline.json'))
+PSI_EPSILON = 1e-4
+PSI_LEVELS = ((0.1, 'stable'), (0.25, 'moderate'), (float('inf'), 'significant'))
+# Windows with fewer predictions get no PSI of their own (too noisy)
+MONITOR_MIN_ROWS = int(os.environ.get('MONITOR_MIN_ROWS', 100))
+
+SENTIMENTS = [SENTIMENT_NAMES[code] for code in sorted(SENTIMENT_NAMES)]
+
+
+def psi(counts, reference):
+    """PSI of observed counts against reference proportions, both in the same bin order"""
+    total = sum(counts)
+    if not total:
+        return None
+    value = 0.0
+    for count, expected in zip(counts, reference):
+        observed = max(count / total, PSI_EPSILON)
+        expected = max(expected, PSI_EPSILON)
+        value += (observed - expected) * math.log(observed / expected)
+    return round(value, 4)
+
+
+def drift_level(value):
+    if value is None:
+        return None
+    return next(level for limit, level in PSI_LEVELS if value < limit)
+
+
+def reference_distribution(predictions, confidence):
+    """Baseline entry for a model: class mix and confidence histogram of its held-out predictions"""
+    from src.data.prediction_log import confidence_buckets
+
+    rows = len(predictions)
+    entry = {
+        'rows': rows,
+        'class_mix': {SENTIMENT_NAMES[code]: round(float((predictions == code).sum()) / rows, 6)
+                      for code in sorted(SENTIMENT_NAMES)},
+        'confidence_bins': CONFIDENCE_BINS,
+        'confidence_histogram': None
+    }
+    if confidence is not None:
+        histogram = [0] * CONFIDENCE_BINS
+        for bucket in confidence_buckets(confidence).tolist():
+            histogram[bucket] += 1
+        entry['confidence_histogram'] = [round(n / rows, 6) for n in histogram]
+    return entry
+
+
+def load_baseline(path=DRIFT_BASELINE_FILE):
+    """Parsed baseline file, or {} when it has not been built"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _drift(class_counts, histogram, reference):
+    """PSI of class mix and confidence histogram against a baseline entry (None without one)"""
+    if reference is None:
+        return {'class_mix': None, 'confidence': None}
+    reference_histogram = reference.get('confidence_histogram')
+    usable = reference_histogram and reference.get('confidence_bins') == CONFIDENCE_BINS and sum(histogram)
+    return {
+        'class_mix': psi([class_counts.get(sentiment, 0) for sentiment in SENTIMENTS],
+                         [reference['class_mix'].get(sentiment, 0.0) for sentiment in SENTIMENTS]),
+        'confidence': psi(histogram, reference_histogram) if usable else None
+    }
+
+
+def summarize(store, hours=24, window_seconds=300, model=None, baseline=None, registry=None):
+    """Per-model throughput, class mix, confidence histogram and PSI over the last hours,
+    overall and per window_seconds window.
+
+    Pass the model registry to flag baselines built from an older pickle.
+    """
+    now = time.time()
+    since = (now - hours * 3600) // window_seconds * window_seconds
+    baseline = load_baseline() if baseline is None else baseline
+    class_rows, bucket_rows = store.prediction_windows(since, window_seconds, model)
+
+    windows = {}  # model -> window start -> (class counts, confidence histogram)
+    for start, name, sentiment, count in class_rows:
+        counts, _ = windows.setdefault(name, {}).setdefault(start, ({}, [0] * CONFIDENCE_BINS))
+        counts[sentiment] = counts.get(sentiment, 0) + count
+    for start, name, bucket, count in bucket_rows:
+        _, histogram = windows.setdefault(name, {}).setdefault(start, ({}, [0] * CONFIDENCE_BINS))
+        histogram[bucket] += count
+
+    models = {}
+    for name, per_window in sorted(windows.items()):
+        reference = (baseline.get('models') or {}).get(name)
+        class_totals = {}
+        histogram_totals = [0] * CONFIDENCE_BINS
+        series = []
+        for start, (counts, histogram) in sorted(per_window.items()):
+            rows = sum(counts.values())
+            for sentiment, n in counts.items():
+                class_totals[sentiment] = class_totals.get(sentiment, 0) + n
+            histogram_totals = [a + b for a, b in zip(histogram_totals, histogram)]
+            window = {
+                'start': datetime.fromtimestamp(start).isoformat(),
+                'rows': rows,
+                'rows_per_sec': round(rows / window_seconds, 3),
+                'class_mix': {sentiment: round(counts.get(sentiment, 0) / rows, 4) if rows else 0.0
+                              for sentiment in SENTIMENTS}
+            }
+            if rows >= MONITOR_MIN_ROWS:
+                window['psi'] = _drift(counts, histogram, reference)
+            series.append(window)
+
+        rows = sum(class_totals.values())
+        scored = sum(histogram_totals)
+        drift = _drift(class_totals, histogram_totals, reference)
+        stale = None
+        if reference is not None and registry is not None and reference.get('version'):
+            stale = registry.version(name) != reference['version']
+        models[name] = {
+            'rows': rows,
+            'rows_per_sec': round(rows / (now - since), 4),
+            'class_mix': {sentiment: round(class_totals.get(sentiment, 0) / rows, 4) if rows else 0.0
+                          for sentiment in SENTIMENTS},
+            'confidence_histogram': histogram_totals,
+            # From bucket midpoints
+            'mean_confidence': round(sum((i + 0.5) / CONFIDENCE_BINS * n for i, n in enumerate(histogram_totals))
+                                     / scored, 4) if scored else None,
+            'psi': drift,
+            'drift': drift_level(max((v for v in drift.values() if v is not None), default=None)),
+            'reference': reference,
+            'baseline_stale': stale,
+            'windows': series
+        }
+
+    return {
+        'generated_at': datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+        'since': datetime.fromtimestamp(since).isoformat(),
+        'window_seconds': window_seconds,
+        'confidence_bins': CONFIDENCE_BINS,
+        'baseline_built_at': baseline.get('generated_at'),
+        'models': models
+    }
@@ -0,0 +1,144 @@
+"""Incremental updates of served models from new labeled reviews.
+
+Refitting TF-IDF would invalidate every model, so updates keep the served
+vectorizer: with a fitted vocabulary, unseen terms are ignored; with a
+HashingTfidfVectorizer (train_models.py --hashing) they land in hashed
+columns the models already have. IDF weights stay as fitted either way.
+
+Models that can be updated (see update_kind):
+
+* MultinomialNB   ``partial_fit`` adds the chunk's feature counts
+* SGDClassifier   ``partial_fit`` runs one SGD epoch over the chunk
+                  (``sgd_logistic``: log loss, the incremental logistic model)
+* XGBClassifier   continued training: boosting rounds fit on the chunk are
+                  appended to the existing booster
+
+The served object is never changed in place. A detached copy is updated and
+swapped in through ModelRegistry.swap, which writes the pickle atomically and
+replaces the loaded model under the registry lock: a request sees the old
+model or the new one, never a half-updated one. Other processes pick the
+pickle up on their next version check. Updates of one key are serialized
+across threads and processes by an flock on a lock file next to its pickle,
+and each update reloads the pickle inside the lock, so it always starts
+from the latest swap (whichever worker made it).
+"""
+import json
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: updates are only serialized within a process
+    fcntl = None
+
+# Boosting rounds appended per XGBoost update
+INCREMENTAL_XGB_ROUNDS = int(os.environ.get('INCREMENTAL_XGB_ROUNDS', 10))
+
+# Booster training parameters carried over to continued training
+XGB_TRAIN_PARAMS = ('eta', 'max_depth', 'subsample', 'colsample_bytree', 'min_child_weight', 'lambda', 'alpha',
+                    'gamma')
+
+_update_locks = {}
+_update_locks_lock = threading.Lock()
+
+
+def update_kind(model):
+    """'partial_fit', 'continue' (XGBoost) or None when the model cannot be updated incrementally"""
+    if type(model).__name__ == 'XGBClassifier':
+        return 'continue'
+    if hasattr(model, 'partial_fit') and hasattr(model, 'classes_'):
+        return 'partial_fit'
+    return None
+
+
+def detached_copy(model):
+    """In-memory copy of a (possibly memory-mapped, read-only) model that can be updated"""
+    return pickle.loads(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _xgb_params(booster):
+    """Objective, class count and tree parameters of a fitted booster, for xgboost.train"""
+    learner = json.loads(booster.save_config())['learner']
+    tree_params = learner['gradient_booster'].get('tree_train_param', {})
+    params = {name: tree_params[name] for name in XGB_TRAIN_PARAMS if name in tree_params}
+    params['objective'] = learner['objective']['name']
+    num_class = int(learner['learner_model_param'].get('num_class', 0))
+    if num_class > 1:
+        params['num_class'] = num_class
+    return params
+
+
+def updated_model(model, X, y, xgb_rounds=INCREMENTAL_XGB_ROUNDS):
+    """Copy of model updated with one chunk of labeled rows (the original is left untouched)"""
+    kind = update_kind(model)
+    if kind is None:
+        raise ValueError(f'{type(model).__name__} does not support incremental updates')
+    y = np.asarray(y)
+    unknown = np.setdiff1d(y, model.classes_)
+    if len(unknown):
+        raise ValueError(f'Labels {unknown.tolist()} are not classes of the model {model.classes_.tolist()}')
+
+    updated = detached_copy(model)
+    if kind == 'partial_fit':
+        updated.partial_fit(X, y, classes=model.classes_)
+        return updated
+
+    # xgboost.train rather than XGBClassifier.fit: the sklearn wrapper infers the
+    # class count from y, which breaks on chunks missing a class
+    import xgboost as xgb
+
+    booster = updated.get_booster()
+    labels = np.searchsorted(np.asarray(model.classes_), y)
+    updated._Booster = xgb.train(_xgb_params(booster), xgb.DMatrix(X, label=labels), num_boost_round=xgb_rounds,
+                                 xgb_model=booster)
+    updated.n_estimators = updated._Booster.num_boosted_rounds()
+    return updated
+
+
+def _lock(key):
+    with _update_locks_lock:
+        return _update_locks.setdefault(key, threading.Lock())
+
+
+@contextmanager
+def _update_lock(registry, key):
+    """Hold the key's update lock in this process and its flock across processes"""
+    with _lock(key):
+        # Not the pickle itself: swaps replace it with a new file
+        with open(f'{registry.path(key)}.lock', 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+
+def update_served_model(registry, key, texts, labels, xgb_rounds=INCREMENTAL_XGB_ROUNDS):
+    """Update a served model with labeled texts and swap it into the registry.
+
+    Returns the rows used and the seconds spent vectorizing, updating and swapping.
+    """
+    with _update_lock(registry, key):
+        # Start from the pickle on disk, not a copy that may predate another worker's swap
+        registry.reload(key)
+        model = registry[key]
+        if update_kind(model) is None:
+            raise ValueError(f'{key} ({type(model).__name__}) does not support incremental updates')
+        started = time.perf_counter()
+        X = registry.vectorizer.transform(texts)
+        vectorized = time.perf_counter()
+        updated = updated_model(model, X, labels, xgb_rounds)
+        fitted = time.perf_counter()
+        registry.swap(key, updated)
+        swapped = time.perf_counter()
+    return {
+        'model': key,
+        'kind': update_kind(updated),
+        'rows': len(texts),
+        'vectorize_seconds': round(vectorized - started, 4),
+        'update_seconds': round(fitted - vectorized, 4),
+        'swap_seconds': round(swapped - fitted, 4)
+    }
@@ -0,0 +1,382 @@
+"""Asynchronous batch scoring jobs backed by a local process pool.
+
+A job's texts are split into shards written under JOBS_DIR/<job_id>/inputs.
+Worker processes score one shard at a time and write results/<shard>.npz
+atomically, so finished shards survive a crash or restart. The process that
+owns a job holds an flock on its directory; any job left without a live owner
+is resumed from the shards that have no result yet.
+"""
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process claims, run a single web worker
+    fcntl = None
+
+from src.data.data_processor import PROJECT_ROOT
+
+JOBS_DIR = os.environ.get('JOBS_DIR', os.path.join(PROJECT_ROOT, 'src', 'data', 'jobs'))
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_SHARD_SIZE = int(os.environ.get('JOB_SHARD_SIZE', 5000))
+
+JOB_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+FINISHED_STATES = ('completed', 'partial', 'failed')
+
+
+def _write_json(obj, path):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(obj, f)
+    os.replace(tmp_path, path)
+
+
+def _shard_name(shard):
+    return f'{shard:05d}'
+
+
+def score_shard(job_dir, shard, model_name, dedupe=False):
+    """Worker entry point: score one input shard and write its result file.
+
+    Empty texts get prediction -1 and NaN probabilities so rows stay aligned
+    with the input. With dedupe only the first text of each near-duplicate
+    group in the shard is scored. Returns (rows scored, near-duplicate rows).
+    """
+    from src.models.registry import get_registry
+
+    registry = get_registry()
+    with open(os.path.join(job_dir, 'inputs', f'{_shard_name(shard)}.json')) as f:
+        texts = json.load(f)
+
+    model = registry[model_name]
+    keep = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
+    rows = len(keep)
+    near_duplicates = 0
+    members = None
+    if dedupe and keep:
+        from src.data.near_duplicates import NearDuplicateIndex
+
+        group_ids, is_new = NearDuplicateIndex(analyzer=registry.vectorizer.build_analyzer()).add(
+            [texts[i] for i in keep]
+        )
+        # Row of each group's first member, for every kept row
+        first = {}
+        for i, group in zip(keep, group_ids.tolist()):
+            first.setdefault(group, i)
+        members = (np.asarray(keep), np.asarray([first[group] for group in group_ids.tolist()]))
+        keep = [i for i, new in zip(keep, is_new) if new]
+        near_duplicates = rows - len(keep)
+    predictions = np.full(len(texts), -1, dtype=np.int8)
+    probabilities = np.zeros((len(texts), 0), dtype=np.float32)
+    if keep:
+        batch = [texts[i] for i in keep]
+        X = batch if getattr(model, 'accepts_text', False) else registry.vectorizer.transform(batch)
+        if hasattr(model, 'predict_proba'):
+            proba = np.asarray(model.predict_proba(X), dtype=np.float32)
+            classes = np.asarray(getattr(model, 'classes_', np.arange(proba.shape[1])))
+            predictions[keep] = classes[proba.argmax(axis=1)]
+            probabilities = np.full((len(texts), proba.shape[1]), np.nan, dtype=np.float32)
+            probabilities[keep] = proba
+        else:
+            predictions[keep] = model.predict(X)
+    if members is not None:
+        # Fan the scored rows back out to their near-duplicates
+        member_rows, sources = members
+        predictions[member_rows] = predictions[sources]
+        if probabilities.shape[1]:
+            probabilities[member_rows] = probabilities[sources]
+
+    path = os.path.join(job_dir, 'results', f'{_shard_name(shard)}.npz')
+    tmp_path = f'{path[:-4]}.tmp.npz'
+    np.savez_compressed(tmp_path, predictions=predictions, probabilities=probabilities,
+                        near_duplicates=np.int64(near_duplicates))
+    os.replace(tmp_path, path)
+
+    scored = predictions >= 0
+    if scored.any():
+        from src.data.prediction_log import get_prediction_log
+
+        prediction_log = get_prediction_log()
+        prediction_log.record('jobs', model_name, predictions[scored],
+                              probabilities[scored] if probabilities.shape[1] else None)
+        # Pool workers exit without running atexit handlers, so write it out now
+        prediction_log.flush()
+    return rows, near_duplicates
+
+
+class JobQueue:
+    """Submit/poll/fetch batch jobs scored by a per-process worker pool"""
+
+    def __init__(self, jobs_dir=JOBS_DIR, workers=JOB_WORKERS, shard_size=JOB_SHARD_SIZE):
+        self.jobs_dir = jobs_dir
+        self.workers = workers
+        self.shard_size = shard_size
+        self._lock = threading.RLock()
+        self._pool = None
+        self._pid = None
+        self._jobs = {}  # owned job id -> metadata
+        self._claims = {}  # owned job id -> open lock file
+        self._futures = {}  # owned job id -> {shard: Future}
+
+    def start(self):
+        """Create this process's worker pool and resume orphaned jobs (idempotent, fork-aware)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            os.makedirs(self.jobs_dir, exist_ok=True)
+            self._pool = None
+            self._jobs, self._claims, self._futures = {}, {}, {}
+            self._pid = os.getpid()
+            self.resume()
+
+    def shutdown(self):
+        """Stop this process's worker pool and release its jobs; unfinished shards
+        are picked up again by the next process that starts"""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            for job_id in list(self._claims):
+                self._release(job_id)
+            self._jobs = {}
+            self._pool = None
+            self._pid = None
+
+    def _executor(self):
+        """The worker pool, recreated if a worker died (e.g. OOM) and broke it"""
+        if self._pool is None or getattr(self._pool, '_broken', False):
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def _dir(self, job_id):
+        if not JOB_ID_PATTERN.fullmatch(job_id or ''):
+            raise KeyError(job_id)
+        return os.path.join(self.jobs_dir, job_id)
+
+    def _load_meta(self, job_id):
+        try:
+            with open(os.path.join(self._dir(job_id), 'job.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            raise KeyError(job_id)
+
+    def _save_meta(self, meta):
+        meta['updated_at'] = datetime.now().isoformat()
+        _write_json(meta, os.path.join(self._dir(meta['job_id']), 'job.json'))
+
+    def _claim(self, job_id):
+        """Take the job's cross-process lock; False if another live process owns it"""
+        lock_file = open(os.path.join(self._dir(job_id), 'lock'), 'w')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+        self._claims[job_id] = lock_file
+        return True
+
+    def _release(self, job_id):
+        lock_file = self._claims.pop(job_id, None)
+        if lock_file is not None:
+            lock_file.close()
+        self._futures.pop(job_id, None)
+
+    def submit(self, texts, model_name, shard_size=None, dedupe=False):
+        """Write the input shards and queue them; returns the job's metadata"""
+        self.start()
+        shard_size = max(1, shard_size or self.shard_size)
+        job_id = os.urandom(16).hex()
+        job_dir = self._dir(job_id)
+        os.makedirs(os.path.join(job_dir, 'inputs'))
+        os.makedirs(os.path.join(job_dir, 'results'))
+        shards = 0
+        for start in range(0, len(texts), shard_size):
+            _write_json(texts[start:start + shard_size], os.path.join(job_dir, 'inputs', f'{_shard_name(shards)}.json'))
+            shards += 1
+
+        meta = {
+            'job_id': job_id,
+            'model': model_name,
+            'status': 'queued',
+            'rows': len(texts),
+            'shard_size': shard_size,
+            'shards': shards,
+            'dedupe': bool(dedupe),
+            'near_duplicates': 0,  # rows answered by a near-duplicate in the same shard
+            'completed': {},  # shard -> rows scored
+            'failed': {},  # shard -> error
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None
+        }
+        with self._lock:
+            self._claim(job_id)
+            self._jobs[job_id] = meta
+            self._schedule(job_id)
+        return self.status(job_id)
+
+    def _schedule(self, job_id, shards=None):
+        """Queue the given shards (default: every shard without a result file)"""
+        meta = self._jobs[job_id]
+        job_dir = self._dir(job_id)
+        if shards is None:
+            shards = []
+            for shard in range(meta['shards']):
+                result_path = os.path.join(job_dir, 'results', f'{_shard_name(shard)}.npz')
+                if os.path.exists(result_path):
+                    if str(shard) not in meta['completed']:
+                        # Written just before a crash, never checkpointed in job.json
+                        with np.load(result_path) as result:
+                            meta['completed'][str(shard)] = int((result['predictions'] >= 0).sum())
+                            if 'near_duplicates' in result:
+                                meta['near_duplicates'] = meta.get('near_duplicates', 0) + int(result['near_duplicates'])
+                else:
+                    shards.append(shard)
+
+        if not shards:
+            self._finish(meta)
+            return
+        meta['status'] = 'running'
+        meta['finished_at'] = None
+        self._save_meta(meta)
+        futures = self._futures.setdefault(job_id, {})
+        executor = self._executor()
+        for shard in shards:
+            future = executor.submit(score_shard, job_dir, shard, meta['model'], meta.get('dedupe', False))
+            futures[shard] = future
+            future.add_done_callback(partial(self._shard_done, job_id, shard))
+
+    def _shard_done(self, job_id, shard, future):
+        with self._lock:
+            meta = self._jobs.get(job_id)
+            if meta is None or future.cancelled():
+                return
+            try:
+                rows, near_duplicates = future.result()
+            except Exception as e:
+                meta['failed'][str(shard)] = f'{type(e).__name__}: {e}'
+            else:
+                meta['completed'][str(shard)] = rows
+                meta['near_duplicates'] = meta.get('near_duplicates', 0) + near_duplicates
+                meta['failed'].pop(str(shard), None)
+            if len(meta['completed']) + len(meta['failed']) >= meta['shards']:
+                self._finish(meta)
+            else:
+                self._save_meta(meta)
+
+    def _finish(self, meta):
+        if meta['failed']:
+            meta['status'] = 'partial' if meta['completed'] else 'failed'
+        else:
+            meta['status'] = 'completed'
+        meta['finished_at'] = datetime.now().isoformat()
+        self._save_meta(meta)
+        self._release(meta['job_id'])
+        self._jobs.pop(meta['job_id'], None)
+
+    def resume(self):
+        """Pick up unfinished jobs whose owning process has gone away"""
+        self.start()
+        resumed = []
+        with self._lock:
+            for job_id in sorted(os.listdir(self.jobs_dir)):
+                if not JOB_ID_PATTERN.fullmatch(job_id) or job_id in self._jobs:
+                    continue
+                try:
+                    meta = self._load_meta(job_id)
+                except KeyError:
+                    continue
+                if meta['status'] in FINISHED_STATES or not self._claim(job_id):
+                    continue
+                meta['failed'] = {}  # every shard without a result is re-queued
+                self._jobs[job_id] = meta
+                self._schedule(job_id)
+                resumed.append(job_id)
+        return resumed
+
+    def retry(self, job_id):
+        """Re-queue a finished job's failed shards"""
+        self.start()
+        with self._lock:
+            meta = self._load_meta(job_id)
+            if meta['status'] not in FINISHED_STATES or not meta['failed']:
+                return self.status(job_id)
+            if not self._claim(job_id):
+                return self.status(job_id)
+            shards = sorted(int(shard) for shard in meta['failed'])
+            meta['failed'] = {}
+            self._jobs[job_id] = meta
+            self._schedule(job_id, shards)
+        return self.status(job_id)
+
+    def status(self, job_id):
+        """Job metadata with progress counters (raises KeyError for unknown jobs)"""
+        with self._lock:
+            meta = dict(self._jobs[job_id]) if job_id in self._jobs else self._load_meta(job_id)
+            completed = dict(meta.pop('completed'))
+            failed = dict(meta.pop('failed'))
+        meta.update({
+            'shards_done': len(completed),
+            'shards_failed': len(failed),
+            'rows_scored': sum(completed.values()),
+            'dedup_ratio': round(meta.get('near_duplicates', 0) / max(sum(completed.values()), 1), 4),
+            'progress': round(len(completed) / meta['shards'], 4) if meta['shards'] else 1.0,
+            'errors': {shard: error for shard, error in list(failed.items())[:10]}
+        })
+        return meta
+
+    def jobs(self):
+        """Status of every job on disk, newest first"""
+        if not os.path.isdir(self.jobs_dir):
+            return []
+        statuses = []
+        for job_id in os.listdir(self.jobs_dir):
+            try:
+                statuses.append(self.status(job_id))
+            except KeyError:
+                continue
+        return sorted(statuses, key=lambda meta: meta['created_at'], reverse=True)
+
+    def iter_results(self, job_id):
+        """Yield (first row index, predictions, probabilities) for each scored shard in order"""
+        meta = self.status(job_id)
+        job_dir = self._dir(job_id)
+        for shard in range(meta['shards']):
+            path = os.path.join(job_dir, 'results', f'{_shard_name(shard)}.npz')
+            if not os.path.exists(path):
+                continue
+            with np.load(path) as result:
+                yield shard * meta['shard_size'], result['predictions'], result['probabilities']
+
+    def delete(self, job_id):
+        """Cancel a job's queued shards and remove it from disk"""
+        job_dir = self._dir(job_id)
+        with self._lock:
+            for future in self._futures.get(job_id, {}).values():
+                future.cancel()
+            self._jobs.pop(job_id, None)
+            self._release(job_id)
+            if not os.path.isdir(job_dir):
+                raise KeyError(job_id)
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'shard_size': self.shard_size,
+                'active_jobs': list(self._jobs),
+                'pool_broken': bool(getattr(self._pool, '_broken', False))
+            }
@@ -0,0 +1,203 @@
+"""Array-backed scorer for the linear models (logistic regression, naive Bayes).
+
+Both model families score a TF-IDF row x with ``bias + x @ coef.T``. Because
+x_j = tf_j * idf_j / norm, each vocabulary entry can be folded into one
+precomputed row ``idf_j * coef[:, j]``; scoring a review is then a sum of the
+rows of its tokens divided by the document norm, without building a sparse
+matrix or calling into sklearn.
+
+A LinearScorer takes raw texts (``accepts_text = True``) and is saved with
+joblib, so the registry memory-maps its arrays like any other model. Built
+with dtype=np.float32 it stores and scores in single precision; quantize()
+further stores the weight rows as int8 with one scale per output.
+"""
+import numpy as np
+
+# Vectorizer settings the scorer re-creates to tokenize exactly like the vectorizer
+ANALYZER_PARAMS = (
+    'input', 'encoding', 'decode_error', 'strip_accents', 'lowercase', 'preprocessor', 'tokenizer',
+    'stop_words', 'token_pattern', 'ngram_range', 'analyzer'
+)
+
+
+class LinearScorer:
+    accepts_text = True
+
+    def __init__(self, terms, idf, weights, bias, classes, link, analyzer_params, sublinear_tf=False,
+                 binary=False, norm='l2', dtype=np.float64):
+        # Vocabulary as one UTF-8 blob plus offsets: compact and memory-mappable
+        encoded = [term.encode('utf-8') for term in terms]
+        self.term_bytes = np.frombuffer(b''.join(encoded), dtype=np.uint8).copy()
+        self.term_offsets = np.cumsum([0] + [len(term) for term in encoded], dtype=np.int64)
+        if self.term_offsets[-1] < 2 ** 31:
+            self.term_offsets = self.term_offsets.astype(np.int32)
+        self.idf = np.asarray(idf, dtype=dtype)
+        self.weights = np.ascontiguousarray(weights, dtype=dtype)  # (n_features, n_outputs)
+        self.bias = np.asarray(bias, dtype=dtype)
+        self.classes_ = np.asarray(classes)
+        self.link = link  # 'softmax', 'logistic' (binary) or 'ovr'
+        self.analyzer_params = analyzer_params
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.norm = norm
+        self.scale = None  # per-output scale of int8 weights (see quantize)
+        self._index = None
+        self._analyzer = None
+
+    @classmethod
+    def from_models(cls, vectorizer, model, dtype=np.float64):
+        """Fold a fitted TfidfVectorizer and a linear model into one scorer"""
+        vocabulary = vectorizer.vocabulary_
+        terms = [None] * len(vocabulary)
+        for term, index in vocabulary.items():
+            terms[index] = term
+
+        if getattr(vectorizer, 'use_idf', True):
+            idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+        else:
+            idf = np.ones(len(terms))
+
+        if hasattr(model, 'feature_log_prob_'):
+            # MultinomialNB: joint log likelihood, normalized with softmax
+            coef = model.feature_log_prob_
+            bias = model.class_log_prior_
+            link = 'softmax'
+        elif hasattr(model, 'coef_'):
+            coef = model.coef_
+            bias = model.intercept_
+            if coef.shape[0] == 1:
+                link = 'logistic'
+            elif getattr(model, 'multi_class', 'auto') == 'ovr':
+                link = 'ovr'
+            else:
+                link = 'softmax'
+        else:
+            raise TypeError(f'{type(model).__name__} is not a linear model')
+
+        if coef.shape[1] != len(terms):
+            raise ValueError(f'Model has {coef.shape[1]} features, vectorizer has {len(terms)}')
+
+        params = vectorizer.get_params()
+        return cls(
+            terms=terms,
+            idf=idf,
+            weights=(np.asarray(coef, dtype=np.float64) * idf).T,
+            bias=bias,
+            classes=model.classes_,
+            link=link,
+            analyzer_params={name: params[name] for name in ANALYZER_PARAMS if name in params},
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary,
+            norm=vectorizer.norm,
+            dtype=dtype
+        )
+
+    def quantize(self):
+        """Store the weights as int8, w ~= q * scale, with one scale per output column.
+
+        Under a softmax link, adding the same value to every class of a feature
+        shifts all class scores equally and leaves the probabilities unchanged,
+        so each feature row is centered first; that removes the shared part of
+        naive Bayes log probabilities and keeps only the class differences,
+        which quantize far more finely. Returns self.
+        """
+        weights = np.asarray(self.weights, dtype=np.float64)
+        if self.link == 'softmax':
+            weights = weights - weights.mean(axis=1, keepdims=True)
+        scale = np.abs(weights).max(axis=0) / 127
+        scale[scale == 0] = 1
+        self.weights = np.ascontiguousarray(np.rint(weights / scale), dtype=np.int8)
+        self.scale = scale.astype(self.idf.dtype)
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_index'] = None
+        state['_analyzer'] = None
+        return state
+
+    @property
+    def index(self):
+        """term -> feature index, rebuilt from the terms array on first use"""
+        if self._index is None:
+            blob = self.term_bytes.tobytes()
+            offsets = self.term_offsets.tolist()
+            self._index = {
+                blob[start:end].decode('utf-8'): i for i, (start, end) in enumerate(zip(offsets, offsets[1:]))
+            }
+        return self._index
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            self._analyzer = CountVectorizer(**self.analyzer_params).build_analyzer()
+        return self._analyzer
+
+    def decision_function(self, texts):
+        """Linear scores for a list of raw texts.
+
+        Token lookups run per text; the arithmetic runs once over the flattened
+        (feature, tf) pairs of all texts, reduced per row with np.add.reduceat.
+        """
+        index = self.index
+        analyzer = self.analyzer
+        features = []
+        counts = []
+        offsets = [0]
+        for text in texts:
+            row = {}
+            for token in analyzer(text):
+                j = index.get(token)
+                if j is not None:
+                    row[j] = row.get(j, 0) + 1
+            features.extend(row.keys())
+            counts.extend(row.values())
+            offsets.append(len(features))
+
+        dtype = self.idf.dtype
+        scale = getattr(self, 'scale', None)
+        scores = np.empty((len(texts), self.weights.shape[1]), dtype=dtype)
+        scores[:] = self.bias
+        if not features:
+            return scores
+
+        features = np.asarray(features, dtype=np.intp)
+        tf = np.asarray(counts, dtype=dtype)
+        if self.binary:
+            tf[:] = 1
+        elif self.sublinear_tf:
+            tf = np.log(tf) + 1
+
+        offsets = np.asarray(offsets)
+        nonempty = offsets[1:] > offsets[:-1]
+        starts = offsets[:-1][nonempty]
+        rows = self.weights[features]
+        if scale is not None:
+            rows = rows * scale
+        contributions = np.add.reduceat(tf[:, None] * rows, starts, axis=0)
+
+        tfidf = tf * self.idf[features]
+        if self.norm == 'l2':
+            norms = np.sqrt(np.add.reduceat(tfidf * tfidf, starts))
+        elif self.norm == 'l1':
+            norms = np.add.reduceat(np.abs(tfidf), starts)
+        else:
+            norms = np.ones(len(starts), dtype=tfidf.dtype)
+        scores[nonempty] += contributions / norms[:, None]
+        return scores
+
+    def predict_proba(self, texts):
+        scores = self.decision_function(texts).astype(np.float64)
+        if self.link == 'logistic':
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        if self.link == 'ovr':
+            proba = 1.0 / (1.0 + np.exp(-scores))
+            return proba / proba.sum(axis=1, keepdims=True)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict(self, texts):
+        return self.classes_[self.predict_proba(texts).argmax(axis=1)]
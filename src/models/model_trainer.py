@@ -0,0 +1,411 @@
+"""Scriptable training pipeline for the served model zoo.
+
+Replaces the notebook's ModelFactory/GridSearchCV cells. Each stage writes its
+output to a cache directory keyed on a hash of its inputs and parameters, so a
+rerun only redoes the stages whose inputs changed:
+
+1. ``load``       read the raw CSVs and map ratings to 0/1/2 sentiment labels
+2. ``vectorize``  fit the TF-IDF vectorizer and split train/test
+3. ``smote``      oversample the training matrix with SMOTE
+4. ``train``      fit every model on a process pool and write the pickles and
+                  metrics.json that the app and dashboards read
+
+Without explicit vectorizer_params, the settings of the vectorizer already in
+output_dir are reused, so a retrain keeps the served feature space.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.models.registry import COMPACT_VECTORIZER_FILE, MODEL_DIR, MODEL_FILES, VECTORIZER_FILE, dump_atomic
+from src.data.data_processor import iter_review_chunks
+from src.utils.metrics_calculator import compute_metrics, load_metrics, save_metrics
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DATA = [os.path.join(PROJECT_ROOT, 'src', 'data', 'raw', 'reviews.csv')]
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'src', 'models', 'cache')
+
+# Served model key -> (estimator spec, trained on the SMOTE-resampled matrix)
+MODEL_SPECS = {
+    'logistic_regression': ('logistic_regression', False),
+    'random_forest': ('random_forest', False),
+    'xgboost': ('xgboost', False),
+    'naive_bayes': ('naive_bayes', False),
+    'logistic_regression_smote': ('logistic_regression', True),
+    'xgboost_tuned': ('xgboost_grid', False),
+    # Logistic loss fit by SGD, so it can be updated with partial_fit (src/models/incremental.py)
+    'sgd_logistic': ('sgd_logistic', False)
+}
+
+# TfidfVectorizer settings a retrain inherits from the served vectorizer
+INHERITED_VECTORIZER_PARAMS = (
+    'lowercase', 'strip_accents', 'stop_words', 'token_pattern', 'ngram_range', 'analyzer', 'min_df', 'max_df',
+    'max_features', 'binary', 'norm', 'use_idf', 'smooth_idf', 'sublinear_tf'
+)
+
+XGB_PARAM_GRID = {
+    'n_estimators': [100, 200],
+    'learning_rate': [0.05, 0.1],
+    'max_depth': [3, 5],
+    'subsample': [0.8, 1.0],
+}
+
+
+def map_sentiment(rating):
+    """Ratings 4-5 -> Positive (2), 3 -> Neutral (1), 1-2 -> Negative (0)"""
+    if rating >= 4:
+        return 2
+    elif rating == 3:
+        return 1
+    return 0
+
+
+def _tokenizer_param(tokenizer):
+    if tokenizer is None:
+        return None
+    if getattr(tokenizer, '__module__', '').startswith('nltk') and tokenizer.__name__ == 'word_tokenize':
+        return 'nltk'
+    raise ValueError(f'Cannot reproduce tokenizer {tokenizer!r}; pass vectorizer_params explicitly')
+
+
+def served_vectorizer_params(path):
+    """vectorizer_params that rebuild the vectorizer pickled at path (its settings that
+    differ from the defaults), or {} if there is none"""
+    if not os.path.exists(path):
+        return {}
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from src.models.compact_vectorizer import HashingTfidfVectorizer
+
+    vectorizer = joblib.load(path)
+    if isinstance(vectorizer, HashingTfidfVectorizer):
+        params = dict(vectorizer.analyzer_params, hashing=vectorizer.n_features)
+        if vectorizer.sublinear_tf:
+            params['sublinear_tf'] = True
+        if vectorizer.norm != 'l2':
+            params['norm'] = vectorizer.norm
+    elif isinstance(vectorizer, TfidfVectorizer):
+        defaults = TfidfVectorizer().get_params()
+        current = vectorizer.get_params()
+        params = {name: current[name] for name in INHERITED_VECTORIZER_PARAMS if current[name] != defaults[name]}
+        params['tokenizer'] = vectorizer.tokenizer
+        if vectorizer.preprocessor is not None:
+            raise ValueError(f'Cannot reproduce the preprocessor of {path}; pass vectorizer_params explicitly')
+    else:
+        raise ValueError(f'Cannot read settings from {type(vectorizer).__name__}; pass vectorizer_params explicitly')
+
+    tokenizer = _tokenizer_param(params.pop('tokenizer', None))
+    if tokenizer:
+        params['tokenizer'] = tokenizer
+    return params
+
+
+def build_estimator(spec, random_state=42):
+    if spec == 'logistic_regression':
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=1000, random_state=random_state)
+    if spec == 'sgd_logistic':
+        from sklearn.linear_model import SGDClassifier
+        return SGDClassifier(loss='log_loss', alpha=1e-5, max_iter=50, tol=1e-4, random_state=random_state)
+    if spec == 'random_forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(n_estimators=100, random_state=random_state, n_jobs=1)
+    if spec == 'naive_bayes':
+        from sklearn.naive_bayes import MultinomialNB
+        return MultinomialNB()
+    if spec == 'xgboost':
+        from xgboost import XGBClassifier
+        return XGBClassifier(eval_metric='mlogloss', random_state=random_state, n_jobs=1)
+    if spec == 'xgboost_grid':
+        from sklearn.model_selection import GridSearchCV
+        from xgboost import XGBClassifier
+        return GridSearchCV(
+            XGBClassifier(objective='multi:softprob', eval_metric='mlogloss', random_state=random_state, n_jobs=1),
+            XGB_PARAM_GRID, cv=2, scoring='accuracy', n_jobs=1
+        )
+    raise ValueError(f'Unknown estimator spec: {spec}')
+
+
+def _hash(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fit_model(key, spec, train_dir, test_dir, output_path, random_state):
+    """Process-pool worker: fit one model from cached matrices and save it"""
+    import scipy.sparse as sp
+
+    X_train = sp.load_npz(os.path.join(train_dir, 'X.npz'))
+    y_train = np.load(os.path.join(train_dir, 'y.npy'))
+    X_test = sp.load_npz(os.path.join(test_dir, 'X_test.npz'))
+    y_test = np.load(os.path.join(test_dir, 'y_test.npy'))
+
+    estimator = build_estimator(spec, random_state)
+    started = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    params = None
+    if hasattr(estimator, 'best_estimator_'):
+        params = estimator.best_params_
+        estimator = estimator.best_estimator_
+
+    results = {'fit_seconds': round(fit_seconds, 3), 'best_params': params}
+    for split, X, y in (('train', X_train, y_train), ('test', X_test, y_test)):
+        proba = estimator.predict_proba(X) if hasattr(estimator, 'predict_proba') else None
+        results[split] = compute_metrics(y, estimator.predict(X), proba)
+
+    dump_atomic(estimator, output_path)
+    return key, results
+
+
+class ModelTrainer:
+    """Cached, parallel training pipeline; see the module docstring for the stages"""
+
+    def __init__(self, data_paths=None, output_dir=MODEL_DIR, cache_dir=CACHE_DIR, n_jobs=None,
+                 vectorizer_params=None, test_size=0.2, random_state=42, force=False, verbose=True):
+        self.data_paths = list(data_paths or DEFAULT_DATA)
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        # None: read from output_dir's vectorizer when vectorize() runs
+        self.vectorizer_params = None if vectorizer_params is None else dict(vectorizer_params)
+        self.test_size = test_size
+        self.random_state = random_state
+        self.force = force
+        self.verbose = verbose
+        self.timings = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def log(self, message):
+        if self.verbose:
+            print(message, flush=True)
+
+    def _stage_dir(self, stage, key):
+        return os.path.join(self.cache_dir, f'{stage}-{key}')
+
+    def _cached(self, path):
+        return not self.force and os.path.exists(os.path.join(path, 'done'))
+
+    def _mark_done(self, path):
+        open(os.path.join(path, 'done'), 'w').close()
+
+    def load_data(self):
+        # CSVs or ingested Parquet/Arrow files (scripts/ingest_reviews.py)
+        frames = list(iter_review_chunks(self.data_paths, usecols=['reviews_text', 'reviews_rating']))
+        df = pd.concat(frames, ignore_index=True).dropna(subset=['reviews_rating'])
+        texts = df['reviews_text'].fillna('').astype(str).tolist()
+        labels = df['reviews_rating'].astype(float).map(map_sentiment).to_numpy(dtype=np.int64)
+        return texts, labels
+
+    def split(self):
+        """(train_texts, train_labels, test_texts, test_labels): the same rows vectorize() trains
+        on and holds out"""
+        from sklearn.model_selection import train_test_split
+
+        texts, labels = self.load_data()
+        train_texts, test_texts, train_labels, test_labels = train_test_split(
+            texts, labels, test_size=self.test_size, random_state=self.random_state
+        )
+        return train_texts, np.asarray(train_labels), test_texts, np.asarray(test_labels)
+
+    def held_out_split(self):
+        """(texts, labels) of the test split the trained models are evaluated on"""
+        _, _, texts, labels = self.split()
+        return texts, labels
+
+    def vectorize(self):
+        """Fit the vectorizer and split train/test (cached on data hash + params)"""
+        import scipy.sparse as sp
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.model_selection import train_test_split
+
+        if self.vectorizer_params is None:
+            self.vectorizer_params = served_vectorizer_params(os.path.join(self.output_dir, VECTORIZER_FILE))
+        data_key = [_file_digest(path) for path in self.data_paths]
+        key = _hash(data_key, self.vectorizer_params, self.test_size, self.random_state)
+        stage_dir = self._stage_dir('vectorize', key)
+        if self._cached(stage_dir):
+            self.log(f'[vectorize] cached ({key})')
+            return key, stage_dir
+
+        started = time.perf_counter()
+        os.makedirs(stage_dir, exist_ok=True)
+        texts, labels = self.load_data()
+        params = dict(self.vectorizer_params)
+        if params.pop('tokenizer', None) == 'nltk':
+            from nltk.tokenize import word_tokenize
+            params['tokenizer'] = word_tokenize
+        hashing = params.pop('hashing', None)
+        if hashing:
+            from src.models.compact_vectorizer import HashingTfidfVectorizer
+            vectorizer = HashingTfidfVectorizer(n_features=hashing, **params)
+        else:
+            vectorizer = TfidfVectorizer(**params)
+        X = vectorizer.fit_transform(texts)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, labels, test_size=self.test_size, random_state=self.random_state
+        )
+        sp.save_npz(os.path.join(stage_dir, 'X.npz'), X_train)
+        np.save(os.path.join(stage_dir, 'y.npy'), y_train)
+        sp.save_npz(os.path.join(stage_dir, 'X_test.npz'), X_test)
+        np.save(os.path.join(stage_dir, 'y_test.npy'), y_test)
+        joblib.dump(vectorizer, os.path.join(stage_dir, VECTORIZER_FILE))
+        self._mark_done(stage_dir)
+        self.timings['vectorize'] = round(time.perf_counter() - started, 3)
+        self.log(f'[vectorize] {X.shape[0]} rows x {X.shape[1]} features in {self.timings["vectorize"]}s')
+        return key, stage_dir
+
+    def smote(self, vectorize_key, vectorize_dir):
+        """SMOTE-resample the training matrix (cached on the vectorize key)"""
+        import scipy.sparse as sp
+
+        key = _hash(vectorize_key, 'smote', self.random_state)
+        stage_dir = self._stage_dir('smote', key)
+        if self._cached(stage_dir):
+            self.log(f'[smote] cached ({key})')
+            return key, stage_dir
+
+        from imblearn.over_sampling import SMOTE
+
+        started = time.perf_counter()
+        os.makedirs(stage_dir, exist_ok=True)
+        X_train = sp.load_npz(os.path.join(vectorize_dir, 'X.npz'))
+        y_train = np.load(os.path.join(vectorize_dir, 'y.npy'))
+        X_smote, y_smote = SMOTE(random_state=self.random_state).fit_resample(X_train, y_train)
+        sp.save_npz(os.path.join(stage_dir, 'X.npz'), sp.csr_matrix(X_smote))
+        np.save(os.path.join(stage_dir, 'y.npy'), np.asarray(y_smote))
+        self._mark_done(stage_dir)
+        self.timings['smote'] = round(time.perf_counter() - started, 3)
+        self.log(f'[smote] {X_train.shape[0]} -> {X_smote.shape[0]} rows in {self.timings["smote"]}s')
+        return key, stage_dir
+
+    def _load_stamps(self):
+        try:
+            with open(os.path.join(self.cache_dir, 'stamps.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_stamps(self, stamps):
+        with open(os.path.join(self.cache_dir, 'stamps.json'), 'w') as f:
+            json.dump(stamps, f, indent=2)
+
+    def train(self, model_keys=None):
+        """Run every stage and train the requested models in parallel.
+
+        When the vectorizer changes, the other models with a pickle in
+        output_dir are retrained too, so none is left on the old feature space.
+        The refit models are staged and moved into output_dir together with the
+        new vectorizer once all of them are fit, so a serving process never
+        pairs a model with a vectorizer it was not fit on for longer than the
+        final renames.
+        """
+        model_keys = list(model_keys or MODEL_SPECS)
+        unknown = [key for key in model_keys if key not in MODEL_SPECS]
+        if unknown:
+            raise ValueError(f'Unknown models: {", ".join(unknown)}')
+
+        started = time.perf_counter()
+        vectorize_key, vectorize_dir = self.vectorize()
+
+        # The served vectorizer must match the matrices the models were fit on
+        vectorizer_path = os.path.join(self.output_dir, VECTORIZER_FILE)
+        stamps = self._load_stamps()
+        replace_vectorizer = (self.force or stamps.get('vectorizer') != vectorize_key
+                              or not os.path.exists(vectorizer_path))
+        if replace_vectorizer:
+            # Every model pickle in output_dir was fit on the old feature space
+            stale = [key for key in MODEL_SPECS if key not in model_keys
+                     and os.path.exists(os.path.join(self.output_dir, MODEL_FILES[key]))]
+            if stale:
+                self.log(f'[train] vectorizer changed, also retraining {", ".join(stale)}')
+                model_keys += stale
+
+        smote_key = smote_dir = None
+        if any(MODEL_SPECS[key][1] for key in model_keys):
+            smote_key, smote_dir = self.smote(vectorize_key, vectorize_dir)
+
+        staging_dir = None
+        if replace_vectorizer:
+            staging_dir = os.path.join(self.output_dir, '.staging')
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            os.makedirs(staging_dir)
+
+        previous = load_metrics(os.path.join(self.output_dir, 'metrics.json')) or {}
+        results = {key: value for key, value in previous.get('models', {}).items() if key in MODEL_SPECS}
+
+        jobs = {}
+        for key in model_keys:
+            spec, uses_smote = MODEL_SPECS[key]
+            stamp = _hash(smote_key if uses_smote else vectorize_key, spec, self.random_state)
+            output_path = os.path.join(self.output_dir, MODEL_FILES[key])
+            if not self.force and stamps.get(key) == stamp and os.path.exists(output_path) and key in results:
+                self.log(f'[train] {key}: up to date')
+                continue
+            train_dir = smote_dir if uses_smote else vectorize_dir
+            fit_path = os.path.join(staging_dir, MODEL_FILES[key]) if staging_dir else output_path
+            jobs[key] = (stamp, output_path, (key, spec, train_dir, vectorize_dir, fit_path, self.random_state))
+
+        if jobs:
+            workers = min(self.n_jobs, len(jobs))
+            self.log(f'[train] fitting {len(jobs)} models on {workers} processes')
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_fit_model, *args): key for key, (_, _, args) in jobs.items()}
+                for future in as_completed(futures):
+                    key, result = future.result()
+                    results[key] = result
+                    if staging_dir is None:
+                        stamps[key] = jobs[key][0]
+                        self._save_stamps(stamps)
+                    self.log(f'[train] {key}: test accuracy {result["test"]["Accuracy"]} '
+                             f'({result["fit_seconds"]}s)')
+
+        if staging_dir is not None:
+            # Publish the models first and the vectorizer they were fit with last
+            staged_vectorizer = os.path.join(staging_dir, VECTORIZER_FILE)
+            dump_atomic(joblib.load(os.path.join(vectorize_dir, VECTORIZER_FILE)), staged_vectorizer)
+            for key, (stamp, output_path, args) in jobs.items():
+                os.replace(args[4], output_path)
+                stamps[key] = stamp
+            os.replace(staged_vectorizer, vectorizer_path)
+            stamps['vectorizer'] = vectorize_key
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            # The pruned copy indexes the old vocabulary; the registry falls back to
+            # vectorizer.pkl until scripts/compact_vectorizer.py is rerun
+            compact_path = os.path.join(self.output_dir, COMPACT_VECTORIZER_FILE)
+            if os.path.exists(compact_path):
+                os.remove(compact_path)
+                self.log(f'[train] removed the stale {COMPACT_VECTORIZER_FILE}')
+        self._save_stamps(stamps)
+
+        self.timings['total'] = round(time.perf_counter() - started, 3)
+        metrics = {
+            'generated_at': pd.Timestamp.now().isoformat(),
+            'vectorizer': {'key': vectorize_key, 'params': self.vectorizer_params},
+            'timings': self.timings,
+            'models': results
+        }
+        save_metrics(metrics, os.path.join(self.output_dir, 'metrics.json'))
+        return metrics
+
+    @staticmethod
+    def save_model(model, path):
+        dump_atomic(model, path)
@@ -0,0 +1,162 @@
+"""Content-addressed prediction cache with an in-memory LRU/TTL tier and an
+optional SQLite tier that survives restarts.
+
+Keys hash the normalized text together with the model name and the versions of
+the files the prediction depends on (the model, a cascade's tiers and the
+vectorizer), so replacing a pickle in ``trained_models/`` invalidates every
+prediction made with the old file.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+PREDICTION_CACHE_TTL = float(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+PREDICTION_CACHE_DB = os.environ.get('PREDICTION_CACHE_DB')
+
+
+def normalize_text(text, analyzer=None):
+    """Reduce text to a form that maps to the same feature vector.
+
+    With the vectorizer's analyzer the key is the sorted bag of its tokens, so
+    texts differing only in case, punctuation, spacing or word order (all of
+    which TF-IDF ignores) share an entry. Without one, case and whitespace are
+    normalized.
+    """
+    if analyzer is not None:
+        return ' '.join(sorted(analyzer(text)))
+    return ' '.join(text.lower().split())
+
+
+def cache_key(normalized, model_name, model_version):
+    digest = hashlib.sha1()
+    digest.update(f'{model_name}\0{model_version}\0'.encode('utf-8'))
+    digest.update(normalized.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """Two-tier cache of (prediction, probabilities) keyed by cache_key()"""
+
+    def __init__(self, max_entries=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL, db_path=PREDICTION_CACHE_DB):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._versions = {}  # model name -> last seen version
+        self._lock = threading.Lock()
+        self.db_path = db_path
+        self._conn = None
+        self._conn_pid = None
+        self.counters = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    @property
+    def _db(self):
+        """Per-process SQLite connection (None without a disk tier), opened lazily"""
+        if not self.db_path:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS predictions ('
+                'key TEXT PRIMARY KEY, model TEXT, version TEXT, value TEXT, expires_at REAL)'
+            )
+            self._conn.commit()
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def check_version(self, model_name, model_version):
+        """Drop entries made with an older file of this model"""
+        with self._lock:
+            previous = self._versions.get(model_name)
+            self._versions[model_name] = model_version
+            if previous is None or previous == model_version:
+                return
+            self.counters['invalidations'] += 1
+            # Memory entries become unreachable (their key embeds the version)
+            # and age out of the LRU; disk rows are purged eagerly.
+            if self._db is not None:
+                self._db.execute(
+                    'DELETE FROM predictions WHERE model = ? AND version != ?', (model_name, model_version)
+                )
+                self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.counters['hits'] += 1
+                    return value
+                del self._entries[key]
+                self.counters['expirations'] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, expires_at FROM predictions WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    value = tuple(json.loads(row[0]))
+                    self._store(key, value, row[1])
+                    self.counters['disk_hits'] += 1
+                    return value
+
+            self.counters['misses'] += 1
+            return None
+
+    def put(self, key, value, model_name=None, model_version=None):
+        self.put_many([(key, value)], model_name, model_version)
+
+    def put_many(self, items, model_name=None, model_version=None):
+        """Store (key, value) pairs, writing the disk tier in one transaction"""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            for key, value in items:
+                self._store(key, value, expires_at)
+            if self._db is not None:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)',
+                    [(key, model_name, model_version, json.dumps(value), expires_at) for key, value in items]
+                )
+                self._db.commit()
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM predictions')
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['disk_hits'] + self.counters['misses']
+            hits = self.counters['hits'] + self.counters['disk_hits']
+            return dict(
+                self.counters,
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl,
+                disk_tier=bool(self.db_path),
+                hit_rate=round(hits / lookups, 4) if lookups else 0.0
+            )
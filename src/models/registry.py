@@ -0,0 +1,319 @@
+"""Lazy, shared model registry used by the Flask app and the dashboards.
+
+Models are loaded on first use with ``joblib.load(..., mmap_mode='r')`` so the
+numpy arrays inside the pickles are backed by the page cache and shared across
+pre-forked workers. Models that have not been used recently are evicted when
+the private (non memory-mapped) footprint exceeds the configured budget.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import joblib
+import numpy as np
+
+MODEL_DIR = os.environ.get(
+    'MODEL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trained_models')
+)
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get('MODEL_MEMORY_BUDGET_MB', 512))
+# How often (seconds) a pickle's mtime/size is re-checked for changes
+MODEL_RELOAD_CHECK_SECONDS = float(os.environ.get('MODEL_RELOAD_CHECK_SECONDS', 2))
+
+VECTORIZER_FILE = 'vectorizer.pkl'
+COMPACT_VECTORIZER_FILE = 'vectorizer_compact.pkl'
+# Vectorizer pickle the registry serves; set VECTORIZER_FILE=vectorizer_compact.pkl
+# to use the pruned one written by scripts/compact_vectorizer.py (vectorizer.pkl
+# is served instead while it is missing, e.g. after a retrain deleted it)
+SERVED_VECTORIZER_FILE = os.environ.get('VECTORIZER_FILE', VECTORIZER_FILE)
+
+# Served model keys and their pickles in MODEL_DIR
+MODEL_FILES = {
+    'logistic_regression': 'sentiment_LogisticRegression.pkl',
+    'random_forest': 'sentiment_RandomForest.pkl',
+    'xgboost': 'sentiment_XGBoost.pkl',
+    'naive_bayes': 'sentiment_NaiveBayes.pkl',
+    'logistic_regression_smote': 'sentiment_lr_smote.pkl',
+    'xgboost_tuned': 'xgboost_tuned.pkl',
+    'sgd_logistic': 'sentiment_SGDLogistic.pkl',
+    # Array-backed linear scorers written by scripts/export_linear_scorer.py
+    'logistic_regression_linear': 'linear_LogisticRegression.pkl',
+    'logistic_regression_smote_linear': 'linear_lr_smote.pkl',
+    'naive_bayes_linear': 'linear_NaiveBayes.pkl',
+    # Confidence-gated cascade written by scripts/build_cascade.py
+    'cascade': 'cascade.pkl',
+    # Reduced-precision and pruned variants written by scripts/export_quantized_models.py
+    'logistic_regression_f32': 'f32_LogisticRegression.pkl',
+    'logistic_regression_int8': 'int8_LogisticRegression.pkl',
+    'logistic_regression_smote_f32': 'f32_lr_smote.pkl',
+    'logistic_regression_smote_int8': 'int8_lr_smote.pkl',
+    'naive_bayes_f32': 'f32_NaiveBayes.pkl',
+    'naive_bayes_int8': 'int8_NaiveBayes.pkl',
+    'xgboost_pruned': 'pruned_XGBoost.pkl',
+    'xgboost_tuned_pruned': 'pruned_xgboost_tuned.pkl'
+}
+
+# Variant key -> (source key, kind) for the keys above that re-package another model
+MODEL_VARIANTS = {
+    'logistic_regression_f32': ('logistic_regression', 'float32'),
+    'logistic_regression_int8': ('logistic_regression', 'int8'),
+    'logistic_regression_smote_f32': ('logistic_regression_smote', 'float32'),
+    'logistic_regression_smote_int8': ('logistic_regression_smote', 'int8'),
+    'naive_bayes_f32': ('naive_bayes', 'float32'),
+    'naive_bayes_int8': ('naive_bayes', 'int8'),
+    'xgboost_pruned': ('xgboost', 'pruned'),
+    'xgboost_tuned_pruned': ('xgboost_tuned', 'pruned')
+}
+
+
+def dump_atomic(obj, path):
+    """Write a pickle next to its destination and rename it into place, so a
+    running registry never reads a half-written file"""
+    tmp_path = f'{path}.tmp'
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _measure(obj, seen=None, depth=0):
+    """Return (private_bytes, mmap_bytes) of the numpy arrays reachable from obj"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or depth > 6:
+        return 0, 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        if isinstance(obj, np.memmap) or isinstance(obj.base, np.memmap):
+            return 0, obj.nbytes
+        if obj.dtype == object:
+            private, mapped = obj.nbytes, 0
+            for item in obj.ravel():
+                p, m = _measure(item, seen, depth + 1)
+                private += p
+                mapped += m
+            return private, mapped
+        return obj.nbytes, 0
+
+    if isinstance(obj, dict):
+        children = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        children = obj
+    elif hasattr(obj, '__dict__'):
+        children = vars(obj).values()
+    else:
+        return 0, 0
+
+    private = mapped = 0
+    for child in children:
+        p, m = _measure(child, seen, depth + 1)
+        private += p
+        mapped += m
+    return private, mapped
+
+
+class ModelRegistry(Mapping):
+    """Read-only mapping of model key -> fitted model, loaded on first access"""
+
+    def __init__(self, model_dir=MODEL_DIR, model_files=None, memory_budget_mb=MODEL_MEMORY_BUDGET_MB,
+                 mmap_mode='r'):
+        self.model_dir = model_dir
+        self.model_files = dict(MODEL_FILES if model_files is None else model_files)
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.mmap_mode = mmap_mode
+        self._loaded = OrderedDict()  # key -> model, least recently used first
+        self._stats = {}
+        self._vectorizer = None
+        self._versions = {}  # key -> (version, checked_at)
+        self._lock = threading.RLock()
+
+    def path(self, key):
+        if key != 'vectorizer':
+            return os.path.join(self.model_dir, self.model_files[key])
+        path = os.path.join(self.model_dir, SERVED_VECTORIZER_FILE)
+        if SERVED_VECTORIZER_FILE != VECTORIZER_FILE and not os.path.exists(path):
+            # Retraining deletes the compact vectorizer it made stale: serve the full one
+            path = os.path.join(self.model_dir, VECTORIZER_FILE)
+        return path
+
+    def version(self, key):
+        """File version (mtime and size) of a model's pickle, re-checked periodically"""
+        now = time.monotonic()
+        cached = self._versions.get(key)
+        if cached is not None and now - cached[1] < MODEL_RELOAD_CHECK_SECONDS:
+            return cached[0]
+        try:
+            stat = os.stat(self.path(key))
+            version = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+        except OSError:
+            version = 'missing'
+        self._versions[key] = (version, now)
+        return version
+
+    def register(self, key, filename):
+        """Add (or replace) a model key backed by a pickle in model_dir"""
+        with self._lock:
+            self.model_files[key] = filename
+            self._versions.pop(key, None)
+            self.unload(key)
+
+    def swap(self, key, model):
+        """Replace a served model without a restart: write its pickle atomically and install
+        the object in this process at once (other processes reload the file on their next
+        version check). Requests see either the old model or the new one."""
+        path = self.path(key)
+        dump_atomic(model, path)
+        with self._lock:
+            self._versions.pop(key, None)
+            private, mapped = _measure(model)
+            file_bytes = os.path.getsize(path)
+            stats = self._stats.setdefault(key, {'loads': 0, 'hits': 0})
+            stats.pop('error', None)
+            stats.update({
+                'loaded': True,
+                'swaps': stats.get('swaps', 0) + 1,
+                'resident_bytes': private + mapped or file_bytes,
+                'mmap_bytes': 0,
+                'file_bytes': file_bytes,
+                'file': os.path.basename(path),
+                'version': self.version(key)
+            })
+            self._loaded.pop(key, None)
+            self._loaded[key] = model
+            self._evict(keep=key)
+
+    def reload(self, key):
+        """Drop a loaded model and its cached version, so the next access reads the pickle again"""
+        with self._lock:
+            self._versions.pop(key, None)
+            self.unload(key)
+
+    def unload(self, key):
+        with self._lock:
+            self._loaded.pop(key, None)
+            if key in self._stats:
+                self._stats[key]['loaded'] = False
+
+    def _load(self, key):
+        path = self.path(key)
+        started = time.perf_counter()
+        try:
+            obj = joblib.load(path, mmap_mode=self.mmap_mode)
+        except ValueError:
+            # Compressed pickles cannot be memory-mapped
+            obj = joblib.load(path)
+        load_time = time.perf_counter() - started
+
+        private, mapped = _measure(obj)
+        file_bytes = os.path.getsize(path)
+        version = self.version(key)
+        if private + mapped == 0:
+            # Opaque native objects (e.g. XGBoost boosters): use the pickle size
+            private = file_bytes
+
+        stats = self._stats.setdefault(key, {'loads': 0, 'hits': 0})
+        stats.pop('error', None)
+        stats.update({
+            'loaded': True,
+            'loads': stats['loads'] + 1,
+            'load_time_ms': round(load_time * 1000, 3),
+            'resident_bytes': private,
+            'mmap_bytes': mapped,
+            'file_bytes': file_bytes,
+            'file': os.path.basename(path),
+            'version': version
+        })
+        return obj
+
+    def _is_stale(self, key):
+        return self._stats[key].get('version') != self.version(key)
+
+    @property
+    def vectorizer(self):
+        """Shared vectorizer, pinned (never evicted) and reloaded when its file changes"""
+        if self._vectorizer is None or self._is_stale('vectorizer'):
+            with self._lock:
+                if self._vectorizer is None or self._is_stale('vectorizer'):
+                    self._vectorizer = self._load('vectorizer')
+        self._stats['vectorizer']['hits'] += 1
+        return self._vectorizer
+
+    def __getitem__(self, key):
+        if key not in self.model_files:
+            raise KeyError(key)
+        with self._lock:
+            if key in self._loaded and not self._is_stale(key):
+                self._loaded.move_to_end(key)
+            else:
+                self._loaded.pop(key, None)
+                self._loaded[key] = self._load(key)
+                self._evict(keep=key)
+            stats = self._stats[key]
+            stats['hits'] += 1
+            stats['last_used'] = time.time()
+            return self._loaded[key]
+
+    def _evict(self, keep):
+        """Drop least recently used models until the private footprint fits the budget"""
+        while self.resident_bytes() > self.memory_budget:
+            victim = next((key for key in self._loaded if key != keep), None)
+            if victim is None:
+                break
+            self.unload(victim)
+            self._stats[victim]['evictions'] = self._stats[victim].get('evictions', 0) + 1
+
+    def resident_bytes(self):
+        return sum(self._stats[key]['resident_bytes'] for key in self._loaded)
+
+    def __contains__(self, key):
+        return key in self.model_files and os.path.exists(self.path(key))
+
+    def __iter__(self):
+        return (key for key in self.model_files if key in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def is_loaded(self, key):
+        return key in self._loaded
+
+    def preload(self, keys=None):
+        """Eagerly load the vectorizer and the given models (all by default)
+
+        Returns seconds spent per key; a model that fails to load is recorded
+        in stats() with its error instead of aborting the warm start.
+        """
+        timings = {}
+        for key in ['vectorizer'] + (list(self) if keys is None else list(keys)):
+            started = time.perf_counter()
+            try:
+                self.vectorizer if key == 'vectorizer' else self[key]
+            except Exception as e:
+                with self._lock:
+                    self._stats.setdefault(key, {'loads': 0, 'hits': 0})['error'] = str(e)
+                continue
+            timings[key] = time.perf_counter() - started
+        return timings
+
+    def stats(self):
+        with self._lock:
+            return {
+                'memory_budget_bytes': self.memory_budget,
+                'resident_bytes': self.resident_bytes(),
+                'loaded_models': list(self._loaded),
+                'models': {key: dict(stats) for key, stats in self._stats.items()}
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide registry shared by every front end"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
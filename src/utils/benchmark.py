@@ -0,0 +1,161 @@
+"""Latency/throughput benchmarks for the served models and the benchmarks.json
+file the dashboards read next to metrics.json."""
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BENCHMARK_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'trained_models', 'benchmarks.json'
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def current_rss_bytes():
+    """Resident set size of this process right now (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def score(model, vectorizer, texts):
+    """Score texts the way the web app does: vectorize (unless the model takes text) then predict_proba"""
+    features = texts if getattr(model, 'accepts_text', False) else vectorizer.transform(texts)
+    if hasattr(model, 'predict_proba'):
+        return model.predict_proba(features)
+    return model.predict(features)
+
+
+def summarize(latencies, rows, elapsed):
+    """Percentile latencies (ms) and throughput for one benchmark mode"""
+    latencies = np.asarray(latencies) * 1000
+    summary = {f'p{p}_ms': round(float(np.percentile(latencies, p)), 3) for p in PERCENTILES}
+    summary.update({
+        'mean_ms': round(float(latencies.mean()), 3),
+        'calls': int(latencies.size),
+        'rows': rows,
+        'rows_per_sec': round(rows / elapsed, 1) if elapsed else None
+    })
+    return summary
+
+
+def run_single(model, vectorizer, texts):
+    """One request per review, back to back"""
+    latencies = []
+    started = time.perf_counter()
+    for text in texts:
+        call_started = time.perf_counter()
+        score(model, vectorizer, [text])
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, len(texts), time.perf_counter() - started)
+
+
+def run_batched(model, vectorizer, texts, batch_size):
+    """The reviews in batch_size chunks, as /api/batch_predict scores them"""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        call_started = time.perf_counter()
+        score(model, vectorizer, texts[i:i + batch_size])
+        latencies.append(time.perf_counter() - call_started)
+    summary = summarize(latencies, len(texts), time.perf_counter() - started)
+    summary['batch_size'] = batch_size
+    return summary
+
+
+def run_concurrent(model, vectorizer, texts, concurrency):
+    """Single-review requests from concurrency threads sharing one model"""
+    latencies = []
+    lock = threading.Lock()
+
+    def call(text):
+        call_started = time.perf_counter()
+        score(model, vectorizer, [text])
+        elapsed = time.perf_counter() - call_started
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, texts))
+    summary = summarize(latencies, len(texts), time.perf_counter() - started)
+    summary['concurrency'] = concurrency
+    return summary
+
+
+def benchmark_model(registry, key, texts, batch_size=256, concurrency=8, warmup=20):
+    """Run every mode against one registry model; returns its benchmarks.json entry"""
+    vectorizer = registry.vectorizer
+    rss_before = peak_rss_bytes()
+    current_before = current_rss_bytes()
+    model = registry[key]
+    score(model, vectorizer, texts[:warmup] or texts)
+
+    result = {
+        'single': run_single(model, vectorizer, texts),
+        'batched': run_batched(model, vectorizer, texts, batch_size),
+        'concurrent': run_concurrent(model, vectorizer, texts, concurrency)
+    }
+    stats = registry.stats()['models'][key]
+    result.update({
+        'peak_rss_bytes': peak_rss_bytes(),
+        'peak_rss_delta_bytes': peak_rss_bytes() - rss_before,
+        'rss_delta_bytes': current_rss_bytes() - current_before,
+        'model_file_bytes': stats['file_bytes'],
+        'model_resident_bytes': stats['resident_bytes'],
+        'model_mmap_bytes': stats['mmap_bytes'],
+        'load_time_ms': stats['load_time_ms']
+    })
+    return result
+
+
+def load_benchmarks(path=BENCHMARK_FILE):
+    """Return the parsed benchmarks.json, or None when it has not been generated"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_benchmarks(benchmarks, path=BENCHMARK_FILE):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(benchmarks, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def benchmark_rows(benchmarks=None, path=BENCHMARK_FILE):
+    """Flat per-model rows for plotting: one dict per benchmarked model"""
+    benchmarks = load_benchmarks(path) if benchmarks is None else benchmarks
+    if not benchmarks or not benchmarks.get('models'):
+        return []
+    rows = []
+    for key, result in benchmarks['models'].items():
+        if 'error' in result:
+            continue
+        rows.append({
+            'model': key,
+            'single_p50_ms': result['single']['p50_ms'],
+            'single_p95_ms': result['single']['p95_ms'],
+            'single_p99_ms': result['single']['p99_ms'],
+            'concurrent_p95_ms': result['concurrent']['p95_ms'],
+            'batched_rows_per_sec': result['batched']['rows_per_sec'],
+            'peak_rss_mb': round(result['peak_rss_bytes'] / 2 ** 20, 1),
+            'model_size_mb': round(result['model_file_bytes'] / 2 ** 20, 2)
+        })
+    return rows
@@ -0,0 +1,126 @@
+"""Memoized figure builders shared by the Dash dashboards.
+
+Results are cached per builder and arguments together with the version
+(mtime and size) of the files the builder reads, so rewriting metrics.json or
+benchmarks.json invalidates exactly the figures built from it. Plotly figures
+are stored as plain dicts, which Dash serializes without rebuilding them, and
+can be saved to FIGURE_CACHE_FILE: scripts/build_dashboard_assets.py
+precomputes every static figure that way and the dashboards load the file at
+start-up. The same script writes DASHBOARD_AGGREGATES_FILE, the summaries the
+analytics dashboard renders instead of reading raw CSVs.
+"""
+import functools
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from src.data.data_processor import PROCESSED_DIR
+
+FIGURE_CACHE_FILE = os.environ.get('FIGURE_CACHE_FILE', os.path.join(PROCESSED_DIR, 'dashboard_figures.json'))
+DASHBOARD_AGGREGATES_FILE = os.environ.get(
+    'DASHBOARD_AGGREGATES_FILE', os.path.join(PROCESSED_DIR, 'dashboard_aggregates.json')
+)
+FIGURE_CACHE_SIZE = int(os.environ.get('FIGURE_CACHE_SIZE', 512))
+
+
+def load_aggregates(path=DASHBOARD_AGGREGATES_FILE):
+    """Parsed aggregates file, or None when it has not been built"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def file_version(*paths):
+    """Change token for a set of source files ('missing' for absent ones)"""
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+        except OSError:
+            parts.append('missing')
+    return '|'.join(parts)
+
+
+class FigureCache:
+    """LRU of builder results keyed on (builder, args), invalidated by source file versions"""
+
+    def __init__(self, path=FIGURE_CACHE_FILE, max_entries=FIGURE_CACHE_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (source version, value, persist)
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'loaded': 0}
+
+    def memoize(self, *sources, persist=True):
+        """Decorator caching a builder until any of the source files changes.
+
+        Figures are written by save() unless persist is False; other values
+        (DataFrames, parsed files) only live in memory.
+        """
+        def decorator(builder):
+            # Key on the defining file, not the module name, so a dashboard run
+            # as __main__ shares entries with the build script that imports it
+            name = f'{os.path.basename(builder.__code__.co_filename)}:{builder.__qualname__}'
+
+            @functools.wraps(builder)
+            def wrapper(*args):
+                key = json.dumps([name, args], default=str)
+                version = file_version(*sources)
+                with self._lock:
+                    cached = self._entries.get(key)
+                    if cached is not None and cached[0] == version:
+                        self._entries.move_to_end(key)
+                        self.counters['hits'] += 1
+                        return cached[1]
+                    self.counters['misses'] += 1
+
+                value = builder(*args)
+                if hasattr(value, 'to_plotly_json'):
+                    value = value.to_dict()
+                with self._lock:
+                    self._entries[key] = (version, value, persist and isinstance(value, dict))
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                return value
+
+            return wrapper
+        return decorator
+
+    def load(self, path=None):
+        """Warm the cache from a saved file; entries whose sources changed are rebuilt on use"""
+        try:
+            with open(path or self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        with self._lock:
+            for key, (version, value) in saved.items():
+                self._entries.setdefault(key, (version, value, True))
+            self.counters['loaded'] += len(saved)
+        return len(saved)
+
+    def save(self, path=None):
+        """Write the cached figures for the next start-up"""
+        from plotly.utils import PlotlyJSONEncoder
+
+        path = path or self.path
+        with self._lock:
+            figures = {key: [version, value] for key, (version, value, persist) in self._entries.items() if persist}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(figures, f, cls=PlotlyJSONEncoder)
+        os.replace(tmp_path, path)
+        return len(figures)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries))
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,180 @@
+"""Lightweight, thread-safe counters and histograms for hot-path timing."""
+import bisect
+import threading
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style (upper bounds, +Inf last)"""
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """{'buckets': {'le_bound': cumulative_count, ..., '+Inf': n}, 'sum': .., 'count': ..}"""
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+        cumulative = 0
+        buckets = {}
+        for bound, n in zip(self.buckets + [float('inf')], counts):
+            cumulative += n
+            buckets['+Inf' if bound == float('inf') else f'{bound:g}'] = cumulative
+        return {'buckets': buckets, 'sum': round(total, 6), 'count': count}
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values)) + list(extra or [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class LabeledCounter:
+    """Monotonic counter per label-value tuple"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class LabeledHistogram:
+    """One Histogram per label-value tuple, sharing bucket bounds"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = sorted(buckets)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labels):
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, Histogram(self.buckets))
+        return child
+
+    def samples(self):
+        with self._lock:
+            children = dict(self._children)
+        for labels, child in sorted(children.items()):
+            yield from histogram_samples(self.name, child, self.labelnames, labels)
+
+
+class CallbackGauge:
+    """Value read at scrape time; callback returns a number or {label tuple: number}.
+
+    kind='counter' exposes a cumulative count kept elsewhere (e.g. cache counters).
+    """
+
+    def __init__(self, name, documentation, callback, labelnames=(), kind='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+
+    def samples(self):
+        value = self.callback()
+        if isinstance(value, dict):
+            for labels, sample in sorted(value.items()):
+                labels = labels if isinstance(labels, tuple) else (labels,)
+                yield self.name, _format_labels(self.labelnames, labels), sample
+        else:
+            yield self.name, '', value
+
+
+class HistogramFamily:
+    """Expose an existing (unlabeled) Histogram under a metric name"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, histogram):
+        self.name = name
+        self.documentation = documentation
+        self.histogram = histogram
+
+    def samples(self):
+        yield from histogram_samples(self.name, self.histogram)
+
+
+def histogram_samples(name, histogram, labelnames=(), labels=()):
+    snapshot = histogram.snapshot()
+    for bound, count in snapshot['buckets'].items():
+        yield f'{name}_bucket', _format_labels(labelnames, labels, [('le', bound)]), count
+    yield f'{name}_sum', _format_labels(labelnames, labels), snapshot['sum']
+    yield f'{name}_count', _format_labels(labelnames, labels), snapshot['count']
+
+
+class MetricsRegistry:
+    """Named metric families rendered in the Prometheus text exposition format"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, namespace=''):
+        self.namespace = namespace
+        self._families = []
+
+    def _name(self, name):
+        return f'{self.namespace}_{name}' if self.namespace else name
+
+    def register(self, family):
+        self._families.append(family)
+        return family
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(LabeledCounter(self._name(name), documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=()):
+        return self.register(LabeledHistogram(self._name(name), documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelnames=(), kind='gauge'):
+        return self.register(CallbackGauge(self._name(name), documentation, callback, labelnames, kind))
+
+    def expose_histogram(self, name, documentation, histogram):
+        return self.register(HistogramFamily(self._name(name), documentation, histogram))
+
+    def render(self):
+        lines = []
+        for family in self._families:
+            lines.append(f'# HELP {family.name} {family.documentation}')
+            lines.append(f'# TYPE {family.name} {family.kind}')
+            for name, labels, value in family.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,74 @@
+"""Evaluation metrics and the metrics.json file shared with the dashboards."""
+import json
+import os
+
+METRICS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'trained_models', 'metrics.json'
+)
+
+METRIC_NAMES = ['Accuracy', 'Precision', 'Recall', 'F1 Score', 'AUC Score']
+
+# Column prefixes the dashboards use for each served model
+DASHBOARD_LABELS = {
+    'logistic_regression': 'LR',
+    'logistic_regression_smote': 'LR SM',
+    'naive_bayes': 'MNB',
+    'xgboost': 'XGB',
+    'xgboost_tuned': 'XGB HP',
+    'random_forest': 'RF'
+}
+
+
+def compute_metrics(y_true, y_pred, y_proba=None):
+    """Weighted accuracy/precision/recall/F1 and one-vs-rest AUC, rounded like the notebook"""
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+
+    metrics = {
+        'Accuracy': accuracy_score(y_true, y_pred),
+        'Precision': precision_score(y_true, y_pred, average='weighted', zero_division=0),
+        'Recall': recall_score(y_true, y_pred, average='weighted', zero_division=0),
+        'F1 Score': f1_score(y_true, y_pred, average='weighted', zero_division=0),
+        'AUC Score': None
+    }
+    if y_proba is not None:
+        try:
+            metrics['AUC Score'] = roc_auc_score(y_true, y_proba, multi_class='ovr', average='weighted')
+        except ValueError:
+            pass
+    return {name: round(float(value), 2) if value is not None else None for name, value in metrics.items()}
+
+
+def load_metrics(path=METRICS_FILE):
+    """Return the parsed metrics.json, or None when it has not been generated"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_metrics(metrics, path=METRICS_FILE):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def metrics_table(metrics=None, path=METRICS_FILE):
+    """Dashboard-shaped table {'Metric': [...], 'LR Train': [...], 'LR Test': [...], ...}.
+
+    Returns None when no metrics file is available so callers can fall back to
+    their built-in numbers.
+    """
+    metrics = load_metrics(path) if metrics is None else metrics
+    if not metrics or not metrics.get('models'):
+        return None
+
+    table = {'Metric': list(METRIC_NAMES)}
+    for key, result in metrics['models'].items():
+        label = DASHBOARD_LABELS.get(key, key)
+        for split in ('train', 'test'):
+            values = result.get(split)
+            if values:
+                table[f'{label} {split.title()}'] = [values.get(name) for name in METRIC_NAMES]
+    return table
@@ -0,0 +1,46 @@
+"""TextBlob-based text analysis (word/char counts, polarity, subjectivity).
+
+One shared PatternAnalyzer is reused instead of building a TextBlob per text,
+sentiment is evaluated once per text, and results are memoized so repeated
+reviews cost a dictionary lookup.
+"""
+import os
+from functools import lru_cache
+
+TEXT_ANALYSIS_CACHE_SIZE = int(os.environ.get('TEXT_ANALYSIS_CACHE_SIZE', 50000))
+
+
+@lru_cache(maxsize=1)
+def _analyzer():
+    from textblob.sentiments import PatternAnalyzer
+    return PatternAnalyzer()
+
+
+@lru_cache(maxsize=TEXT_ANALYSIS_CACHE_SIZE)
+def _sentiment(text):
+    sentiment = _analyzer().analyze(text)
+    return sentiment.polarity, sentiment.subjectivity
+
+
+def analyze_text(text):
+    """Same values as TextBlob(text).sentiment plus word/character counts"""
+    polarity, subjectivity = _sentiment(text)
+    return {
+        'word_count': len(text.split()),
+        'character_count': len(text),
+        'polarity': polarity,
+        'subjectivity': subjectivity
+    }
+
+
+def analyze_texts(texts):
+    """Analyze a batch, evaluating each distinct text once"""
+    unique = {text: None for text in texts}
+    for text in unique:
+        unique[text] = analyze_text(text)
+    return [unique[text] for text in texts]
+
+
+def cache_info():
+    info = _sentiment.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'entries': info.currsize, 'max_entries': info.maxsize}
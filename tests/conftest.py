@@ -0,0 +1,81 @@
+"""Shared fixtures: a small labeled corpus and a model directory fitted on it"""
+import joblib
+import numpy as np
+import pytest
+
+NEGATIVE = ['terrible product broke after a day', 'awful battery and poor screen', 'worst purchase ever, refund',
+            'cheap plastic, stopped working', 'very disappointed, bad quality', 'horrible support and slow']
+NEUTRAL = ['it is okay for the price', 'average tablet, nothing special', 'works as expected I guess',
+           'fine for reading, meh otherwise', 'decent but the screen is average', 'okay product, ordinary']
+POSITIVE = ['great tablet, love it', 'excellent battery and bright screen', 'my kids love this great device',
+            'perfect for reading, highly recommend', 'amazing value, works great', 'love the fast and easy setup']
+
+
+@pytest.fixture(scope='session')
+def corpus():
+    texts = NEGATIVE + NEUTRAL + POSITIVE
+    labels = np.repeat([0, 1, 2], [len(NEGATIVE), len(NEUTRAL), len(POSITIVE)])
+    return texts, labels
+
+
+@pytest.fixture(scope='session')
+def fitted(corpus):
+    """Vectorizer plus a naive Bayes and a logistic regression model fitted on the corpus"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import MultinomialNB
+
+    texts, labels = corpus
+    vectorizer = TfidfVectorizer().fit(texts)
+    X = vectorizer.transform(texts)
+    return {
+        'vectorizer': vectorizer,
+        'naive_bayes': MultinomialNB().fit(X, labels),
+        'logistic_regression': LogisticRegression(max_iter=1000).fit(X, labels)
+    }
+
+
+@pytest.fixture
+def model_dir(tmp_path, fitted):
+    """MODEL_DIR-style directory holding the fitted vectorizer and models"""
+    from src.models.registry import MODEL_FILES, SERVED_VECTORIZER_FILE
+
+    joblib.dump(fitted['vectorizer'], tmp_path / SERVED_VECTORIZER_FILE)
+    for key in ('naive_bayes', 'logistic_regression'):
+        joblib.dump(fitted[key], tmp_path / MODEL_FILES[key])
+    return tmp_path
+
+
+@pytest.fixture(scope='session')
+def web_app():
+    """The advanced web app module (frontend/advanced_web_app/app.py)"""
+    import os
+    import sys
+
+    app_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend', 'advanced_web_app')
+    if app_dir not in sys.path:
+        sys.path.insert(0, app_dir)
+    import app
+    return app
+
+
+@pytest.fixture
+def scoring_app(web_app, model_dir, monkeypatch):
+    """The web app serving the fitted models from model_dir, with an empty prediction cache
+    and its own job queue and analytics store (the prediction log is disabled)"""
+    import src.models.registry
+    from src.data.analytics_store import AnalyticsStore
+    from src.data.prediction_log import PredictionLog
+    from src.models.jobs import JobQueue
+    from src.models.prediction_cache import PredictionCache
+    from src.models.registry import ModelRegistry
+
+    registry = ModelRegistry(model_dir=str(model_dir))
+    monkeypatch.setattr(web_app, 'models', registry)
+    monkeypatch.setattr(src.models.registry, '_registry', registry)
+    monkeypatch.setattr(web_app, 'prediction_cache', PredictionCache())
+    monkeypatch.setattr(web_app, 'METRICS_ENABLED', False)
+    monkeypatch.setattr(web_app, 'job_queue', JobQueue(jobs_dir=str(model_dir / 'jobs')))
+    monkeypatch.setattr(web_app, 'analytics_store', AnalyticsStore(str(model_dir / 'analytics.db')))
+    monkeypatch.setattr(web_app, 'prediction_log', PredictionLog(str(model_dir / 'prediction_log'), enabled=False))
+    return web_app
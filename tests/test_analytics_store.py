@@ -0,0 +1,81 @@
+import gc
+import subprocess
+import sys
+import time
+import weakref
+
+import pandas as pd
+import pytest
+
+import src.data.analytics_store as analytics_store
+from src.data.analytics_store import AnalyticsStore
+
+
+def _daily_total(path):
+    return AnalyticsStore(path).overview()['total_predictions']
+
+
+@pytest.fixture
+def reviews_csv(tmp_path):
+    path = tmp_path / 'reviews.csv'
+    pd.DataFrame({'reviews_rating': [5, 4, 1, 3], 'brand': ['Amazon', 'Amazon', 'Other', None]}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_pending_counts_are_flushed_after_flush_seconds(tmp_path, monkeypatch):
+    path = str(tmp_path / 'analytics.db')
+    store = AnalyticsStore(path)
+    store.record_predictions('naive_bayes', [2, 2, 0])
+    assert _daily_total(path) == 0
+
+    monkeypatch.setattr(analytics_store, 'PREDICTION_FLUSH_SECONDS', 0)
+    store.record_predictions('naive_bayes', [1])
+    assert _daily_total(path) == 4
+
+
+def test_idle_store_flushes_pending_counts_on_a_timer(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_store, 'PREDICTION_FLUSH_SECONDS', 0.05)
+    path = str(tmp_path / 'analytics.db')
+    store = AnalyticsStore(path)
+    store.record_predictions('naive_bayes', [2, 0])
+
+    deadline = time.monotonic() + 5
+    while store._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _daily_total(path) == 2
+
+
+def test_exit_hook_does_not_keep_stores_alive(tmp_path):
+    store = AnalyticsStore(str(tmp_path / 'analytics.db'))
+    store.record_predictions('naive_bayes', [1])
+    store.flush()
+    ref = weakref.ref(store)
+    del store
+    gc.collect()
+    assert ref() is None
+
+
+def test_pending_counts_are_flushed_at_exit(tmp_path):
+    path = str(tmp_path / 'analytics.db')
+    subprocess.run([sys.executable, '-c', 'from src.data.analytics_store import AnalyticsStore; '
+                    f'AnalyticsStore({path!r}).record_predictions("naive_bayes", [2, 1])'], check=True)
+    assert _daily_total(path) == 2
+
+
+def test_rebuild_replaces_review_rollups(tmp_path, reviews_csv):
+    store = AnalyticsStore(str(tmp_path / 'analytics.db'))
+    assert store.rebuild([reviews_csv]) == 4
+    assert store.rebuild([reviews_csv]) == 4
+
+    overview = store.overview()
+    assert overview['total_reviews'] == 4
+    assert overview['sentiment_distribution'] == {'positive': 2, 'negative': 1, 'neutral': 1}
+    assert overview['top_brands'][0] == {'brand': 'Amazon', 'count': 2, 'mean': 4.5}
+
+
+def test_failed_rebuild_keeps_previous_rollups(tmp_path, reviews_csv):
+    store = AnalyticsStore(str(tmp_path / 'analytics.db'))
+    store.rebuild([reviews_csv])
+    with pytest.raises(Exception):
+        store.rebuild([reviews_csv, str(tmp_path / 'missing.csv')])
+    assert store.overview()['total_reviews'] == 4
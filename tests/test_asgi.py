@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+
+def _scope(path='/api/predict'):
+    return {'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'',
+            'headers': [(b'content-type', b'application/json')]}
+
+
+def _complete_receive(body=b'{}'):
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+    return receive
+
+
+async def _stalled_receive():
+    """An upload whose client never sends the rest of the body"""
+    await asyncio.Event().wait()
+
+
+def _collector():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+    return sent, send
+
+
+def _status(sent):
+    return next(message['status'] for message in sent if message['type'] == 'http.response.start')
+
+
+@pytest.fixture
+def bridge(web_app):
+    """Factory of WSGIBridges around a tiny WSGI app; /api/slow blocks until release is set"""
+    import asgi
+
+    release = threading.Event()
+
+    def wsgi_app(environ, start_response):
+        if environ['PATH_INFO'] == '/api/slow':
+            release.wait(5)
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', '2')])
+        return [b'{}']
+
+    yield lambda **kwargs: asgi.WSGIBridge(wsgi_app, threads=2, **kwargs), release
+    release.set()
+
+
+async def _stall_uploads(app, count):
+    uploads = [asyncio.ensure_future(app(_scope(), _stalled_receive, _collector()[1])) for _ in range(count)]
+    await asyncio.sleep(0.05)
+    return uploads
+
+
+def test_stalled_uploads_do_not_count_as_pending(bridge):
+    make, _ = bridge
+
+    async def run():
+        app = make(max_pending=4)
+        uploads = await _stall_uploads(app, 4)
+        assert app.uploading == 4 and app.pending == 0
+        sent, send = _collector()
+        await app(_scope(), _complete_receive(), send)
+        for upload in uploads:
+            upload.cancel()
+        return sent
+    assert _status(asyncio.run(run())) == 200
+
+
+def test_rejects_with_429_when_pool_queue_is_full(bridge):
+    make, release = bridge
+
+    async def run():
+        app = make(max_pending=1)
+        first, send_first = _collector()
+        slow = asyncio.ensure_future(app(_scope('/api/slow'), _complete_receive(), send_first))
+        await asyncio.sleep(0.05)
+        assert app.pending == 1
+        second, send_second = _collector()
+        await app(_scope(), _complete_receive(), send_second)
+        health, send_health = _collector()
+        await app(_scope('/api/health'), _complete_receive(), send_health)
+        release.set()
+        await slow
+        return first, second, health, app.stats()
+
+    first, second, health, stats = asyncio.run(run())
+    assert _status(first) == 200
+    assert _status(second) == 429
+    assert dict(second[0]['headers'])[b'retry-after']
+    assert _status(health) == 200
+    assert stats['rejected'] == 1 and stats['pending'] == 0
+
+
+def test_upload_cap_rejects_new_requests(bridge):
+    make, _ = bridge
+
+    async def run():
+        app = make(max_uploads=2)
+        uploads = await _stall_uploads(app, 2)
+        sent, send = _collector()
+        await app(_scope(), _complete_receive(), send)
+        for upload in uploads:
+            upload.cancel()
+        return sent
+    assert _status(asyncio.run(run())) == 429
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from src.models.batching import MicroBatcher
+
+
+class _Scorer:
+    """score_fn that records each batch and predicts the text length"""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def __call__(self, model_name, texts):
+        with self._lock:
+            self.batches.append((model_name, list(texts)))
+        if self.fail_on in texts:
+            raise RuntimeError('scoring failed')
+        return [len(text) for text in texts], [[float(len(text))] for text in texts], {}
+
+
+def test_full_batch_is_dispatched_without_waiting(corpus):
+    texts, _ = corpus
+    scorer = _Scorer()
+    # A wait far longer than the test: only max_batch can close these batches
+    batcher = MicroBatcher(scorer, max_wait_ms=60000, max_batch=4)
+    futures = [batcher.submit('naive_bayes', text) for text in texts[:8]]
+
+    assert [future.result(timeout=5) for future in futures] == [(len(text), [float(len(text))]) for text in texts[:8]]
+    assert [len(batch) for _, batch in scorer.batches] == [4, 4]
+    assert batcher.stats()['batches'] == 2
+    assert batcher.stats()['batch_size_histogram']['count'] == 2
+
+
+def test_partial_batch_is_dispatched_after_max_wait(corpus):
+    texts, _ = corpus
+    scorer = _Scorer()
+    batcher = MicroBatcher(scorer, max_wait_ms=20, max_batch=64)
+    futures = [batcher.submit('naive_bayes', text) for text in texts[:3]]
+
+    assert [future.result(timeout=5)[0] for future in futures] == [len(text) for text in texts[:3]]
+    assert sum(len(batch) for _, batch in scorer.batches) == 3
+
+
+def test_models_are_batched_separately():
+    scorer = _Scorer()
+    batcher = MicroBatcher(scorer, max_wait_ms=60000, max_batch=2)
+    futures = [batcher.submit(model, text) for model in ('naive_bayes', 'logistic_regression') for text in 'ab']
+
+    assert [future.result(timeout=5)[0] for future in futures] == [1, 1, 1, 1]
+    assert sorted(model for model, _ in scorer.batches) == ['logistic_regression', 'naive_bayes']
+
+
+def test_scoring_error_fails_the_batch_and_dispatcher_keeps_running():
+    scorer = _Scorer(fail_on='bad')
+    batcher = MicroBatcher(scorer, max_wait_ms=60000, max_batch=2)
+    failed = [batcher.submit('naive_bayes', text) for text in ('fine', 'bad')]
+    for future in failed:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+    later = [batcher.submit('naive_bayes', text) for text in ('good', 'also good')]
+    assert [future.result(timeout=5)[0] for future in later] == [4, 9]
+    assert batcher.stats()['errors'] == 1
+
+
+def test_batched_predict_matches_direct_scoring(scoring_app, corpus):
+    texts, _ = corpus
+    client = scoring_app.app.test_client()
+    for text in texts[::5]:
+        direct, batched = (client.post('/api/predict', json={'text': text, 'model': 'naive_bayes',
+                                                             'cache': False, 'batching': batching}).get_json()
+                           for batching in (False, True))
+        assert batched['prediction'] == direct['prediction']
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.models.cascade import CascadeModel, tier_counts
+from src.models.registry import ModelRegistry, dump_atomic
+
+
+@pytest.fixture
+def registry(model_dir):
+    return ModelRegistry(model_dir=str(model_dir))
+
+
+def _cascade(threshold, name):
+    tier_counts.pop(name, None)
+    return CascadeModel(['naive_bayes', 'logistic_regression'], threshold, name=name)
+
+
+@pytest.mark.parametrize('threshold', [0.0, 0.5, 1.01])
+def test_escalation_counts(registry, corpus, fitted, threshold):
+    texts, _ = corpus
+    X = fitted['vectorizer'].transform(texts)
+    cascade = _cascade(threshold, f'cascade-{threshold}')
+    proba = cascade.predict_proba(X, registry)
+
+    confident = fitted['naive_bayes'].predict_proba(X).max(axis=1) >= threshold
+    stats = cascade.stats()
+    assert stats['rows_per_tier'] == {'naive_bayes': int(confident.sum()),
+                                      'logistic_regression': int((~confident).sum())}
+    expected = np.where(confident[:, None], fitted['naive_bayes'].predict_proba(X),
+                        fitted['logistic_regression'].predict_proba(X))
+    np.testing.assert_allclose(proba, expected)
+
+
+def test_failing_tier_keeps_first_tier_answer(registry, corpus, fitted):
+    texts, _ = corpus
+    X = fitted['vectorizer'].transform(texts)
+    cascade = CascadeModel(['naive_bayes', 'missing'], 1.01, name='cascade-missing')
+    tier_counts.pop(cascade.name, None)
+    registry.register('missing', 'missing.pkl')
+
+    np.testing.assert_allclose(cascade.predict_proba(X, registry), fitted['naive_bayes'].predict_proba(X))
+    assert cascade.stats()['escalation_errors'] == len(texts)
+
+
+def test_cached_cascade_predictions_expire_when_a_tier_changes(scoring_app, model_dir, corpus, fitted):
+    texts, labels = corpus
+    dump_atomic(_cascade(1.01, 'cascade'), model_dir / 'cascade.pkl')
+    scoring_app.score_batch(texts[:3], 'cascade', dedupe=False)
+    _, _, timing = scoring_app.score_batch(texts[:3], 'cascade', dedupe=False)
+    assert timing['cache_hits'] == 3
+
+    # Retrain the escalation tier only; cascade.pkl is unchanged
+    from sklearn.linear_model import LogisticRegression
+    retrained = LogisticRegression(C=0.1).fit(fitted['vectorizer'].transform(texts), labels)
+    scoring_app.models.swap('logistic_regression', retrained)
+    _, _, timing = scoring_app.score_batch(texts[:3], 'cascade', dedupe=False)
+    assert timing['cache_hits'] == 0
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import src.models.registry as registry_module
+from src.models.cascade import CascadeModel
+from src.models.compact_vectorizer import CompactVectorizer, used_features
+from src.models.linear_scorer import LinearScorer
+from src.models.registry import COMPACT_VECTORIZER_FILE, ModelRegistry, dump_atomic
+
+
+def test_used_features_covers_fitted_models(fitted):
+    n_features = len(fitted['vectorizer'].vocabulary_)
+    mask = used_features([fitted['naive_bayes'], fitted['logistic_regression']], n_features)
+    assert mask.all()
+
+
+def test_used_features_rejects_models_without_feature_information(fitted):
+    n_features = len(fitted['vectorizer'].vocabulary_)
+    with pytest.raises(TypeError):
+        used_features([CascadeModel(['naive_bayes', 'xgboost'], 0.8)], n_features)
+    with pytest.raises(TypeError):
+        used_features([LinearScorer.from_models(fitted['vectorizer'], fitted['naive_bayes'])], n_features)
+
+
+def test_compact_vectorizer_matches_original_columns(corpus, fitted):
+    texts, _ = corpus
+    vectorizer = fitted['vectorizer']
+    compact = CompactVectorizer.from_vectorizer(vectorizer)
+    np.testing.assert_allclose(compact.transform(texts).toarray(), vectorizer.transform(texts).toarray())
+
+
+def test_pruned_columns_leave_predictions_unchanged(corpus, fitted):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import MultinomialNB
+
+    texts, labels = corpus
+    vectorizer = fitted['vectorizer']
+    X = vectorizer.transform(texts)
+    # Models that never saw every third column
+    dropped = np.arange(X.shape[1]) % 3 == 0
+    X_seen = X.tolil()
+    X_seen[:, np.flatnonzero(dropped)] = 0
+    X_seen = X_seen.tocsr()
+    models = [MultinomialNB().fit(X_seen, labels), LogisticRegression(max_iter=1000).fit(X_seen, labels)]
+
+    keep = used_features(models, X.shape[1])
+    assert not keep[dropped].any()
+    compact = CompactVectorizer.from_vectorizer(vectorizer, keep)
+    assert len(compact) < X.shape[1]
+
+    X_compact = compact.transform(texts)
+    for model in models:
+        np.testing.assert_array_equal(model.predict(X_compact), model.predict(X))
+
+
+def test_registry_serves_full_vectorizer_while_compact_one_is_missing(model_dir, fitted, monkeypatch):
+    monkeypatch.setattr(registry_module, 'SERVED_VECTORIZER_FILE', COMPACT_VECTORIZER_FILE)
+    registry = ModelRegistry(model_dir=str(model_dir))
+    assert type(registry.vectorizer) is type(fitted['vectorizer'])
+
+    dump_atomic(CompactVectorizer.from_vectorizer(fitted['vectorizer']), model_dir / COMPACT_VECTORIZER_FILE)
+    registry.reload('vectorizer')
+    assert isinstance(registry.vectorizer, CompactVectorizer)
@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.models.registry import MODEL_FILES
+
+
+class _BrokenModel:
+    """Loads fine, fails when scoring"""
+
+    classes_ = np.array([0, 1, 2])
+
+    def predict_proba(self, X):
+        raise RuntimeError('scoring failed')
+
+
+def _ensemble(app, **payload):
+    response = app.app.test_client().post('/api/ensemble_predict', json=payload)
+    return response.status_code, response.get_json()
+
+
+def test_soft_voting_averages_model_probabilities(scoring_app, corpus, fitted):
+    texts, _ = corpus
+    status, body = _ensemble(scoring_app, texts=texts[:4], models=['naive_bayes', 'logistic_regression'])
+
+    assert status == 200 and body['errors'] == {}
+    X = fitted['vectorizer'].transform(texts[:4])
+    expected = (fitted['naive_bayes'].predict_proba(X) + fitted['logistic_regression'].predict_proba(X)) / 2
+    assert [result['ensemble']['sentiment_code'] for result in body['results']] == expected.argmax(axis=1).tolist()
+    assert set(body['results'][0]['models']) == {'naive_bayes', 'logistic_regression'}
+
+
+def test_hard_voting_with_a_zero_weight_follows_the_other_model(scoring_app, corpus, fitted):
+    texts, _ = corpus
+    status, body = _ensemble(scoring_app, texts=texts, models=['naive_bayes', 'logistic_regression'],
+                             voting='hard', weights={'naive_bayes': 0})
+
+    assert status == 200
+    expected = fitted['logistic_regression'].predict(fitted['vectorizer'].transform(texts))
+    assert [result['ensemble']['sentiment_code'] for result in body['results']] == expected.tolist()
+
+
+def test_models_that_fail_to_load_or_score_are_reported_and_skipped(scoring_app, model_dir):
+    (model_dir / MODEL_FILES['xgboost']).write_bytes(b'not a pickle')
+    scoring_app.models.swap('random_forest', _BrokenModel())
+    status, body = _ensemble(scoring_app, text='great tablet, love it',
+                             models=['naive_bayes', 'xgboost', 'random_forest'])
+
+    assert status == 200
+    assert set(body['errors']) == {'xgboost', 'random_forest'}
+    assert body['errors']['random_forest'] == 'RuntimeError: scoring failed'
+    assert set(body['prediction']['models']) == set(body['weights']) == {'naive_bayes'}
+
+
+def test_every_model_failing_is_a_server_error(scoring_app):
+    scoring_app.models.swap('random_forest', _BrokenModel())
+    status, body = _ensemble(scoring_app, text='great tablet', models=['random_forest'])
+
+    assert status == 500 and body['status'] == 'error'
+    assert 'scoring failed' in body['message']
+
+
+def test_invalid_requests_are_rejected(scoring_app):
+    for payload in ({'text': '  '}, {'texts': ['fine', '']}, {'texts': ['fine', 3]},
+                    {'text': 'fine', 'models': ['xgboost']},
+                    {'text': 'fine', 'voting': 'ranked'},
+                    {'text': 'fine', 'weights': {'naive_bayes': -1}},
+                    {'text': 'fine', 'weights': 'uniform'}):
+        status, body = _ensemble(scoring_app, **payload)
+        assert status == 400 and body['status'] == 'error', payload
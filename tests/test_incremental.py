@@ -0,0 +1,67 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from src.models.incremental import update_kind, update_served_model, updated_model
+from src.models.registry import ModelRegistry
+
+
+def _registry(model_dir):
+    return ModelRegistry(model_dir=str(model_dir), model_files={'naive_bayes': 'sentiment_NaiveBayes.pkl'})
+
+
+def _update_worker(model_dir, updates, rows):
+    registry = _registry(model_dir)
+    for _ in range(updates):
+        update_served_model(registry, 'naive_bayes', ['great value, love it'] * rows, [2] * rows)
+
+
+def test_swap_installs_model_and_writes_pickle(model_dir, fitted):
+    registry = _registry(model_dir)
+    old = registry['naive_bayes']
+    new = updated_model(old, fitted['vectorizer'].transform(['meh okay']), [1])
+    registry.swap('naive_bayes', new)
+
+    assert registry['naive_bayes'] is new
+    assert registry.stats()['models']['naive_bayes']['swaps'] == 1
+    # Another process sees the swapped pickle
+    assert _registry(model_dir)['naive_bayes'].class_count_.sum() == old.class_count_.sum() + 1
+
+
+def test_updated_model_leaves_original_untouched(fitted):
+    model = fitted['naive_bayes']
+    before = model.class_count_.copy()
+    updated = updated_model(model, fitted['vectorizer'].transform(['love it'] * 3), [2, 2, 2])
+
+    assert update_kind(model) == 'partial_fit'
+    np.testing.assert_array_equal(model.class_count_, before)
+    assert updated.class_count_[2] == before[2] + 3
+
+
+def test_updated_model_rejects_unknown_labels(fitted):
+    with pytest.raises(ValueError):
+        updated_model(fitted['naive_bayes'], fitted['vectorizer'].transform(['x']), [5])
+
+
+def test_update_starts_from_other_registry_swap(model_dir):
+    first, second = _registry(model_dir), _registry(model_dir)
+    start = second['naive_bayes'].class_count_.sum()
+    update_served_model(first, 'naive_bayes', ['love it'] * 50, [2] * 50)
+    # second still holds the pre-update model and has not re-checked the file version
+    update_served_model(second, 'naive_bayes', ['awful'] * 70, [0] * 70)
+
+    assert _registry(model_dir)['naive_bayes'].class_count_.sum() == start + 120
+
+
+def test_concurrent_updates_from_processes_are_not_lost(model_dir):
+    start = _registry(model_dir)['naive_bayes'].class_count_.sum()
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_update_worker, args=(str(model_dir), 5, 10)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    assert _registry(model_dir)['naive_bayes'].class_count_.sum() == start + 100
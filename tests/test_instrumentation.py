@@ -0,0 +1,83 @@
+import re
+
+from src.utils.instrumentation import Histogram, MetricsRegistry
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{.*\})? \S+$')
+
+
+def _samples(text):
+    """'name{labels}' -> value of every sample line, checking each line's syntax"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        assert SAMPLE.match(line), line
+        key, value = line.rsplit(' ', 1)
+        samples[key] = float(value)
+    return samples
+
+
+def test_counters_and_gauges_render_in_text_format():
+    metrics = MetricsRegistry('app')
+    requests = metrics.counter('requests_total', 'Requests by route', ['route', 'status'])
+    requests.inc('/api/predict', '200')
+    requests.inc('/api/predict', '200', amount=2)
+    requests.inc('/say "hi"\n', '500')
+    metrics.gauge('queue_depth', 'Queued items', lambda: {'naive_bayes': 3, 'xgboost': 0}, ['model'])
+    metrics.gauge('cache_lookups_total', 'Cache lookups', lambda: {('hits',): 5}, ['result'], kind='counter')
+    metrics.gauge('hit_ratio', 'Hit ratio', lambda: 0.25)
+
+    text = metrics.render()
+    assert '# HELP app_requests_total Requests by route\n# TYPE app_requests_total counter\n' in text
+    assert '# TYPE app_cache_lookups_total counter' in text and '# TYPE app_hit_ratio gauge' in text
+    assert _samples(text) == {
+        'app_requests_total{route="/api/predict",status="200"}': 3,
+        'app_requests_total{route="/say \\"hi\\"\\n",status="500"}': 1,
+        'app_queue_depth{model="naive_bayes"}': 3,
+        'app_queue_depth{model="xgboost"}': 0,
+        'app_cache_lookups_total{result="hits"}': 5,
+        'app_hit_ratio': 0.25
+    }
+
+
+def test_histograms_render_cumulative_buckets():
+    metrics = MetricsRegistry()
+    latency = metrics.histogram('latency_seconds', 'Latency', ['model'], buckets=[0.1, 0.01])
+    for value in (0.005, 0.05, 0.05, 3):
+        latency.labels('naive_bayes').observe(value)
+    batch_sizes = Histogram([1, 4])
+    batch_sizes.observe(2)
+    metrics.expose_histogram('batch_size', 'Batch sizes', batch_sizes)
+
+    samples = _samples(metrics.render())
+    assert [samples[f'latency_seconds_bucket{{model="naive_bayes",le="{le}"}}'] for le in ('0.01', '0.1', '+Inf')] == [1, 3, 4]
+    assert samples['latency_seconds_count{model="naive_bayes"}'] == 4
+    assert abs(samples['latency_seconds_sum{model="naive_bayes"}'] - 3.105) < 1e-9
+    assert [samples[f'batch_size_bucket{{le="{le}"}}'] for le in ('1', '4', '+Inf')] == [0, 1, 1]
+
+
+def test_metrics_endpoint_counts_scoring_requests(scoring_app, monkeypatch):
+    monkeypatch.setattr(scoring_app, 'METRICS_ENABLED', True)
+    client = scoring_app.app.test_client()
+
+    def scrape():
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type == MetricsRegistry.CONTENT_TYPE
+        return _samples(response.get_data(as_text=True))
+
+    before = scrape()
+    for text in ('great tablet, love it', 'terrible product broke after a day'):
+        assert client.post('/api/predict', json={'text': text, 'model': 'naive_bayes'}).status_code == 200
+    after = scrape()
+
+    def delta(key):
+        return after.get(key, 0) - before.get(key, 0)
+
+    assert delta('sentiment_http_requests_total{route="/api/predict",method="POST",status="200"}') == 2
+    assert delta('sentiment_model_requests_total{model="naive_bayes",route="/api/predict"}') == 2
+    assert delta('sentiment_model_request_duration_seconds_count{model="naive_bayes",route="/api/predict"}') == 2
+    assert sum(delta(f'sentiment_predictions_total{{model="naive_bayes",sentiment="{sentiment}"}}')
+               for sentiment in ('Negative', 'Neutral', 'Positive')) == 2
+    assert delta('sentiment_stage_duration_seconds_count{stage="json_parse",model="naive_bayes"}') == 2
+    assert after['sentiment_models_loaded'] >= 1
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.models.jobs import FINISHED_STATES, JobQueue
+
+
+@pytest.fixture
+def queues(tmp_path, model_dir, monkeypatch):
+    """Factory for JobQueues on one jobs dir; spawned workers serve model_dir"""
+    monkeypatch.setenv('MODEL_DIR', str(model_dir))
+    monkeypatch.setenv('PREDICTION_LOG_ENABLED', '0')
+    created = []
+
+    def make():
+        queue = JobQueue(jobs_dir=str(tmp_path / 'jobs'), workers=1, shard_size=5)
+        created.append(queue)
+        return queue
+
+    yield make
+    for queue in created:
+        queue.shutdown()
+
+
+def _wait(queue, job_id, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = queue.status(job_id)
+        if status['status'] in FINISHED_STATES:
+            return status
+        time.sleep(0.1)
+    raise AssertionError(f'job {job_id} did not finish: {queue.status(job_id)}')
+
+
+def _predictions(queue, job_id):
+    return np.concatenate([predictions for _, predictions, _ in queue.iter_results(job_id)]).tolist()
+
+
+def _crash(queue, job_id, lost_shards, unrecorded_shards):
+    """Rewrite a finished job as if its owner died: lost shards have no result
+    file, unrecorded shards have one that job.json never recorded"""
+    job_dir = os.path.join(queue.jobs_dir, job_id)
+    with open(os.path.join(job_dir, 'job.json')) as f:
+        meta = json.load(f)
+    for shard in lost_shards:
+        os.remove(os.path.join(job_dir, 'results', f'{shard:05d}.npz'))
+    for shard in lost_shards + unrecorded_shards:
+        del meta['completed'][str(shard)]
+    meta.update(status='running', finished_at=None)
+    with open(os.path.join(job_dir, 'job.json'), 'w') as f:
+        json.dump(meta, f)
+    return job_dir
+
+
+def test_job_scores_every_shard_in_input_order(queues, corpus, fitted):
+    texts, _ = corpus
+    queue = queues()
+    job_id = queue.submit(texts + ['  '], 'logistic_regression')['job_id']
+    status = _wait(queue, job_id)
+
+    assert status['status'] == 'completed'
+    assert status['shards'] == 4 and status['rows_scored'] == len(texts)
+    expected = fitted['logistic_regression'].predict(fitted['vectorizer'].transform(texts)).tolist()
+    assert _predictions(queue, job_id) == expected + [-1]
+
+
+def test_new_process_resumes_only_unfinished_shards(queues, corpus):
+    texts, _ = corpus
+    first = queues()
+    job_id = first.submit(texts, 'logistic_regression')['job_id']
+    _wait(first, job_id)
+    expected = _predictions(first, job_id)
+    first.shutdown()
+
+    job_dir = _crash(first, job_id, lost_shards=[1, 3], unrecorded_shards=[2])
+    kept = os.stat(os.path.join(job_dir, 'results', '00000.npz')).st_mtime_ns
+
+    second = queues()
+    second.start()
+    status = _wait(second, job_id)
+    assert status['status'] == 'completed'
+    assert status['rows_scored'] == len(texts)
+    assert _predictions(second, job_id) == expected
+    assert os.stat(os.path.join(job_dir, 'results', '00000.npz')).st_mtime_ns == kept
+
+
+def test_jobs_owned_by_a_live_process_are_not_resumed(queues, corpus):
+    fcntl = pytest.importorskip('fcntl')
+    texts, _ = corpus
+    first = queues()
+    job_id = first.submit(texts, 'logistic_regression')['job_id']
+    _wait(first, job_id)
+    first.shutdown()
+    job_dir = _crash(first, job_id, lost_shards=[1], unrecorded_shards=[])
+
+    with open(os.path.join(job_dir, 'lock'), 'w') as owner:
+        fcntl.flock(owner, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        second = queues()
+        second.start()
+        assert second.stats()['active_jobs'] == []
+        assert second.status(job_id)['status'] == 'running'
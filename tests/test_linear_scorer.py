@@ -0,0 +1,82 @@
+import joblib
+import numpy as np
+import pytest
+
+from src.models.linear_scorer import LinearScorer
+
+EXTRA = ['', 'zzz qqq unknown words only', 'great great great tablet', 'Terrible, AWFUL; broke!']
+
+
+@pytest.fixture(params=['naive_bayes', 'logistic_regression'])
+def model(request, fitted):
+    return fitted[request.param]
+
+
+def _texts(corpus):
+    return corpus[0] + EXTRA
+
+
+def test_float64_matches_predict_proba(corpus, fitted, model):
+    texts = _texts(corpus)
+    scorer = LinearScorer.from_models(fitted['vectorizer'], model)
+    expected = model.predict_proba(fitted['vectorizer'].transform(texts))
+    np.testing.assert_allclose(scorer.predict_proba(texts), expected, atol=1e-10)
+    assert scorer.predict(texts).tolist() == model.predict(fitted['vectorizer'].transform(texts)).tolist()
+
+
+def test_float32_matches_within_single_precision(corpus, fitted, model):
+    texts = _texts(corpus)
+    scorer = LinearScorer.from_models(fitted['vectorizer'], model, dtype=np.float32)
+    assert scorer.weights.dtype == np.float32
+    expected = model.predict_proba(fitted['vectorizer'].transform(texts))
+    np.testing.assert_allclose(scorer.predict_proba(texts), expected, atol=1e-5)
+
+
+def test_int8_matches_within_quantization_error(corpus, fitted, model):
+    texts = _texts(corpus)
+    scorer = LinearScorer.from_models(fitted['vectorizer'], model, dtype=np.float32).quantize()
+    assert scorer.weights.dtype == np.int8
+    expected = model.predict_proba(fitted['vectorizer'].transform(texts))
+    proba = scorer.predict_proba(texts)
+    np.testing.assert_allclose(proba, expected, atol=0.02)
+    assert (proba.argmax(axis=1) == expected.argmax(axis=1)).all()
+
+
+@pytest.mark.parametrize('options', [{'sublinear_tf': True}, {'binary': True, 'norm': 'l1'}, {'use_idf': False}])
+def test_vectorizer_options_are_reproduced(corpus, options):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    texts, labels = corpus
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), **options).fit(texts)
+    model = LogisticRegression(max_iter=1000).fit(vectorizer.transform(texts), labels)
+    scorer = LinearScorer.from_models(vectorizer, model)
+    np.testing.assert_allclose(scorer.predict_proba(texts + EXTRA),
+                               model.predict_proba(vectorizer.transform(texts + EXTRA)), atol=1e-10)
+
+
+def test_binary_logistic_regression(corpus, fitted):
+    from sklearn.linear_model import LogisticRegression
+
+    texts, labels = corpus
+    X = fitted['vectorizer'].transform(texts)
+    model = LogisticRegression().fit(X, labels == 2)
+    scorer = LinearScorer.from_models(fitted['vectorizer'], model)
+    assert scorer.link == 'logistic'
+    np.testing.assert_allclose(scorer.predict_proba(texts), model.predict_proba(X), atol=1e-10)
+
+
+def test_memory_mapped_pickle_scores_the_same(tmp_path, corpus, fitted, model):
+    texts = _texts(corpus)
+    scorer = LinearScorer.from_models(fitted['vectorizer'], model, dtype=np.float32).quantize()
+    joblib.dump(scorer, tmp_path / 'scorer.pkl')
+    loaded = joblib.load(tmp_path / 'scorer.pkl', mmap_mode='r')
+    assert isinstance(loaded.weights, np.memmap)
+    np.testing.assert_array_equal(loaded.predict_proba(texts), scorer.predict_proba(texts))
+
+
+def test_rejects_non_linear_models(fitted):
+    from sklearn.tree import DecisionTreeClassifier
+
+    with pytest.raises(TypeError):
+        LinearScorer.from_models(fitted['vectorizer'], DecisionTreeClassifier())
@@ -0,0 +1,84 @@
+import joblib
+
+from src.models.linear_scorer import LinearScorer
+from src.models.registry import MODEL_FILES
+
+
+def _served(app):
+    response = app.app.test_client().get('/api/models')
+    assert response.status_code == 200
+    return response.get_json()['models']
+
+
+def test_only_models_with_a_pickle_are_listed(scoring_app):
+    assert set(_served(scoring_app)) == {'naive_bayes', 'logistic_regression'}
+
+    comparison = scoring_app.app.test_client().get('/api/analytics/model_comparison').get_json()
+    assert sorted(row['model'] for row in comparison['model_comparison']) == ['Logistic Regression', 'Naive Bayes']
+
+
+def test_linear_scorer_reports_its_source_metrics(scoring_app, model_dir, fitted):
+    scorer = LinearScorer.from_models(fitted['vectorizer'], fitted['naive_bayes'])
+    joblib.dump(scorer, model_dir / MODEL_FILES['naive_bayes_linear'])
+
+    served = _served(scoring_app)
+    for field in scoring_app.METRIC_FIELDS:
+        assert served['naive_bayes_linear'][field] == served['naive_bayes'][field]
+
+
+def test_cascade_reports_its_own_held_out_metrics(scoring_app, model_dir):
+    from src.models.cascade import CascadeModel
+    from src.models.registry import dump_atomic
+
+    cascade = CascadeModel(['naive_bayes', 'logistic_regression'], 0.8, report={
+        'accuracy': {'naive_bayes': 0.8, 'logistic_regression': 0.9, 'cascade': 0.87},
+        'metrics': {'Accuracy': 0.87, 'Precision': 0.86, 'Recall': 0.87, 'F1 Score': 0.85, 'AUC Score': 0.9}
+    })
+    dump_atomic(cascade, model_dir / MODEL_FILES['cascade'])
+    assert {field: _served(scoring_app)['cascade'][field] for field in scoring_app.METRIC_FIELDS} == {
+        'accuracy': 0.87, 'precision': 0.86, 'recall': 0.87, 'f1_score': 0.85
+    }
+
+    # Built before the report carried full metrics: accuracy only
+    del cascade.report['metrics']
+    dump_atomic(cascade, model_dir / MODEL_FILES['cascade'])
+    scoring_app.models.reload('cascade')
+    served = _served(scoring_app)['cascade']
+    assert served['accuracy'] == 0.87 and served['f1_score'] is None
+
+
+def test_variants_report_measured_metrics_only(scoring_app, model_dir, fitted):
+    import json
+
+    scorer = LinearScorer.from_models(fitted['vectorizer'], fitted['naive_bayes'], dtype='float32')
+    for key in ('naive_bayes_f32', 'naive_bayes_int8'):
+        joblib.dump(scorer, model_dir / MODEL_FILES[key])
+    (model_dir / scoring_app.QUANTIZATION_REPORT_FILE).write_text(json.dumps({'variants': {
+        'naive_bayes_f32': {'accuracy': 0.8312,
+                            'metrics': {'Accuracy': 0.83, 'Precision': 0.9, 'Recall': 0.83, 'F1 Score': 0.86}}
+    }}))
+
+    served = _served(scoring_app)
+    assert 'logistic_regression_int8' not in served
+    assert served['naive_bayes_f32']['accuracy'] == 0.83 and served['naive_bayes_f32']['f1_score'] == 0.86
+    assert all(served['naive_bayes_int8'][field] is None for field in scoring_app.METRIC_FIELDS)
+
+
+def test_trained_metrics_come_from_metrics_json(scoring_app, model_dir, corpus, fitted):
+    import json
+
+    from sklearn.linear_model import SGDClassifier
+
+    texts, labels = corpus
+    joblib.dump(SGDClassifier(loss='log_loss').fit(fitted['vectorizer'].transform(texts), labels),
+                model_dir / MODEL_FILES['sgd_logistic'])
+    assert all(_served(scoring_app)['sgd_logistic'][field] is None for field in scoring_app.METRIC_FIELDS)
+
+    test = {'Accuracy': 0.81, 'Precision': 0.8, 'Recall': 0.81, 'F1 Score': 0.79, 'AUC Score': 0.9}
+    (model_dir / 'metrics.json').write_text(json.dumps({'models': {
+        'sgd_logistic': {'train': dict(test, Accuracy=0.99), 'test': test},
+        'naive_bayes': {'test': dict(test, Accuracy=0.75)}
+    }}))
+    served = _served(scoring_app)
+    assert served['sgd_logistic']['accuracy'] == 0.81 and served['sgd_logistic']['f1_score'] == 0.79
+    assert served['naive_bayes']['accuracy'] == 0.75
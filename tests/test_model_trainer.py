@@ -0,0 +1,73 @@
+import joblib
+import pandas as pd
+import pytest
+
+from src.models.model_trainer import ModelTrainer, served_vectorizer_params
+from src.models.registry import COMPACT_VECTORIZER_FILE, MODEL_FILES, VECTORIZER_FILE
+
+
+@pytest.fixture
+def reviews_csv(tmp_path, corpus):
+    texts, labels = corpus
+    path = tmp_path / 'reviews.csv'
+    pd.DataFrame({'reviews_text': texts * 3, 'reviews_rating': [[1.0, 3.0, 5.0][label] for label in labels] * 3}
+                 ).to_csv(path, index=False)
+    return str(path)
+
+
+def test_subset_run_retrains_models_on_the_old_vectorizer(model_dir, reviews_csv, tmp_path):
+    (model_dir / COMPACT_VECTORIZER_FILE).write_bytes(b'pruned copy of the old vocabulary')
+    trainer = ModelTrainer(data_paths=[reviews_csv], output_dir=str(model_dir), cache_dir=str(tmp_path / 'cache'),
+                           n_jobs=1, vectorizer_params={'ngram_range': (1, 2)}, verbose=False)
+    metrics = trainer.train(['naive_bayes'])
+
+    n_features = len(joblib.load(model_dir / VECTORIZER_FILE).vocabulary_)
+    assert not (model_dir / COMPACT_VECTORIZER_FILE).exists()
+    assert set(metrics['models']) == {'naive_bayes', 'logistic_regression'}
+    for key in metrics['models']:
+        assert joblib.load(model_dir / MODEL_FILES[key]).n_features_in_ == n_features
+
+
+def test_held_out_split_is_deterministic(reviews_csv, tmp_path):
+    trainer = ModelTrainer(data_paths=[reviews_csv], cache_dir=str(tmp_path / 'cache'), output_dir=str(tmp_path),
+                           verbose=False)
+    texts, _ = trainer.load_data()
+    first = trainer.held_out_split()
+    second = trainer.held_out_split()
+
+    assert first[0] == second[0]
+    assert len(first[0]) == len(first[1]) == round(len(texts) * trainer.test_size)
+
+
+def test_failed_run_leaves_served_vectorizer_and_models_untouched(model_dir, reviews_csv, tmp_path, monkeypatch):
+    from src.models import model_trainer
+
+    before = {path.name: path.read_bytes() for path in model_dir.iterdir()}
+    build_estimator = model_trainer.build_estimator
+
+    def failing(spec, random_state=42):
+        if spec == 'logistic_regression':
+            raise RuntimeError('fit failed')
+        return build_estimator(spec, random_state)
+
+    monkeypatch.setattr(model_trainer, 'build_estimator', failing)
+    trainer = ModelTrainer(data_paths=[reviews_csv], output_dir=str(model_dir), cache_dir=str(tmp_path / 'cache'),
+                           n_jobs=1, vectorizer_params={'ngram_range': (1, 2)}, verbose=False)
+    with pytest.raises(RuntimeError):
+        trainer.train(['naive_bayes'])
+
+    assert {path.name: path.read_bytes() for path in model_dir.iterdir() if path.is_file()} == before
+
+
+def test_retrain_without_params_keeps_the_served_vectorizer_settings(model_dir, reviews_csv, tmp_path, corpus):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    texts, _ = corpus
+    joblib.dump(TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True).fit(texts), model_dir / VECTORIZER_FILE)
+    assert served_vectorizer_params(str(model_dir / VECTORIZER_FILE)) == {'ngram_range': (1, 2), 'sublinear_tf': True}
+
+    trainer = ModelTrainer(data_paths=[reviews_csv], output_dir=str(model_dir), cache_dir=str(tmp_path / 'cache'),
+                           n_jobs=1, verbose=False)
+    trainer.train(['naive_bayes'])
+    vectorizer = joblib.load(model_dir / VECTORIZER_FILE)
+    assert vectorizer.ngram_range == (1, 2) and vectorizer.sublinear_tf
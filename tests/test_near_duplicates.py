@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+from src.data.near_duplicates import EMPTY_GROUP, NearDuplicateIndex, lsh_bands, token_bag_key
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _analyzer(text):
+    return text.lower().split()
+
+
+def test_exact_mode_groups_identical_token_counts_only():
+    index = NearDuplicateIndex(threshold=1, analyzer=_analyzer)
+    group_ids, is_new = index.add(['great tablet love it', 'love it tablet GREAT', 'great tablet love', '', ' '])
+    assert group_ids[0] == group_ids[1] != group_ids[2]
+    assert group_ids[3] == group_ids[4] == EMPTY_GROUP
+    assert is_new.tolist() == [True, False, True, True, False]
+
+    # Same token set, different counts: different TF-IDF rows
+    group_ids, _ = index.add(['good good bad', 'good bad bad'])
+    assert group_ids[0] != group_ids[1]
+
+
+def test_groups_persist_across_batches():
+    index = NearDuplicateIndex(threshold=1, analyzer=_analyzer)
+    first, _ = index.add(['battery died fast'])
+    second, is_new = index.add(['fast battery died', 'screen cracked'])
+    assert second[0] == first[0]
+    assert is_new.tolist() == [False, True]
+    assert index.stats() == {'texts': 3, 'groups': 2, 'duplicates': 1, 'dedup_ratio': 0.3333}
+
+
+def test_near_duplicates_share_a_group():
+    base = ' '.join(f'word{i}' for i in range(40))
+    index = NearDuplicateIndex(threshold=0.8, analyzer=_analyzer)
+    group_ids, is_new = index.add([base, base + ' extra', ' '.join(f'other{i}' for i in range(40))])
+    assert group_ids[0] == group_ids[1] != group_ids[2]
+    assert is_new.tolist() == [True, False, True]
+
+
+def test_token_bag_key_is_order_free_and_stable_across_processes():
+    tokens = ['love', 'great', 'tablet']
+    assert token_bag_key(tokens) == token_bag_key(tokens[::-1]) != token_bag_key(tokens[:2])
+    assert token_bag_key(tokens) != token_bag_key(tokens + ['love'])
+    keys = {
+        subprocess.run(
+            [sys.executable, '-c', 'from src.data.near_duplicates import token_bag_key; '
+                                   f'print(token_bag_key({tokens!r}).hex())'],
+            env={**os.environ, 'PYTHONHASHSEED': seed}, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        for seed in ('1', '2')
+    }
+    assert keys == {token_bag_key(tokens).hex()}
+
+
+def test_lsh_bands_cover_all_permutations():
+    bands, rows = lsh_bands(64, 0.9)
+    assert bands * rows == 64
+    assert (1 / bands) ** (1 / rows) <= 0.9
@@ -0,0 +1,74 @@
+import pytest
+
+from src.models.prediction_cache import PredictionCache, cache_key, normalize_text
+
+VALUE = (2, [0.1, 0.2, 0.7])
+
+
+def test_key_embeds_normalized_text_model_and_version():
+    key = cache_key(normalize_text('  Great   TABLET '), 'naive_bayes', 'v1')
+    assert key == cache_key(normalize_text('great tablet'), 'naive_bayes', 'v1')
+    assert key != cache_key(normalize_text('great tablet'), 'logistic_regression', 'v1')
+    assert key != cache_key(normalize_text('great tablet'), 'naive_bayes', 'v2')
+
+
+def test_token_normalization_ignores_word_order():
+    analyzer = str.split
+    assert normalize_text('tablet great', analyzer) == normalize_text('great tablet', analyzer)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(max_entries=2, db_path=None)
+    cache.put('a', VALUE)
+    cache.put('b', VALUE)
+    cache.get('a')
+    cache.put('c', VALUE)
+    assert cache.get('b') is None
+    assert cache.get('a') == VALUE
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(ttl=-1, db_path=None)
+    cache.put('a', VALUE)
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return PredictionCache(db_path=str(tmp_path / 'predictions.db'))
+
+
+def test_disk_tier_survives_a_new_cache(disk_cache):
+    disk_cache.put_many([('a', VALUE), ('b', VALUE)], 'naive_bayes', 'v1')
+    restarted = PredictionCache(db_path=disk_cache.db_path)
+    assert restarted.get('a') == VALUE
+    assert restarted.stats()['disk_hits'] == 1
+
+
+def test_new_version_purges_older_disk_rows_of_that_model_only(disk_cache):
+    disk_cache.check_version('naive_bayes', 'v1')
+    disk_cache.put('nb', VALUE, 'naive_bayes', 'v1')
+    disk_cache.put('lr', VALUE, 'logistic_regression', 'v1')
+
+    disk_cache.check_version('naive_bayes', 'v1')
+    assert disk_cache.stats()['invalidations'] == 0
+    disk_cache.check_version('naive_bayes', 'v2')
+    assert disk_cache.stats()['invalidations'] == 1
+
+    restarted = PredictionCache(db_path=disk_cache.db_path)
+    assert restarted.get('nb') is None
+    assert restarted.get('lr') == VALUE
+
+
+def test_replaced_model_file_misses_the_cache(scoring_app, model_dir, corpus, fitted):
+    texts, _ = corpus
+    scoring_app.score_batch(texts[:4], 'naive_bayes', dedupe=False)
+    _, _, timing = scoring_app.score_batch(texts[:4], 'naive_bayes', dedupe=False)
+    assert timing['cache_hits'] == 4
+
+    scoring_app.models.swap('naive_bayes', fitted['naive_bayes'])
+    _, _, timing = scoring_app.score_batch(texts[:4], 'naive_bayes', dedupe=False)
+    assert timing['cache_hits'] == 0
+    assert scoring_app.prediction_cache.stats()['invalidations'] == 1
@@ -0,0 +1,35 @@
+import time
+
+import numpy as np
+
+from src.data.analytics_store import AnalyticsStore
+from src.data.prediction_log import PredictionLog, read_prediction_log, rebuild_windows
+
+
+def _window_totals(store):
+    classes, buckets = store.prediction_windows(0, 60)
+    return sum(row[3] for row in classes), sum(row[3] for row in buckets)
+
+
+def test_logged_predictions_are_rolled_up_and_old_windows_pruned(tmp_path):
+    store = AnalyticsStore(str(tmp_path / 'analytics.db'))
+    store.add_prediction_windows([(0, 'naive_bayes', 'positive', 5)], [(0, 'naive_bayes', 19, 5)])
+    log = PredictionLog(log_dir=str(tmp_path / 'log'), store=store, retention_days=1)
+    log.record('predict', 'naive_bayes', [2, 0, 1], np.array([[0.1, 0.1, 0.8], [0.7, 0.2, 0.1], [0.3, 0.4, 0.3]]))
+    assert log.flush()
+    log.close()
+
+    assert _window_totals(store) == (3, 3)
+    frame = read_prediction_log(log_dir=str(tmp_path / 'log'))
+    assert frame['predicted_sentiment'].tolist() == ['positive', 'negative', 'neutral']
+
+
+def test_rebuild_windows_replaces_rollups_from_the_log(tmp_path):
+    store = AnalyticsStore(str(tmp_path / 'analytics.db'))
+    log = PredictionLog(log_dir=str(tmp_path / 'log'), store=store)
+    log.record('batch_predict', 'naive_bayes', [2] * 4)
+    log.close()
+    store.add_prediction_windows([(int(time.time()), 'naive_bayes', 'negative', 7)], [])
+
+    assert rebuild_windows(str(tmp_path / 'log'), store) == 4
+    assert _window_totals(store) == (4, 0)
@@ -0,0 +1,62 @@
+import joblib
+import pytest
+
+import src.models.registry as registry_module
+from src.models.registry import MODEL_FILES, ModelRegistry, dump_atomic
+
+
+def test_models_are_loaded_on_first_access(model_dir):
+    registry = ModelRegistry(model_dir=str(model_dir))
+    assert set(registry) == {'naive_bayes', 'logistic_regression'}
+    assert 'xgboost' not in registry
+    assert not registry.is_loaded('naive_bayes')
+
+    model = registry['naive_bayes']
+    assert registry.is_loaded('naive_bayes') and not registry.is_loaded('logistic_regression')
+    assert registry['naive_bayes'] is model
+    assert registry.stats()['models']['naive_bayes']['loads'] == 1
+    assert registry.stats()['models']['naive_bayes']['hits'] == 2
+    with pytest.raises(KeyError):
+        registry['no_such_model']
+
+
+def test_least_recently_used_model_is_evicted_over_budget(model_dir):
+    # Only private memory counts against the budget, so load without mmap
+    registry = ModelRegistry(model_dir=str(model_dir), memory_budget_mb=1e-6, mmap_mode=None)
+    registry['naive_bayes']
+    registry['logistic_regression']
+
+    # The model just requested is kept even when it alone exceeds the budget
+    assert registry.stats()['loaded_models'] == ['logistic_regression']
+    assert registry.stats()['models']['naive_bayes']['evictions'] == 1
+    registry['naive_bayes']
+    assert registry.stats()['models']['naive_bayes']['loads'] == 2
+
+
+def test_memory_mapped_models_fit_any_budget(model_dir):
+    registry = ModelRegistry(model_dir=str(model_dir), memory_budget_mb=1e-6)
+    registry.preload()
+    assert set(registry.stats()['loaded_models']) == {'naive_bayes', 'logistic_regression'}
+
+
+def test_changed_pickle_is_reloaded(model_dir, fitted, monkeypatch):
+    monkeypatch.setattr(registry_module, 'MODEL_RELOAD_CHECK_SECONDS', 0)
+    registry = ModelRegistry(model_dir=str(model_dir))
+    first = registry['naive_bayes']
+    assert registry['naive_bayes'] is first
+
+    dump_atomic(fitted['logistic_regression'], model_dir / MODEL_FILES['naive_bayes'])
+    reloaded = registry['naive_bayes']
+    assert reloaded is not first and type(reloaded) is type(fitted['logistic_regression'])
+    assert registry.stats()['models']['naive_bayes']['loads'] == 2
+
+
+def test_changed_vectorizer_is_reloaded(model_dir, fitted, monkeypatch):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    monkeypatch.setattr(registry_module, 'MODEL_RELOAD_CHECK_SECONDS', 0)
+    registry = ModelRegistry(model_dir=str(model_dir))
+    assert registry.vectorizer.get_params()['ngram_range'] == (1, 1)
+
+    joblib.dump(TfidfVectorizer(ngram_range=(1, 2)).fit(['a new vocabulary']), registry.path('vectorizer'))
+    assert registry.vectorizer.get_params()['ngram_range'] == (1, 2)
@@ -0,0 +1,77 @@
+import functools
+
+import pandas as pd
+import pytest
+
+from src.data.data_processor import iter_review_chunks
+from src.data.review_dataset import group_reviews, ingest_reviews, query_reviews
+
+
+@pytest.fixture(params=['reviews.parquet', 'reviews.arrow'])
+def dataset(request, tmp_path):
+    """An ingested dataset built from two CSVs sharing one review"""
+    first, second = tmp_path / 'first.csv', tmp_path / 'second.csv'
+    pd.DataFrame({
+        'reviews_text': ['great tablet', 'love it', 'okay', 'broke', 'bad'],
+        'reviews_rating': [5, 4, 3, 1, 2],
+        'brand': ['Amazon', 'Amazon', 'Other', 'Other', 'Amazon']
+    }).to_csv(first, index=False)
+    pd.DataFrame({
+        'reviews_text': ['great tablet', 'fine'],
+        'reviews_rating': [5, 4],
+        'brand': ['Amazon', None]
+    }).to_csv(second, index=False)
+
+    output = str(tmp_path / request.param)
+    stats = ingest_reviews([str(first), str(second)], output, chunksize=2)
+    assert (stats['rows_read'], stats['rows_written'], stats['duplicates']) == (7, 6, 1)
+    return output
+
+
+def test_query_filters_and_pages(dataset):
+    assert query_reviews(path=dataset)[0] == 6
+    assert query_reviews(path=dataset, rating=5)[1] == [{'reviews_text': 'great tablet', 'reviews_rating': 5}]
+    assert query_reviews(['reviews_text'], path=dataset, brand='Other')[1] == [{'reviews_text': 'okay'},
+                                                                                {'reviews_text': 'broke'}]
+
+    total, rows = query_reviews(['reviews_text'], limit=2, offset=1, path=dataset, sentiment='positive')
+    assert total == 3
+    assert rows == [{'reviews_text': 'love it'}, {'reviews_text': 'fine'}]
+
+
+def test_group_by_brand_and_rating(dataset):
+    assert group_reviews('brand', path=dataset) == [
+        {'brand': 'Amazon', 'count': 3, 'mean_rating': pytest.approx(11 / 3)},
+        {'brand': 'Other', 'count': 2, 'mean_rating': 2.0},
+        {'brand': None, 'count': 1, 'mean_rating': 4.0}
+    ]
+    groups = group_reviews('reviews_rating', path=dataset, sentiment='negative')
+    assert sorted((group['reviews_rating'], group['count']) for group in groups) == [(1, 1), (2, 1)]
+
+
+def test_review_chunks_read_only_requested_columns(dataset):
+    chunks = list(iter_review_chunks([dataset], usecols=['reviews_rating', 'brand', 'missing']))
+    frame = pd.concat(chunks)
+    assert list(frame.columns) == ['reviews_rating', 'brand']
+    assert sorted(frame['reviews_rating']) == [1, 2, 3, 4, 4, 5]
+
+
+def test_reviews_route(scoring_app, dataset, monkeypatch):
+    monkeypatch.setattr(scoring_app, 'query_reviews', functools.partial(query_reviews, path=dataset))
+    monkeypatch.setattr(scoring_app, 'group_reviews', functools.partial(group_reviews, path=dataset))
+    client = scoring_app.app.test_client()
+
+    body = client.get('/api/analytics/reviews?columns=reviews_text&sentiment=Neutral').get_json()
+    assert body['total'] == 1 and body['reviews'] == [{'reviews_text': 'okay'}]
+    body = client.get('/api/analytics/reviews?group_by=brand&rating=5').get_json()
+    assert body['groups'] == [{'brand': 'Amazon', 'count': 1, 'mean_rating': 5.0}]
+
+    for query in ('columns=title', 'group_by=title', 'rating=high', 'limit=ten', 'sentiment=angry'):
+        response = client.get(f'/api/analytics/reviews?{query}')
+        assert response.status_code == 400 and response.get_json()['status'] == 'error', query
+
+
+def test_reviews_route_without_a_dataset(scoring_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(scoring_app, 'query_reviews', functools.partial(query_reviews, path=str(tmp_path / 'none.parquet')))
+    response = scoring_app.app.test_client().get('/api/analytics/reviews')
+    assert response.status_code == 404
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+
+class _CountingModel:
+    """Wraps a fitted model and counts predict_proba calls and rows"""
+
+    def __init__(self, model):
+        self.model = model
+        self.classes_ = model.classes_
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(X.shape[0])
+        return self.model.predict_proba(X)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 1000])
+def test_chunks_match_one_predict_proba_over_all_rows(scoring_app, corpus, fitted, chunk_size):
+    texts, _ = corpus
+    model = _CountingModel(fitted['logistic_regression'])
+    scoring_app.models.swap('logistic_regression', model)
+
+    predictions, probabilities, timing = scoring_app.score_batch(texts, 'logistic_regression', chunk_size,
+                                                                 use_cache=False, dedupe=False)
+
+    expected = fitted['logistic_regression'].predict_proba(fitted['vectorizer'].transform(texts))
+    np.testing.assert_allclose(probabilities, expected)
+    assert predictions == expected.argmax(axis=1).tolist()
+    assert model.calls == [min(chunk_size, len(texts) - start) for start in range(0, len(texts), chunk_size)]
+    assert timing['cache_hits'] == 0
+
+
+def test_labels_follow_model_class_order(scoring_app, corpus, fitted):
+    # Trained without neutral reviews: predict_proba column 1 is class 2
+    from sklearn.linear_model import LogisticRegression
+
+    texts, labels = corpus
+    X = fitted['vectorizer'].transform(texts)
+    polar = labels != 1
+    model = LogisticRegression(max_iter=1000).fit(X[polar], labels[polar])
+    scoring_app.models.swap('logistic_regression', model)
+
+    predictions, _, _ = scoring_app.score_batch(texts, 'logistic_regression', 4, use_cache=False, dedupe=False)
+    assert predictions == model.predict(X).tolist()
+    assert set(predictions) == {0, 2}
+
+
+def test_cached_rows_skip_scoring_and_keep_input_order(scoring_app, corpus, fitted):
+    texts, _ = corpus
+    model = _CountingModel(fitted['naive_bayes'])
+    scoring_app.models.swap('naive_bayes', model)
+
+    first = scoring_app.score_batch(texts[:6], 'naive_bayes', 4, dedupe=False)
+    mixed = texts[6:9] + [text.upper() for text in texts[:6]]
+    predictions, probabilities, timing = scoring_app.score_batch(mixed, 'naive_bayes', 4, dedupe=False)
+
+    assert timing['cache_hits'] == 6
+    assert model.calls == [4, 2, 3]
+    assert predictions[3:] == first[0]
+    np.testing.assert_allclose(probabilities[3:], first[1])
+    expected = fitted['naive_bayes'].predict_proba(fitted['vectorizer'].transform(texts[6:9]))
+    np.testing.assert_allclose(probabilities[:3], expected)
+
+
+def test_near_duplicate_copies_are_not_cached_as_exact_predictions(scoring_app):
+    from src.data.near_duplicates import NearDuplicateIndex
+
+    # Same tokens, different cache keys: the second text is answered from the first
+    texts = ['Great tablet, love it!', 'love it great tablet']
+    index = NearDuplicateIndex(1, analyzer=scoring_app.models.vectorizer.build_analyzer())
+    _, _, timing = scoring_app.score_batch(texts, 'naive_bayes', dedup_index=index)
+    assert timing['cache_hits'] == 0 and index.stats()['duplicates'] == 1
+
+    _, _, timing = scoring_app.score_batch(texts, 'naive_bayes', dedupe=False)
+    assert timing['cache_hits'] == 1
@@ -0,0 +1,65 @@
+import io
+import json
+
+
+def _stream(app, body, query='', **kwargs):
+    response = app.app.test_client().post(f'/api/stream_predict?dedupe=0&{query}', data=body, **kwargs)
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return response, lines
+
+
+def _progress(app, stream_id):
+    response = app.app.test_client().get(f'/api/stream_predict/progress?id={stream_id}')
+    assert response.status_code == 200
+    return response.get_json()['streams'][stream_id]
+
+
+def test_ndjson_rows_are_scored_and_bad_rows_reported(scoring_app, corpus, fitted):
+    texts, _ = corpus
+    body = '\n'.join([json.dumps(texts[0]), '{not json', json.dumps({'text': texts[12], 'rating': 5}),
+                      json.dumps({'text': ''}), '', json.dumps(texts[6])]) + '\n'
+    response, lines = _stream(scoring_app, body, 'model=naive_bayes&batch_size=2')
+
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    results = {line['index']: line for line in lines if 'sentiment_code' in line}
+    errors = [line for line in lines if 'error' in line]
+    expected = fitted['naive_bayes'].predict(fitted['vectorizer'].transform([texts[0], texts[12], texts[6]]))
+    assert sorted(results) == [0, 2, 4]
+    assert [results[i]['sentiment_code'] for i in (0, 2, 4)] == expected.tolist()
+    assert results[2]['rating'] == 5
+    assert [error['index'] for error in errors] == [1]
+
+    summary = lines[-1]['summary']
+    assert summary['total_processed'] == 3 and summary['skipped'] == 2
+    progress = _progress(scoring_app, response.headers['X-Stream-Id'])
+    assert progress['finished'] and progress['error'] is None
+    assert (progress['rows_read'], progress['rows_scored'], progress['batches']) == (5, 3, 3)
+
+
+def test_csv_file_upload(scoring_app, corpus):
+    texts, _ = corpus
+    csv = 'reviews_rating,reviews_text\n' + ''.join(f'4,"{text}"\n' for text in texts)
+    response, lines = _stream(scoring_app, {'file': (io.BytesIO(csv.encode()), 'reviews.csv')}, 'batch_size=5',
+                              content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    assert [line['index'] for line in lines[:-1]] == list(range(len(texts)))
+    assert lines[-1]['summary']['total_processed'] == len(texts)
+    assert _progress(scoring_app, response.headers['X-Stream-Id'])['format'] == 'csv'
+
+
+def test_csv_without_text_column_ends_the_stream_with_an_error(scoring_app):
+    response, lines = _stream(scoring_app, 'rating,title\n5,great\n', 'format=csv')
+
+    assert response.status_code == 200
+    assert lines == [{'error': 'Stream prediction failed: CSV header must contain one of reviews_text, review, text'}]
+    progress = _progress(scoring_app, response.headers['X-Stream-Id'])
+    assert progress['finished'] and 'reviews_text' in progress['error']
+
+
+def test_invalid_requests_are_rejected(scoring_app):
+    client = scoring_app.app.test_client()
+    for query in ('model=xgboost', 'batch_size=many', 'format=xml'):
+        response = client.post(f'/api/stream_predict?{query}', data='"great"\n')
+        assert response.status_code == 400 and response.get_json()['status'] == 'error'
+    assert client.get('/api/stream_predict/progress?id=missing').status_code == 404
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+from src.data.term_index import TermIndex
+
+
+def test_saves_from_two_processes_are_merged(tmp_path):
+    path = str(tmp_path / 'term_index.json')
+    first, second = TermIndex(path), TermIndex(path)
+    first.add_texts(['great battery'], ['positive'])
+    second.add_texts(['great screen', 'great price'], ['positive', 'positive'])
+    first.save()
+    second.save()
+
+    assert TermIndex(path).frequencies('all')['great'] == 3
+    assert TermIndex(path).frequencies('sentiment:positive')['battery'] == 1
+
+
+def test_refresh_picks_up_other_saves_and_keeps_unsaved_counts(tmp_path):
+    path = str(tmp_path / 'term_index.json')
+    reader, writer = TermIndex(path), TermIndex(path)
+    reader.add_texts(['great tablet'])
+    version = reader.version
+    writer.add_texts(['great value'])
+    writer.save()
+    reader.refresh()
+
+    assert reader.version > version
+    assert reader.frequencies('all') == {'great': 2, 'tablet': 1, 'value': 1}
+
+
+def test_clear_replaces_the_saved_counts(tmp_path):
+    path = str(tmp_path / 'term_index.json')
+    index = TermIndex(path)
+    index.add_texts(['old words here'])
+    index.save()
+    index.clear()
+    index.add_texts(['new tablet'])
+    index.save()
+
+    assert TermIndex(path).frequencies('all') == {'new': 1, 'tablet': 1}
+
+
+def test_unsaved_counts_are_saved_at_exit(tmp_path):
+    path = str(tmp_path / 'term_index.json')
+    subprocess.run([sys.executable, '-c', 'from src.data.term_index import TermIndex; '
+                    f'TermIndex({path!r}).add_texts(["great battery"])'], check=True)
+    assert TermIndex(path).frequencies('all') == {'great': 1, 'battery': 1}
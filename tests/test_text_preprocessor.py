@@ -0,0 +1,100 @@
+"""text_preprocessor must produce exactly the notebook's output.
+
+The comparisons that need no NLTK data run everywhere: word_tokenize is
+NLTKWordTokenizer after punkt sentence splitting, and a cleaned document has no
+sentence punctuation left, so the tokenizer alone is the reference. The full
+clean_text pipeline is compared once with a stand-in WordNet lemmatizer shared
+by both implementations, and once more against the real stopwords/punkt/wordnet
+corpora when they are installed.
+"""
+from types import SimpleNamespace
+
+import nltk
+import pytest
+from nltk.stem import WordNetLemmatizer
+from nltk.tokenize import NLTKWordTokenizer
+
+from scripts.benchmark_preprocessing import notebook_lemmatize_text_blob, notebook_preprocess
+from src.utils import text_preprocessor
+
+STOPWORDS = frozenset(['i', 'it', 'the', 'a', 'an', 'and', 'is', 'to', 'not', 'this', 'my', 'for', 'but'])
+
+SAMPLES = [
+    "I cannot believe how great this tablet is!!",
+    "Gonna return it, wanna a refund... gimme my money back",
+    "Lemme tell you: it's 'ok' for $50, but I'd not buy it again.",
+    "The kids LOVE it — 5 stars, would recommend to everyone :)",
+    "d'ye know, 'tis the season; more'n enough gotta do it",
+    "   whitespace\tand\nnewlines   everywhere  ",
+    "",
+]
+
+
+class _Stopwords:
+    @staticmethod
+    def words(language):
+        return list(STOPWORDS)
+
+
+def _corpus_available(*resources):
+    for resource in resources:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            return False
+    return True
+
+
+@pytest.fixture
+def without_corpora(monkeypatch):
+    """Point both implementations at STOPWORDS and a punkt-free word_tokenize"""
+    tokenizer = NLTKWordTokenizer()
+    monkeypatch.setattr(nltk.corpus, 'stopwords', _Stopwords())
+    monkeypatch.setattr(nltk.tokenize, 'word_tokenize', tokenizer.tokenize)
+    monkeypatch.setattr(text_preprocessor, 'get_stopwords', lambda: STOPWORDS)
+
+
+@pytest.fixture
+def without_wordnet(without_corpora, monkeypatch):
+    """Also replace punkt sentence splitting and WordNet lemmas, for both implementations"""
+    import textblob.blob
+
+    def lemmatize(self, word, pos='n'):
+        return word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word
+
+    monkeypatch.setattr(nltk.tokenize, 'sent_tokenize', lambda text: [text])
+    monkeypatch.setattr(WordNetLemmatizer, 'lemmatize', lemmatize)
+    monkeypatch.setattr(textblob.blob, '_wordnet', SimpleNamespace(NOUN='n'))
+    text_preprocessor.lemmatize_word.cache_clear()
+    yield
+    text_preprocessor.lemmatize_word.cache_clear()
+
+
+@pytest.mark.parametrize('document', SAMPLES)
+def test_tokenize_matches_nltk_tokenizer(document):
+    cleaned = text_preprocessor._NON_ALPHA.sub('', document.lower())
+    assert text_preprocessor.tokenize(cleaned) == NLTKWordTokenizer().tokenize(cleaned)
+
+
+@pytest.mark.parametrize('document', SAMPLES)
+def test_preprocess_matches_notebook(without_corpora, document):
+    assert text_preprocessor.preprocess(document) == notebook_preprocess(document)
+
+
+@pytest.mark.parametrize('document', SAMPLES + ["Tablets, chargers and cases: the kids' favourites"])
+def test_clean_text_matches_notebook_without_corpora(without_wordnet, document):
+    assert text_preprocessor.clean_text(document) == notebook_lemmatize_text_blob(notebook_preprocess(document))
+
+
+@pytest.mark.skipif(not _corpus_available('corpora/stopwords', 'corpora/wordnet', 'tokenizers/punkt'),
+                    reason='NLTK corpora not installed')
+@pytest.mark.parametrize('document', SAMPLES)
+def test_clean_text_matches_notebook(document):
+    assert text_preprocessor.clean_text(document) == notebook_lemmatize_text_blob(notebook_preprocess(document))
+
+
+def test_clean_texts_pool_keeps_document_order(without_corpora, monkeypatch):
+    monkeypatch.setattr(text_preprocessor, 'lemmatize_text', lambda text: text)
+    serial = text_preprocessor.clean_texts(SAMPLES, n_jobs=1)
+    assert serial == [text_preprocessor.preprocess(document) for document in SAMPLES]
+    assert text_preprocessor.clean_texts(SAMPLES, n_jobs=2, chunk_size=2) == serial